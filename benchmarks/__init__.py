@@ -0,0 +1,12 @@
+"""
+Benchmarks de la API de tareas
+
+- generar_datos: Directorios de datos sintéticos de cualquier tamaño
+- bench_endpoints: Rendimiento y latencias por endpoint y tamaño de datos
+"""
+
+from typing import List
+
+from .generar_datos import generar_directorio, generar_tareas
+
+__all__: List[str] = ["generar_directorio", "generar_tareas"]
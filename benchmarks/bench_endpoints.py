@@ -0,0 +1,498 @@
+"""
+Benchmark de los endpoints de la API
+
+Este módulo mide cada ruta de main.app (listados, consultas por ID, búsqueda,
+creación, PUT, PATCH, eliminación, restauración, eliminación permanente y
+operaciones por lote) con conjuntos de datos sintéticos de distintos tamaños,
+y guarda el rendimiento y las latencias p50/p95/p99 en un archivo JSON para
+comparar ejecuciones.
+
+Funciones principales:
+- ejecutar(): Genera los datos, mide cada tamaño y guarda los resultados
+- comparar(): Compara dos archivos de resultados y detecta regresiones
+
+Uso:
+    python -m benchmarks.bench_endpoints
+    python -m benchmarks.bench_endpoints --tamanos 1000 100000 --iteraciones 100
+    python -m benchmarks.bench_endpoints --comparar benchmarks/resultados/base.json
+
+Características:
+- Solicitudes en el mismo proceso a través de la interfaz ASGI, sin red ni
+  cliente HTTP: se mide la aplicación, no el transporte
+- Cada tamaño se mide en un subproceso propio con TAREAS_DIR_DATA (y
+  TAREAS_DIR_LOGS) apuntando a un directorio temporal (el repositorio se
+  construye al importar la app)
+- Ciclo de vida completo: carga inicial (también medida), escritor serializado
+  y cierre con compactación
+- Cada endpoint se repite hasta --iteraciones o --tiempo-max segundos, después
+  de una primera solicitud que se informa aparte (primera_ms)
+- Logs de la aplicación en ERROR durante la medición (--con-logs para INFO)
+- Comparación por p95 con tolerancia configurable; código de salida 1 si hay
+  regresiones
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from urllib.parse import quote
+from typing import Any, Awaitable, Callable
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Directorio por defecto de los resultados
+DIR_RESULTADOS: str = os.path.join(os.path.dirname(__file__), "resultados")
+
+# Tamaños medidos por defecto (tareas activas)
+TAMANOS: list[int] = [1_000, 100_000, 1_000_000]
+
+# Percentiles informados
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+# Aplicación ASGI: (scope, receive, send)
+AppASGI = Callable[..., Awaitable[None]]
+
+
+class ClienteASGI:
+    """
+    Cliente mínimo que llama a una aplicación ASGI dentro del mismo proceso.
+
+    Attributes:
+        app (AppASGI): Aplicación a la que se envían las solicitudes.
+
+    Ejemplo:
+        >>> cliente = ClienteASGI(app)
+        >>> estado, cuerpo = await cliente.solicitud("GET", "/tareas/1")
+    """
+
+    def __init__(self, app: AppASGI) -> None:
+        self.app: AppASGI = app
+
+    async def solicitud(
+        self, metodo: str, ruta: str, cuerpo: Any = None
+    ) -> tuple[int, bytes]:
+        """
+        Envía una solicitud HTTP y espera la respuesta completa.
+
+        Args:
+            metodo (str): Método HTTP.
+            ruta (str): Ruta con la cadena de consulta opcional.
+            cuerpo (Any): Objeto a enviar como JSON, o None para no enviar cuerpo.
+
+        Returns:
+            tuple[int, bytes]: Código de estado y cuerpo de la respuesta.
+        """
+        camino, _, consulta = ruta.partition("?")
+        datos: bytes = b"" if cuerpo is None else json.dumps(cuerpo).encode()
+        cabeceras: list[tuple[bytes, bytes]] = [(b"host", b"benchmark")]
+        if cuerpo is not None:
+            cabeceras.append((b"content-type", b"application/json"))
+            cabeceras.append((b"content-length", str(len(datos)).encode()))
+        scope: dict[str, Any] = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": metodo,
+            "scheme": "http",
+            "path": camino,
+            "raw_path": camino.encode(),
+            "root_path": "",
+            "query_string": consulta.encode(),
+            "headers": cabeceras,
+            "client": ("127.0.0.1", 0),
+            "server": ("benchmark", 80),
+        }
+        estado: int = 0
+        partes: list[bytes] = []
+        terminada: asyncio.Event = asyncio.Event()
+        recibido: bool = False
+
+        async def receive() -> dict[str, Any]:
+            nonlocal recibido
+            if not recibido:
+                recibido = True
+                return {"type": "http.request", "body": datos, "more_body": False}
+            # Las respuestas transmitidas escuchan la desconexión: el cliente
+            # solo se "desconecta" cuando recibió la respuesta completa
+            await terminada.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(mensaje: dict[str, Any]) -> None:
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            elif mensaje["type"] == "http.response.body":
+                partes.append(mensaje.get("body", b""))
+                if not mensaje.get("more_body", False):
+                    terminada.set()
+
+        await self.app(scope, receive, send)
+        return estado, b"".join(partes)
+
+
+# Función para calcular un percentil por rango más cercano
+def _percentil(ordenadas: list[float], percentil: int) -> float:
+    indice: int = max(0, math.ceil(percentil / 100 * len(ordenadas)) - 1)
+    return ordenadas[indice]
+
+
+# Función para resumir las latencias de un endpoint
+def _resumir(
+    latencias: list[float], segundos: float, estados: dict[str, int]
+) -> dict[str, Any]:
+    ordenadas: list[float] = sorted(latencias)
+    resumen: dict[str, Any] = {
+        "solicitudes": len(ordenadas),
+        "segundos": round(segundos, 4),
+        "por_segundo": round(len(ordenadas) / segundos, 2) if segundos else 0.0,
+        "estados": estados,
+    }
+    for percentil in PERCENTILES:
+        resumen[f"p{percentil}_ms"] = round(_percentil(ordenadas, percentil) * 1000, 3)
+    return resumen
+
+
+# Función para construir los escenarios de medición
+def _escenarios(
+    ids_activas: list[int], ids_eliminadas: list[int], semilla: int = 0
+) -> list[tuple[str, Callable[[], tuple[str, str, Any] | None]]]:
+    """
+    Define una solicitud por endpoint. Cada generador retorna (método, ruta,
+    cuerpo) para la siguiente repetición, o None si se agotaron los IDs.
+
+    Las rutas que mueven tareas consumen IDs distintos en cada repetición:
+    DELETE /tareas/{id} elimina tareas activas, POST /eliminadas/{id} restaura
+    esas mismas tareas y DELETE /eliminadas/{id}! purga el historial original.
+    """
+    aleatorio: random.Random = random.Random(semilla)
+    activas: list[int] = list(ids_activas)
+    aleatorio.shuffle(activas)
+    # La mitad de las activas se reserva para eliminar; el resto se lee y modifica
+    a_eliminar: list[int] = activas[: len(activas) // 2]
+    estables: list[int] = activas[len(activas) // 2 :] or list(ids_activas)
+    eliminadas_ahora: list[int] = []
+    historial: list[int] = list(ids_eliminadas)
+    aleatorio.shuffle(historial)
+
+    def estable() -> int:
+        return aleatorio.choice(estables)
+
+    def buscar() -> tuple[str, str, Any]:
+        consulta: str = aleatorio.choice(["código", "reunión equipo", "despl"])
+        return "GET", f"/tareas/buscar?q={quote(consulta)}", None
+
+    def tarea() -> dict[str, Any]:
+        return {"titulo": "Tarea de benchmark", "descripcion": "Creada por el benchmark"}
+
+    def eliminada() -> tuple[str, str, Any] | None:
+        if not ids_eliminadas:
+            return None
+        return "GET", f"/eliminadas/{aleatorio.choice(ids_eliminadas)}", None
+
+    def eliminar() -> tuple[str, str, Any] | None:
+        if not a_eliminar:
+            return None
+        tarea_id: int = a_eliminar.pop()
+        eliminadas_ahora.append(tarea_id)
+        return "DELETE", f"/tareas/{tarea_id}", None
+
+    def restaurar() -> tuple[str, str, Any] | None:
+        if not eliminadas_ahora:
+            return None
+        return "POST", f"/eliminadas/{eliminadas_ahora.pop()}", None
+
+    def purgar() -> tuple[str, str, Any] | None:
+        if not historial:
+            return None
+        return "DELETE", f"/eliminadas/{historial.pop()}!", None
+
+    def eliminar_lote() -> tuple[str, str, Any] | None:
+        if len(a_eliminar) < 10:
+            return None
+        ids: list[int] = [a_eliminar.pop() for _ in range(10)]
+        return "DELETE", "/tareas/lote", ids
+
+    return [
+        ("GET /", lambda: ("GET", "/", None)),
+        ("GET /tareas", lambda: ("GET", "/tareas", None)),
+        ("GET /tareas?limite=100", lambda: ("GET", "/tareas?limite=100", None)),
+        ("GET /tareas/{id}", lambda: ("GET", f"/tareas/{estable()}", None)),
+        ("GET /tareas/buscar", buscar),
+        ("GET /eliminadas", lambda: ("GET", "/eliminadas", None)),
+        ("GET /eliminadas/{id}", eliminada),
+        ("POST /tareas", lambda: ("POST", "/tareas", tarea())),
+        (
+            "PUT /tareas/{id}",
+            lambda: ("PUT", f"/tareas/{estable()}", {**tarea(), "completada": True}),
+        ),
+        ("PATCH /tareas/{id}", lambda: ("PATCH", f"/tareas/{estable()}", {"completada": True})),
+        ("DELETE /tareas/{id}", eliminar),
+        ("POST /eliminadas/{id}", restaurar),
+        ("DELETE /eliminadas/{id}!", purgar),
+        ("POST /tareas/lote", lambda: ("POST", "/tareas/lote", [tarea() for _ in range(10)])),
+        (
+            "PATCH /tareas/lote",
+            lambda: (
+                "PATCH",
+                "/tareas/lote",
+                [{"id": estable(), "completada": False} for _ in range(10)],
+            ),
+        ),
+        ("DELETE /tareas/lote", eliminar_lote),
+    ]
+
+
+# Función que mide todos los endpoints con los datos ya configurados
+async def _medir(iteraciones: int, tiempo_max: float, con_logs: bool) -> dict[str, Any]:
+    """
+    Mide todos los endpoints en el proceso actual (TAREAS_DIR_DATA ya apunta
+    a los datos sintéticos).
+
+    Returns:
+        dict[str, Any]: Tiempo de carga inicial y resumen por endpoint.
+    """
+    from main import app
+    from utils import repositorio
+
+    if not con_logs:
+        logging.getLogger().setLevel(logging.ERROR)
+    cliente: ClienteASGI = ClienteASGI(app)
+    resultados: dict[str, Any] = {}
+
+    inicio: float = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        carga_s: float = time.perf_counter() - inicio
+        ids_activas: list[int] = [t.id for t in repositorio.tareas()]
+        ids_eliminadas: list[int] = [t.id for t in repositorio.eliminadas()]
+
+        for nombre, siguiente in _escenarios(ids_activas, ids_eliminadas):
+            # La primera solicitud se mide aparte: incluye cachés e índices
+            # construidos en el primer uso (por ejemplo, el de búsqueda)
+            primera: tuple[str, str, Any] | None = siguiente()
+            if primera is None:
+                continue
+            antes: float = time.perf_counter()
+            await cliente.solicitud(*primera)
+            primera_ms: float = (time.perf_counter() - antes) * 1000
+            latencias: list[float] = []
+            estados: dict[str, int] = {}
+            comienzo: float = time.perf_counter()
+            while len(latencias) < iteraciones:
+                solicitud: tuple[str, str, Any] | None = siguiente()
+                if solicitud is None:
+                    break
+                metodo, ruta, cuerpo = solicitud
+                antes = time.perf_counter()
+                estado, _ = await cliente.solicitud(metodo, ruta, cuerpo)
+                latencias.append(time.perf_counter() - antes)
+                estados[str(estado)] = estados.get(str(estado), 0) + 1
+                if time.perf_counter() - comienzo >= tiempo_max:
+                    break
+            if latencias:
+                resultados[nombre] = _resumir(
+                    latencias, time.perf_counter() - comienzo, estados
+                )
+                resultados[nombre]["primera_ms"] = round(primera_ms, 3)
+    return {"carga_s": round(carga_s, 4), "endpoints": resultados}
+
+
+# Función para medir un tamaño de datos en un subproceso
+def _medir_tamano(
+    tamano: int, argumentos: argparse.Namespace, directorio: str
+) -> dict[str, Any]:
+    """
+    Genera los datos de un tamaño y los mide en un subproceso propio.
+    """
+    from .generar_datos import generar_directorio
+
+    sqlite: bool = argumentos.almacenamiento == "sqlite"
+    inicio: float = time.perf_counter()
+    generar_directorio(directorio, tamano, semilla=argumentos.semilla, sqlite=sqlite)
+    logger.info("Datos de %s tareas generados en %.1f s", tamano, time.perf_counter() - inicio)
+
+    salida: str = os.path.join(directorio, "resultado.json")
+    entorno: dict[str, str] = {
+        **os.environ,
+        "TAREAS_DIR_DATA": directorio,
+        "TAREAS_DIR_LOGS": directorio,
+        "TAREAS_ALMACENAMIENTO": argumentos.almacenamiento,
+    }
+    if argumentos.durabilidad:
+        entorno["TAREAS_DURABILIDAD"] = argumentos.durabilidad
+    comando: list[str] = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_endpoints",
+        "--medir",
+        salida,
+        "--iteraciones",
+        str(argumentos.iteraciones),
+        "--tiempo-max",
+        str(argumentos.tiempo_max),
+    ]
+    if argumentos.con_logs:
+        comando.append("--con-logs")
+    raiz: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run(comando, cwd=raiz, env=entorno, check=True)
+    with open(salida, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+# Función para obtener el commit actual, si el proyecto es un repositorio git
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Función para mostrar los resultados de un tamaño
+def _imprimir(tamano: int, medicion: dict[str, Any]) -> None:
+    print(f"\n{tamano} tareas (carga inicial {medicion['carga_s']:.2f} s)")
+    print(f"{'endpoint':<26}{'n':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for nombre, resumen in medicion["endpoints"].items():
+        print(
+            f"{nombre:<26}{resumen['solicitudes']:>6}{resumen['por_segundo']:>10.1f}"
+            f"{resumen['p50_ms']:>10.2f}{resumen['p95_ms']:>10.2f}{resumen['p99_ms']:>10.2f}"
+        )
+
+
+# Función para ejecutar el benchmark completo
+def ejecutar(argumentos: argparse.Namespace) -> dict[str, Any]:
+    """
+    Mide todos los tamaños pedidos y guarda los resultados en JSON.
+
+    Args:
+        argumentos (argparse.Namespace): Opciones de la línea de comandos.
+
+    Returns:
+        dict[str, Any]: Resultados completos, tal como se guardan en el archivo.
+    """
+    resultado: dict[str, Any] = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "almacenamiento": argumentos.almacenamiento,
+        "durabilidad": argumentos.durabilidad or os.environ.get("TAREAS_DURABILIDAD"),
+        "iteraciones": argumentos.iteraciones,
+        "tiempo_max": argumentos.tiempo_max,
+        "tamanos": {},
+    }
+    for tamano in argumentos.tamanos:
+        directorio: str = tempfile.mkdtemp(prefix=f"tareas-bench-{tamano}-")
+        try:
+            medicion: dict[str, Any] = _medir_tamano(tamano, argumentos, directorio)
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+        resultado["tamanos"][str(tamano)] = medicion
+        _imprimir(tamano, medicion)
+
+    salida: str = argumentos.salida or os.path.join(
+        DIR_RESULTADOS, f"endpoints-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as file:
+        json.dump(resultado, file, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {salida}")
+    return resultado
+
+
+# Función para comparar dos ejecuciones
+def comparar(
+    base: dict[str, Any], actual: dict[str, Any], tolerancia: float = 0.2
+) -> list[str]:
+    """
+    Compara el p95 de cada endpoint y tamaño presentes en ambas ejecuciones.
+
+    Args:
+        base (dict[str, Any]): Resultados de referencia.
+        actual (dict[str, Any]): Resultados nuevos.
+        tolerancia (float): Aumento relativo del p95 aceptado (0.2 = 20 %).
+
+    Returns:
+        list[str]: Descripción de cada regresión encontrada (vacía si no hay).
+    """
+    regresiones: list[str] = []
+    print(f"\nComparación de p95 (tolerancia {tolerancia:.0%})")
+    print(f"{'tamaño':>8} {'endpoint':<26}{'antes ms':>10}{'ahora ms':>10}{'cambio':>9}")
+    for tamano, medicion in actual["tamanos"].items():
+        referencia: dict[str, Any] = (
+            base.get("tamanos", {}).get(tamano, {}).get("endpoints", {})
+        )
+        for nombre, resumen in medicion["endpoints"].items():
+            if nombre not in referencia:
+                continue
+            antes: float = referencia[nombre]["p95_ms"]
+            ahora: float = resumen["p95_ms"]
+            cambio: float = (ahora - antes) / antes if antes else 0.0
+            marca: str = ""
+            if cambio > tolerancia:
+                marca = "  REGRESIÓN"
+                regresiones.append(f"{tamano} {nombre}: {antes:.2f} -> {ahora:.2f} ms")
+            print(f"{tamano:>8} {nombre:<26}{antes:>10.2f}{ahora:>10.2f}{cambio:>+9.0%}{marca}")
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Mide los endpoints de la API con datos sintéticos"
+    )
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=TAMANOS, help="Tareas activas por medición"
+    )
+    parser.add_argument(
+        "--iteraciones", type=int, default=200, help="Solicitudes máximas por endpoint"
+    )
+    parser.add_argument(
+        "--tiempo-max", type=float, default=10.0, help="Segundos máximos por endpoint"
+    )
+    parser.add_argument("--almacenamiento", choices=["json", "sqlite"], default="json")
+    parser.add_argument(
+        "--durabilidad", choices=["estricta", "grupo", "memoria"], default=None
+    )
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", help="Resultados anteriores con los que comparar")
+    parser.add_argument(
+        "--tolerancia", type=float, default=0.2, help="Aumento de p95 tolerado"
+    )
+    parser.add_argument("--con-logs", action="store_true", help="Mantener logs en INFO")
+    parser.add_argument("--medir", help=argparse.SUPPRESS)
+    argumentos: argparse.Namespace = parser.parse_args()
+
+    if argumentos.medir:
+        # Subproceso: medir con los datos de TAREAS_DIR_DATA
+        medicion: dict[str, Any] = asyncio.run(
+            _medir(argumentos.iteraciones, argumentos.tiempo_max, argumentos.con_logs)
+        )
+        with open(argumentos.medir, "w", encoding="utf-8") as file:
+            json.dump(medicion, file)
+        sys.exit(0)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    resultados: dict[str, Any] = ejecutar(argumentos)
+    if argumentos.comparar:
+        with open(argumentos.comparar, "r", encoding="utf-8") as file:
+            encontradas: list[str] = comparar(json.load(file), resultados, argumentos.tolerancia)
+        if encontradas:
+            print(f"\n{len(encontradas)} regresiones:")
+            for regresion in encontradas:
+                print(f"  {regresion}")
+            sys.exit(1)
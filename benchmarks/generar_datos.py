@@ -0,0 +1,183 @@
+"""
+Generador de conjuntos de datos sintéticos
+
+Este módulo crea directorios data/ completos (tareas activas, historial de
+eliminadas segmentado, contador de IDs y, opcionalmente, la base SQLite) con
+la cantidad de tareas indicada, para medir la API con volúmenes realistas sin
+tocar los datos reales.
+
+Funciones principales:
+- generar_tareas(): Genera las tareas activas y eliminadas en memoria
+- generar_directorio(): Escribe un directorio de datos con el formato de la API
+
+Uso:
+    python -m benchmarks.generar_datos --tamano 100000 --destino /tmp/datos
+    TAREAS_DIR_DATA=/tmp/datos python main.py
+
+Características:
+- Resultado reproducible para una misma semilla
+- Títulos y descripciones con vocabulario repetido, útiles para la búsqueda
+- Fechas de eliminación repartidas en los últimos 24 meses (varios segmentos)
+- Escritura con los mismos almacenamientos que usa la API
+"""
+
+import os
+import random
+import logging
+import argparse
+from datetime import datetime, timedelta
+from typing import Any
+
+from constants import DURABILIDAD_ESTRICTA
+from utils import (
+    AlmacenamientoJSON,
+    AlmacenamientoSQLite,
+    RegistroEliminada,
+    RegistroTarea,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Vocabulario de los textos generados
+PALABRAS: list[str] = [
+    "revisar", "código", "reunión", "equipo", "documentación", "pruebas",
+    "servidor", "cliente", "despliegue", "base", "datos", "informe", "diseño",
+    "interfaz", "error", "rendimiento", "seguridad", "migración", "API",
+    "tareas", "backend", "frontend", "configurar", "actualizar", "curso",
+    "Python", "FastAPI", "Linux", "Git", "proyecto", "semanal", "cliente",
+]
+
+
+# Función para generar un texto aleatorio con el vocabulario
+def _texto(aleatorio: random.Random, minimo: int, maximo: int) -> str:
+    return " ".join(aleatorio.choices(PALABRAS, k=aleatorio.randint(minimo, maximo)))
+
+
+# Función para generar tareas sintéticas
+def generar_tareas(
+    cantidad: int, proporcion_eliminadas: float = 0.1, semilla: int = 0
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Genera tareas activas y eliminadas con IDs consecutivos.
+
+    Args:
+        cantidad (int): Cantidad de tareas activas.
+        proporcion_eliminadas (float): Tareas eliminadas por cada tarea activa.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        tuple[list[dict[str, Any]], list[dict[str, Any]]]: Tareas activas y
+        eliminadas, ordenadas por ID. Los IDs de ambas listas no se repiten.
+
+    Ejemplo:
+        >>> activas, eliminadas = generar_tareas(1000)
+        >>> len(activas), len(eliminadas)
+        (1000, 100)
+    """
+    aleatorio: random.Random = random.Random(semilla)
+    total: int = cantidad + int(cantidad * proporcion_eliminadas)
+    ids_eliminadas: set[int] = set(
+        aleatorio.sample(range(1, total + 1), total - cantidad)
+    )
+    ahora: datetime = datetime.now()
+    activas: list[dict[str, Any]] = []
+    eliminadas: list[dict[str, Any]] = []
+    for tarea_id in range(1, total + 1):
+        tarea: dict[str, Any] = {
+            "id": tarea_id,
+            "titulo": _texto(aleatorio, 2, 6),
+            "descripcion": _texto(aleatorio, 8, 20),
+            "completada": aleatorio.random() < 0.3,
+        }
+        if tarea_id in ids_eliminadas:
+            fecha: datetime = ahora - timedelta(seconds=aleatorio.randint(0, 730 * 86400))
+            tarea["fecha_eliminacion"] = fecha.isoformat()
+            eliminadas.append(tarea)
+        else:
+            activas.append(tarea)
+    return activas, eliminadas
+
+
+# Función para escribir un directorio de datos sintético
+def generar_directorio(
+    destino: str,
+    cantidad: int,
+    proporcion_eliminadas: float = 0.1,
+    semilla: int = 0,
+    sqlite: bool = False,
+) -> str:
+    """
+    Escribe un directorio de datos con el mismo formato que data/.
+
+    Args:
+        destino (str): Directorio a crear o reemplazar.
+        cantidad (int): Cantidad de tareas activas.
+        proporcion_eliminadas (float): Tareas eliminadas por cada tarea activa.
+        semilla (int): Semilla del generador aleatorio.
+        sqlite (bool): Escribir también tareas.sqlite3 para el almacenamiento SQLite.
+
+    Returns:
+        str: El directorio destino, listo para usar como TAREAS_DIR_DATA.
+
+    Ejemplo:
+        >>> generar_directorio("/tmp/datos-1k", 1000)
+        '/tmp/datos-1k'
+    """
+    activas, eliminadas = generar_tareas(cantidad, proporcion_eliminadas, semilla)
+    registros: list[RegistroTarea] = [RegistroTarea.desde_dict(t) for t in activas]
+    registros_eliminadas: list[RegistroEliminada] = [
+        RegistroEliminada.desde_dict(t) for t in eliminadas
+    ]
+    ultimo_id: int = cantidad + len(eliminadas)
+    os.makedirs(destino, exist_ok=True)
+
+    almacenamiento: AlmacenamientoJSON = AlmacenamientoJSON(
+        os.path.join(destino, "tareas.json"),
+        os.path.join(destino, "eliminadas"),
+        os.path.join(destino, "diario.jsonl"),
+        os.path.join(destino, "contador_id.json"),
+        DURABILIDAD_ESTRICTA,
+    )
+    almacenamiento.guardar_todo(registros, registros_eliminadas)
+    almacenamiento.guardar_contador(ultimo_id)
+    almacenamiento.cerrar()
+
+    if sqlite:
+        base: AlmacenamientoSQLite = AlmacenamientoSQLite(
+            os.path.join(destino, "tareas.sqlite3")
+        )
+        base.guardar_todo(registros, registros_eliminadas)
+        base.guardar_contador(ultimo_id)
+        base.cerrar()
+
+    logger.info(
+        "Datos sintéticos en %s: %s tareas activas, %s eliminadas",
+        destino,
+        len(registros),
+        len(registros_eliminadas),
+    )
+    return destino
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Genera un directorio de datos sintético para la API de tareas"
+    )
+    parser.add_argument("--tamano", type=int, required=True, help="Tareas activas")
+    parser.add_argument("--destino", required=True, help="Directorio a crear")
+    parser.add_argument(
+        "--eliminadas", type=float, default=0.1, help="Proporción de eliminadas"
+    )
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument(
+        "--sqlite", action="store_true", help="Generar también tareas.sqlite3"
+    )
+    argumentos: argparse.Namespace = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    generar_directorio(
+        argumentos.destino,
+        argumentos.tamano,
+        argumentos.eliminadas,
+        argumentos.semilla,
+        argumentos.sqlite,
+    )
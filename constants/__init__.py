@@ -1,13 +1,105 @@
 from typing import List
 
-from .constants import DIR_DATA, DATA_JSON, DELETED_JSON, ID_COUNTER_JSON
-from .modelos import Tarea, TareaUpdate
+from .constants import (
+    DIR_DATA,
+    DIR_LOGS,
+    DATA_JSON,
+    DELETED_JSON,
+    DIR_ELIMINADAS,
+    MANIFIESTO_ELIMINADAS,
+    ID_COUNTER_JSON,
+    ID_BLOCK_SIZE,
+    JOURNAL_JSONL,
+    JOURNAL_COMPACT_EVERY,
+    SQLITE_DB,
+    ALMACENAMIENTO,
+    ALMACENAMIENTO_JSON,
+    ALMACENAMIENTO_SQLITE,
+    PAGINA_LIMITE_MAXIMO,
+    CABECERA_CURSOR,
+    CABECERA_VERSION,
+    CAMBIOS_MAXIMOS,
+    LOTE_MAXIMO,
+    MEDIA_NDJSON,
+    TRANSMISION_BLOQUE,
+    BUSQUEDA_LIMITE,
+    BUSQUEDA_PREFIJO_MINIMO,
+    DURABILIDAD,
+    DURABILIDAD_ESTRICTA,
+    DURABILIDAD_GRUPO,
+    DURABILIDAD_MEMORIA,
+    DURABILIDAD_GRUPO_MS,
+    JSON_COMPACTO,
+    LOG_NIVEL,
+    LOG_MUESTREO,
+    LOG_LIMITE_POR_SEGUNDO,
+    SERVIDOR_HOST,
+    SERVIDOR_PUERTO,
+    SERVIDOR_WORKERS,
+    DIR_STATIC,
+    DIR_STATIC_DIST,
+    URL_STATIC,
+    COMPRESION_UMBRAL,
+    COMPRESION_CACHE_MAXIMO,
+)
+from .modelos import (
+    Tarea,
+    TareaEliminada,
+    TareaUpdate,
+    TareaUpdateLote,
+    ResultadoLote,
+    CambiosTareas,
+    ADAPTADOR_TAREAS,
+    ADAPTADOR_ELIMINADAS,
+)
 
 __all__: List[str] = [
     "DIR_DATA",
+    "DIR_LOGS",
     "DATA_JSON",
     "DELETED_JSON",
+    "DIR_ELIMINADAS",
+    "MANIFIESTO_ELIMINADAS",
     "ID_COUNTER_JSON",
+    "ID_BLOCK_SIZE",
+    "JOURNAL_JSONL",
+    "JOURNAL_COMPACT_EVERY",
+    "SQLITE_DB",
+    "ALMACENAMIENTO",
+    "ALMACENAMIENTO_JSON",
+    "ALMACENAMIENTO_SQLITE",
+    "PAGINA_LIMITE_MAXIMO",
+    "CABECERA_CURSOR",
+    "CABECERA_VERSION",
+    "CAMBIOS_MAXIMOS",
+    "LOTE_MAXIMO",
+    "MEDIA_NDJSON",
+    "TRANSMISION_BLOQUE",
+    "BUSQUEDA_LIMITE",
+    "BUSQUEDA_PREFIJO_MINIMO",
+    "DURABILIDAD",
+    "DURABILIDAD_ESTRICTA",
+    "DURABILIDAD_GRUPO",
+    "DURABILIDAD_MEMORIA",
+    "DURABILIDAD_GRUPO_MS",
+    "JSON_COMPACTO",
+    "LOG_NIVEL",
+    "LOG_MUESTREO",
+    "LOG_LIMITE_POR_SEGUNDO",
+    "SERVIDOR_HOST",
+    "SERVIDOR_PUERTO",
+    "SERVIDOR_WORKERS",
+    "DIR_STATIC",
+    "DIR_STATIC_DIST",
+    "URL_STATIC",
+    "COMPRESION_UMBRAL",
+    "COMPRESION_CACHE_MAXIMO",
     "Tarea",
+    "TareaEliminada",
     "TareaUpdate",
+    "TareaUpdateLote",
+    "ResultadoLote",
+    "CambiosTareas",
+    "ADAPTADOR_TAREAS",
+    "ADAPTADOR_ELIMINADAS",
 ]
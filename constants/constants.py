@@ -5,10 +5,40 @@ Este módulo define las rutas y constantes utilizadas en toda la aplicación,
 incluyendo las ubicaciones de archivos de datos y configuración de directorios.
 
 Constantes principales:
-- DIR_DATA: Directorio donde se almacenan todos los archivos de datos
+- DIR_DATA: Directorio donde se almacenan todos los archivos de datos (variable TAREAS_DIR_DATA)
+- DIR_LOGS: Directorio del archivo de logs app.log (variable TAREAS_DIR_LOGS)
 - DATA_JSON: Archivo JSON con tareas activas
-- DELETED_JSON: Archivo JSON con historial de tareas eliminadas
+- DELETED_JSON: Archivo JSON único del historial de eliminadas (formato anterior)
+- DIR_ELIMINADAS: Directorio con los segmentos mensuales del historial de eliminadas
+- MANIFIESTO_ELIMINADAS: Índice de los segmentos del historial de eliminadas
 - ID_COUNTER_JSON: Archivo JSON con contador de IDs
+- ID_BLOCK_SIZE: Cantidad de IDs reservados por cada escritura del contador
+- JOURNAL_JSONL: Diario de operaciones pendientes de compactar
+- JOURNAL_COMPACT_EVERY: Registros del diario que disparan una compactación
+- SQLITE_DB: Base de datos SQLite (almacenamiento alternativo a los archivos JSON)
+- ALMACENAMIENTO: Medio de almacenamiento, "json" o "sqlite" (variable TAREAS_ALMACENAMIENTO)
+- PAGINA_LIMITE_MAXIMO: Máximo de tareas por página en los listados
+- CABECERA_CURSOR: Cabecera HTTP con el cursor de la siguiente página
+- CABECERA_VERSION: Cabecera HTTP con la versión de las tareas activas de un listado
+- CAMBIOS_MAXIMOS: Cambios recordados para la sincronización incremental (GET /tareas/cambios)
+- LOTE_MAXIMO: Máximo de elementos en una operación por lote
+- MEDIA_NDJSON: Tipo de contenido de las respuestas transmitidas en JSON Lines
+- TRANSMISION_BLOQUE: Tareas serializadas por cada fragmento transmitido
+- BUSQUEDA_LIMITE: Resultados por defecto de la búsqueda de texto
+- BUSQUEDA_PREFIJO_MINIMO: Longitud mínima de un término para buscar por prefijo
+- DURABILIDAD: Modo de durabilidad de las escrituras (variable TAREAS_DURABILIDAD)
+- DURABILIDAD_GRUPO_MS: Intervalo del fsync agrupado (variable TAREAS_DURABILIDAD_GRUPO_MS)
+- JSON_COMPACTO: Guardar los archivos de data/ sin indentación (variable TAREAS_JSON_COMPACTO)
+- LOG_NIVEL: Nivel mínimo de los logs (variable TAREAS_LOG_NIVEL)
+- LOG_MUESTREO: Se conserva 1 de cada N logs por solicitud de cada ruta (variable TAREAS_LOG_MUESTREO)
+- LOG_LIMITE_POR_SEGUNDO: Máximo de logs por solicitud por ruta y segundo (variable TAREAS_LOG_LIMITE)
+- SERVIDOR_HOST, SERVIDOR_PUERTO: Dirección de escucha de python main.py (TAREAS_HOST, TAREAS_PUERTO)
+- SERVIDOR_WORKERS: Procesos de uvicorn, 0 para uno por núcleo (variable TAREAS_WORKERS)
+- DIR_STATIC: Directorio del frontend (HTML, JS y CSS originales)
+- DIR_STATIC_DIST: Frontend construido por python -m utils.MDactivos (nombres con hash y variantes comprimidas)
+- URL_STATIC: Ruta en la que se sirven los archivos estáticos
+- COMPRESION_UMBRAL: Bytes mínimos de una respuesta para comprimirla (variable TAREAS_COMPRESION_UMBRAL)
+- COMPRESION_CACHE_MAXIMO: Bytes máximos de la caché de respuestas comprimidas (variable TAREAS_COMPRESION_CACHE_MAXIMO)
 
 El módulo crea automáticamente el directorio de datos si no existe.
 """
@@ -16,12 +46,108 @@ El módulo crea automáticamente el directorio de datos si no existe.
 import os
 
 # Directorio de datos - se crea automáticamente si no existe
-DIR_DATA: str = os.path.join(os.path.dirname(__file__), "../data")
+DIR_DATA: str = os.environ.get(
+    "TAREAS_DIR_DATA", os.path.join(os.path.dirname(__file__), "../data")
+)
+
+# Directorio de logs (app.log); las pruebas y los benchmarks lo apuntan a su
+# directorio temporal para no escribir en el del proyecto
+DIR_LOGS: str = os.environ.get(
+    "TAREAS_DIR_LOGS", os.path.join(os.path.dirname(__file__), "../logs")
+)
 
 # Archivos JSON donde se almacenan los datos persistentes
 DATA_JSON: str = os.path.join(DIR_DATA, "tareas.json")  # Tareas activas
 DELETED_JSON: str = os.path.join(DIR_DATA, "tareas_eliminadas.json")  # Historial de eliminadas
 ID_COUNTER_JSON: str = os.path.join(DIR_DATA, "contador_id.json")  # Contador de IDs únicos
+JOURNAL_JSONL: str = os.path.join(DIR_DATA, "diario.jsonl")  # Diario de escritura anticipada
+
+# Historial de eliminadas segmentado por mes de eliminación. DELETED_JSON solo se
+# lee mientras no exista el manifiesto (datos guardados con el formato anterior)
+DIR_ELIMINADAS: str = os.path.join(DIR_DATA, "eliminadas")
+MANIFIESTO_ELIMINADAS: str = os.path.join(DIR_ELIMINADAS, "manifiesto.json")
+
+# Base de datos SQLite, usada en lugar de los archivos JSON anteriores (incluido
+# el contador de IDs) cuando ALMACENAMIENTO es "sqlite"
+SQLITE_DB: str = os.path.join(DIR_DATA, "tareas.sqlite3")
+
+# Medios de almacenamiento disponibles y medio activo
+ALMACENAMIENTO_JSON: str = "json"  # Instantáneas JSON + diario (por defecto)
+ALMACENAMIENTO_SQLITE: str = "sqlite"  # Base de datos SQLite en modo WAL
+ALMACENAMIENTO: str = os.environ.get("TAREAS_ALMACENAMIENTO", ALMACENAMIENTO_JSON)
+
+# Cantidad de IDs que se reservan en el contador persistente de una sola vez
+ID_BLOCK_SIZE: int = 1000
+
+# Número de registros del diario tras el cual se compacta en las instantáneas JSON
+JOURNAL_COMPACT_EVERY: int = 1000
+
+# Paginación por cursor de los listados
+PAGINA_LIMITE_MAXIMO: int = 1000  # Máximo de tareas por página
+CABECERA_CURSOR: str = "X-Siguiente-Cursor"  # Cabecera con el cursor de la siguiente página
+
+# Sincronización incremental: versión del listado que recibe el cliente y
+# cantidad de cambios recordados; una versión más antigua recibe el listado completo
+CABECERA_VERSION: str = "X-Version"
+CAMBIOS_MAXIMOS: int = 10000
+
+# Máximo de elementos aceptados por los endpoints /tareas/lote
+LOTE_MAXIMO: int = 1000
+
+# Transmisión de listados grandes por fragmentos
+MEDIA_NDJSON: str = "application/x-ndjson"  # Una tarea JSON por línea
+TRANSMISION_BLOQUE: int = 500  # Tareas serializadas por fragmento enviado
+
+# Búsqueda de texto sobre título y descripción
+BUSQUEDA_LIMITE: int = 20  # Resultados retornados si no se indica un límite
+BUSQUEDA_PREFIJO_MINIMO: int = 2  # Términos más cortos solo coinciden exactos
+
+# Modos de durabilidad de las escrituras
+DURABILIDAD_ESTRICTA: str = "estricta"  # fsync tras cada escritura (por defecto)
+DURABILIDAD_GRUPO: str = "grupo"  # fsync agrupado cada DURABILIDAD_GRUPO_MS milisegundos
+DURABILIDAD_MEMORIA: str = "memoria"  # Sin acceso a disco, solo para pruebas
+
+# Modo activo e intervalo de fsync agrupado, configurables por variables de entorno
+DURABILIDAD: str = os.environ.get("TAREAS_DURABILIDAD", DURABILIDAD_ESTRICTA)
+DURABILIDAD_GRUPO_MS: int = int(os.environ.get("TAREAS_DURABILIDAD_GRUPO_MS", "10"))
+
+# Formato de los archivos JSON de data/: indentado y legible (por defecto) o
+# compacto, más pequeño y rápido de escribir
+JSON_COMPACTO: bool = os.environ.get("TAREAS_JSON_COMPACTO", "0").lower() in (
+    "1",
+    "true",
+    "si",
+    "sí",
+)
+
+# Logs: nivel mínimo y muestreo de los logs INFO/DEBUG que se emiten en cada
+# solicitud (los WARNING y ERROR se conservan siempre). LOG_MUESTREO=1 conserva
+# todos; LOG_LIMITE_POR_SEGUNDO=0 desactiva el límite por segundo
+LOG_NIVEL: str = os.environ.get("TAREAS_LOG_NIVEL", "INFO").upper()
+LOG_MUESTREO: int = max(1, int(os.environ.get("TAREAS_LOG_MUESTREO", "1")))
+LOG_LIMITE_POR_SEGUNDO: int = int(os.environ.get("TAREAS_LOG_LIMITE", "0"))
+
+# Servidor lanzado con python main.py. Con más de un worker, los procesos
+# comparten data/ coordinados por el bloqueo del almacenamiento (ver MDbloqueo)
+SERVIDOR_HOST: str = os.environ.get("TAREAS_HOST", "127.0.0.1")
+SERVIDOR_PUERTO: int = int(os.environ.get("TAREAS_PUERTO", "8000"))
+SERVIDOR_WORKERS: int = int(os.environ.get("TAREAS_WORKERS", "1")) or (
+    os.cpu_count() or 1
+)
+
+# Compresión de las respuestas según Accept-Encoding: las más pequeñas que el
+# umbral se envían sin comprimir (0 comprime todas)
+COMPRESION_UMBRAL: int = int(os.environ.get("TAREAS_COMPRESION_UMBRAL", "1024"))
+# Tamaño total de los cuerpos en caché; un cuerpo mayor no se guarda (0 desactiva)
+COMPRESION_CACHE_MAXIMO: int = int(
+    os.environ.get("TAREAS_COMPRESION_CACHE_MAXIMO", str(64 * 1024 * 1024))
+)
+
+# Frontend: los originales en static/ y la versión construida (activos con el
+# hash del contenido en el nombre y variantes .gz/.br) en static/dist/
+DIR_STATIC: str = os.path.join(os.path.dirname(__file__), "../static")
+DIR_STATIC_DIST: str = os.path.join(DIR_STATIC, "dist")
+URL_STATIC: str = "/static"
 
 # Crear el directorio de datos si no existe
 # Esto asegura que la aplicación pueda ejecutarse sin configuración manual
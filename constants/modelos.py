@@ -6,7 +6,15 @@ incluyendo validaciones, esquemas y documentación automática para OpenAPI.
 
 Modelos principales:
 - Tarea: Modelo completo para tareas con validaciones estrictas
+- TareaEliminada: Tarea del historial, con su fecha de eliminación
 - TareaUpdate: Modelo para actualizaciones parciales de tareas
+- TareaUpdateLote: Actualización parcial con ID, para operaciones por lote
+- ResultadoLote: Resultado individual de cada elemento de un lote
+- CambiosTareas: Cambios de las tareas activas desde una versión del cliente
+
+Adaptadores:
+- ADAPTADOR_TAREAS / ADAPTADOR_ELIMINADAS: Validadores de listas completas,
+  creados una sola vez y usados al cargar los archivos de datos
 
 Características:
 - Validación automática de tipos y formatos
@@ -16,7 +24,7 @@ Características:
 """
 
 from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 
 
 # Modelo de datos para las tareas
@@ -75,6 +83,37 @@ class Tarea(BaseModel):
     )
 
 
+class TareaEliminada(Tarea):
+    """
+    Tarea del historial de eliminadas.
+
+    Igual que Tarea, más la marca de tiempo en que se eliminó.
+
+    Attributes:
+        fecha_eliminacion (Optional[str]): Fecha y hora de eliminación en formato ISO 8601.
+
+    Examples:
+        >>> TareaEliminada(id=1, titulo="T", descripcion="D", fecha_eliminacion="2023-01-01T12:00:00")
+    """
+    fecha_eliminacion: Optional[str] = Field(
+        default=None,
+        description="Fecha y hora de eliminación (ISO 8601)",
+        examples=["2023-01-01T12:00:00"],
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "id": 1,
+                "titulo": "Tarea eliminada",
+                "descripcion": "Esta tarea fue eliminada",
+                "completada": False,
+                "fecha_eliminacion": "2023-01-01T12:00:00",
+            }
+        }
+    )
+
+
 class TareaUpdate(BaseModel):
     """
     Modelo para actualizaciones parciales de tareas usando el método PATCH.
@@ -118,3 +157,90 @@ class TareaUpdate(BaseModel):
             "example": {"titulo": "Título actualizado", "completada": True}
         }
     )
+
+
+class TareaUpdateLote(TareaUpdate):
+    """
+    Actualización parcial de una tarea dentro de un lote (PATCH /tareas/lote).
+
+    Igual que TareaUpdate, pero incluye el ID de la tarea a modificar, ya que
+    en un lote no viene en la ruta.
+
+    Attributes:
+        id (int): ID de la tarea a modificar. Debe ser >= 1.
+
+    Examples:
+        >>> update = TareaUpdateLote(id=3, completada=True)
+    """
+    id: int = Field(..., description="ID de la tarea a modificar", ge=1)
+
+    model_config = ConfigDict(
+        json_schema_extra={"example": {"id": 1, "completada": True}}
+    )
+
+
+class ResultadoLote(BaseModel):
+    """
+    Resultado de un elemento de una operación por lote.
+
+    Cada elemento del lote se procesa de forma independiente: un elemento que
+    falla (por ejemplo, un ID inexistente) no impide aplicar los demás.
+
+    Attributes:
+        id (Optional[int]): ID de la tarea afectada.
+        estado (int): Código HTTP equivalente al de la operación individual
+                      (200 si se aplicó, 404 si la tarea no existe).
+        tarea (Optional[Tarea]): La tarea resultante si la operación se aplicó.
+        detalle (Optional[str]): Motivo del error si no se aplicó.
+
+    Examples:
+        >>> ResultadoLote(id=99, estado=404, detalle="Tarea no encontrada")
+    """
+    id: Optional[int] = Field(default=None, description="ID de la tarea afectada")
+    estado: int = Field(..., description="Código HTTP del resultado", examples=[200])
+    tarea: Optional[Tarea] = Field(
+        default=None, description="Tarea resultante si la operación se aplicó"
+    )
+    detalle: Optional[str] = Field(
+        default=None, description="Motivo del error si la operación no se aplicó"
+    )
+
+
+class CambiosTareas(BaseModel):
+    """
+    Cambios de las tareas activas desde la versión que tiene el cliente.
+
+    Si la respuesta es completa, tareas contiene todas las tareas activas y el
+    cliente reemplaza su lista; si no, actualiza o agrega las de tareas y
+    quita las de eliminadas.
+
+    Attributes:
+        version (str): Versión actual; se envía como desde en la siguiente consulta.
+        completo (bool): True si la respuesta es el listado completo (la versión
+                         del cliente era desconocida o demasiado antigua).
+        tareas (list[Tarea]): Tareas creadas, modificadas o restauradas.
+        eliminadas (list[int]): IDs de las tareas que dejaron de estar activas.
+
+    Examples:
+        >>> CambiosTareas(version="12-4096", completo=False, tareas=[], eliminadas=[7])
+    """
+    version: str = Field(
+        ..., description="Versión actual de las tareas activas", examples=["12-4096"]
+    )
+    completo: bool = Field(
+        ..., description="La respuesta contiene todas las tareas activas"
+    )
+    tareas: list[Tarea] = Field(
+        default_factory=list, description="Tareas creadas, modificadas o restauradas"
+    )
+    eliminadas: list[int] = Field(
+        default_factory=list, description="IDs de las tareas que dejaron de estar activas"
+    )
+
+
+# Validadores de listas completas, construidos una sola vez: crear un
+# TypeAdapter compila el esquema, por lo que no debe hacerse en cada carga
+ADAPTADOR_TAREAS: TypeAdapter[list[Tarea]] = TypeAdapter(list[Tarea])
+ADAPTADOR_ELIMINADAS: TypeAdapter[list[TareaEliminada]] = TypeAdapter(
+    list[TareaEliminada]
+)
@@ -11,36 +11,74 @@ Módulos principales:
 
 Ejecución:
     python main.py
+    TAREAS_WORKERS=4 python main.py  # varios procesos (0: uno por núcleo)
 
-La API estará disponible en http://127.0.0.1:8000
+La API estará disponible en http://127.0.0.1:8000 (TAREAS_HOST, TAREAS_PUERTO)
 Documentación automática en http://127.0.0.1:8000/docs
 """
 
 import os
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
+from constants import (
+    CABECERA_CURSOR,
+    CABECERA_VERSION,
+    DIR_LOGS,
+    DURABILIDAD,
+    DURABILIDAD_MEMORIA,
+    SERVIDOR_HOST,
+    SERVIDOR_PUERTO,
+    SERVIDOR_WORKERS,
+    URL_STATIC,
+)
 from routers import GET, POST, PUT, PATCH, DELETE, OTHERS
+from utils import (
+    MiddlewareCompresion,
+    MiddlewareMetricas,
+    RespuestaJSON,
+    configurar_logging,
+    escritor,
+    repositorio,
+)
+from utils.MDactivos import activos
 
-# Crear directorio de logs si no existe
-log_dir: str = os.path.join(os.path.dirname(__file__), "logs")
-os.makedirs(log_dir, exist_ok=True)
+# Crear directorio de logs si no existe (TAREAS_DIR_LOGS)
+os.makedirs(DIR_LOGS, exist_ok=True)
 
 # Configurar logging
-# Se configura logging a nivel INFO con formato detallado
-# Los logs se guardan en archivo y se muestran en consola
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(os.path.join(log_dir, "app.log")),
-        logging.StreamHandler(),
-    ],
-)
+# Los logs se guardan en archivo y se muestran en consola desde un hilo aparte:
+# los endpoints solo encolan cada registro. Nivel (TAREAS_LOG_NIVEL) y muestreo
+# de los logs por solicitud (TAREAS_LOG_MUESTREO, TAREAS_LOG_LIMITE)
+# configurables por variables de entorno
+configurar_logging(os.path.join(DIR_LOGS, "app.log"))
 logger: logging.Logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Ciclo de vida de la aplicación.
+
+    Carga las tareas activas y eliminadas en el repositorio en memoria una sola
+    vez al arrancar, de forma que las solicitudes no vuelvan a leer el
+    almacenamiento (archivos JSON o SQLite) salvo que cambie en disco, y
+    arranca el escritor serializado por el que pasan todas las modificaciones.
+    Al detenerse aplica las modificaciones pendientes y cierra el
+    almacenamiento (con JSON, compacta el diario en las instantáneas).
+    """
+    logger.info("Cargando repositorio de tareas en memoria")
+    repositorio.cargar()
+    escritor.iniciar()
+    yield
+    logger.info("Deteniendo aplicación, cerrando almacenamiento")
+    escritor.detener()
+    repositorio.cerrar()
+
+
 # Crear la aplicación FastAPI
 # Se inicializa la aplicación con metadatos para documentación automática
 logger.info("Creando aplicación FastAPI")
@@ -50,6 +88,8 @@ app: FastAPI = FastAPI(
     version="1.0.0",
     docs_url="/docs",  # URL para Swagger UI
     redoc_url="/redoc",  # URL para ReDoc
+    lifespan=lifespan,  # Carga del repositorio en memoria al iniciar
+    default_response_class=RespuestaJSON,  # Serialización con orjson si está instalado
 )
 
 # Configurar CORS
@@ -62,8 +102,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Permitir todos los métodos HTTP
     allow_headers=["*"],  # Permitir todos los headers
+    # Cursor de paginación, versión y ETag legibles desde el frontend
+    expose_headers=[CABECERA_CURSOR, CABECERA_VERSION, "ETag"],
 )
 
+# Compresión gzip (br y zstd si están instalados) de las respuestas grandes
+# según Accept-Encoding. Los listados completos ya llegan comprimidos desde la
+# caché de compresión y los estáticos desde sus variantes precomprimidas
+app.add_middleware(MiddlewareCompresion)
+
+# Métricas de cada solicitud para /metrics (middleware más externo, de modo
+# que la duración incluya al resto de middlewares)
+app.add_middleware(MiddlewareMetricas)
+
 # REGISTRAR TODOS LOS ROUTERS
 # Cada router maneja un conjunto específico de operaciones HTTP
 logger.info("Registrando routers")
@@ -75,20 +126,43 @@ app.include_router(DELETE.router, tags=["🗑️ Eliminar"])
 app.include_router(OTHERS.router, tags=["🌟 General"])
 
 # Static files
-# Montar directorio de archivos estáticos para servir frontend
+# Montar directorio de archivos estáticos para servir frontend. Si se construyó
+# con python -m utils.MDactivos, se sirven los activos con hash (caché de un año)
+# y las variantes .gz/.br precomprimidas
 logger.info("Montando archivos estáticos")
-static_dir: str = os.path.join(os.path.dirname(__file__), "static")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+if not activos.construido_disponible():
+    logger.warning(
+        "Frontend sin construir; se sirven los originales sin comprimir "
+        "(python -m utils.MDactivos)"
+    )
+app.mount(URL_STATIC, activos, name="static")
 
 if __name__ == "__main__":
     import uvicorn
 
     # Punto de entrada principal para ejecutar la aplicación
     # Se ejecuta solo cuando el script se llama directamente
-    logger.info("Iniciando servidor Uvicorn en 127.0.0.1:8000")
-    uvicorn.run(
-        app,
-        host="127.0.0.1",  # Escuchar en localhost
-        port=8000,         # Puerto estándar para desarrollo
-        reload=False       # Deshabilitar recarga automática en producción
+    logger.info(
+        "Iniciando servidor Uvicorn en %s:%s con %s worker(s)",
+        SERVIDOR_HOST,
+        SERVIDOR_PUERTO,
+        SERVIDOR_WORKERS,
     )
+    if SERVIDOR_WORKERS > 1:
+        if DURABILIDAD == DURABILIDAD_MEMORIA:
+            logger.warning("En modo memoria cada worker tiene sus propias tareas")
+        # Con varios workers uvicorn importa la aplicación en cada proceso
+        uvicorn.run(
+            "main:app",
+            host=SERVIDOR_HOST,
+            port=SERVIDOR_PUERTO,
+            workers=SERVIDOR_WORKERS,
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+        )
+    else:
+        uvicorn.run(
+            app,
+            host=SERVIDOR_HOST,     # Localhost por defecto
+            port=SERVIDOR_PUERTO,   # Puerto estándar para desarrollo
+            reload=False            # Deshabilitar recarga automática en producción
+        )
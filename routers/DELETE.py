@@ -6,6 +6,7 @@ Las tareas eliminadas se mueven a un historial para auditoría y posible restaur
 
 Funciones principales:
 - eliminar_tarea(): Elimina una tarea moviéndola al historial
+- eliminar_tareas_lote(): Elimina varias tareas con una sola escritura en disco
 - eliminar_tarea_completamente(): Elimina permanentemente del historial
 
 Características:
@@ -17,25 +18,69 @@ Características:
 
 import logging
 from typing import Any
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Body, HTTPException, Response
 
 # import sys
 # import os
 
 # sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
-from utils import (
-    leer_json,
-    guardar_eliminada,
-    escribir_datos_tareas,
-    leer_eliminadas_json,
-    escribir_datos_eliminadas,
-)
+from constants import ResultadoLote, LOTE_MAXIMO
+from utils import RegistroTarea, RespuestaJSON, escritor, repositorio
 
 router: APIRouter = APIRouter()
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+# DELETE - Eliminar varias tareas en un lote
+# (debe registrarse antes de /tareas/{tarea_id} para que "lote" no se interprete como un ID)
+@router.delete(
+    "/tareas/lote",
+    response_model=list[ResultadoLote],
+    summary="Eliminar tareas en lote",
+    description="Mueve varias tareas al historial de eliminadas en una sola solicitud, con "
+    f"una única escritura en disco. Máximo {LOTE_MAXIMO} IDs por lote. Un ID inexistente "
+    "no impide eliminar el resto: cada elemento tiene su propio resultado.",
+)
+def eliminar_tareas_lote(
+    ids: list[int] = Body(..., min_length=1, max_length=LOTE_MAXIMO)
+) -> Response:
+    """
+    Elimina varias tareas moviéndolas al historial de eliminadas.
+
+    Args:
+        ids (list[int]): IDs de las tareas a eliminar.
+
+    Returns:
+        list[ResultadoLote]: Un resultado por ID, en el mismo orden: estado 200
+                             con la tarea eliminada o 404 si no existe.
+
+    Ejemplo:
+        DELETE /tareas/lote
+        [1, 3, 6]
+    """
+    logger.info("Solicitud para eliminar %s tareas en lote", len(ids))
+    tareas_eliminadas: list[RegistroTarea | None] = escritor.ejecutar(
+        repositorio.eliminar_tareas, ids
+    )
+
+    resultados: list[dict[str, Any]] = []
+    for tarea_id, tarea in zip(ids, tareas_eliminadas):
+        if tarea is None:
+            logger.warning("Tarea %s no encontrada para eliminación en lote", tarea_id)
+            resultados.append(
+                {
+                    "id": tarea_id,
+                    "estado": 404,
+                    "tarea": None,
+                    "detalle": "Tarea no encontrada",
+                }
+            )
+        else:
+            resultados.append({"id": tarea_id, "estado": 200, "tarea": tarea, "detalle": None})
+    return RespuestaJSON(resultados)
+
+
 # DELETE - Eliminar una tarea
 @router.delete(
     "/tareas/{tarea_id}",
@@ -67,20 +112,18 @@ def eliminar_tarea(tarea_id: int) -> dict[str, Any]:
         - La tarea puede ser restaurada usando POST /eliminadas/{id}
     """
     logger.info("Solicitud para eliminar tarea con ID: %s", tarea_id)
-    datos: list[dict[str, Any]] = leer_json()
-
-    for i, tarea in enumerate(datos):
-        if tarea["id"] == tarea_id:
-            tarea_eliminada: dict[str, Any] = datos.pop(i)
-
-            # Mover al historial de eliminadas con timestamp
-            guardar_eliminada(tarea_eliminada)
-
-            # Actualizar archivo de tareas activas
-            escribir_datos_tareas(datos)
+    # Mover al historial de eliminadas con timestamp (un solo registro del
+    # diario quita la tarea de las activas y la agrega al historial)
+    tarea_eliminada: RegistroTarea | None = escritor.ejecutar(
+        repositorio.eliminar_tarea, tarea_id
+    )
 
-            logger.info("Tarea %s eliminada exitosamente", tarea_id)
-            return {"mensaje": "Tarea eliminada exitosamente", "tarea": tarea_eliminada}
+    if tarea_eliminada is not None:
+        logger.info("Tarea %s eliminada exitosamente", tarea_id)
+        return {
+            "mensaje": "Tarea eliminada exitosamente",
+            "tarea": tarea_eliminada.a_dict(),
+        }
 
     logger.warning("Tarea %s no encontrada para eliminación", tarea_id)
     raise HTTPException(status_code=404, detail="Tarea no encontrada")
@@ -120,29 +163,22 @@ def eliminar_tarea_completamente(tarea_id: int) -> dict[str, Any]:
         "Solicitud de ELIMINACIÓN PERMANENTE para tarea con ID: %s", tarea_id
     )
 
-    # Leer el historial completo de eliminadas
-    datos_eliminadas: list[dict[str, Any]] = leer_eliminadas_json()
-
-    # Buscar y eliminar la tarea específica
-    for i, tarea in enumerate(datos_eliminadas):
-        if tarea["id"] == tarea_id:
-            tarea_eliminada: dict[str, Any] = datos_eliminadas.pop(i)
-
-            # Persistir el historial actualizado
-            try:
-                escribir_datos_eliminadas(datos_eliminadas)
-
-                logger.warning(
-                    "Tarea %s ELIMINADA PERMANENTEMENTE del historial", tarea_id
-                )
-                return {
-                    "mensaje": "Tarea eliminada permanentemente del sistema",
-                    "advertencia": "Esta acción no se puede deshacer",
-                    "tarea": tarea_eliminada,
-                }
-            except Exception as e:
-                logger.error("Error al guardar cambios: %s", e)
-                raise
+    # Buscar y eliminar la tarea específica del historial, persistiendo el cambio
+    try:
+        tarea_eliminada: RegistroTarea | None = escritor.ejecutar(
+            repositorio.quitar_eliminada, tarea_id
+        )
+    except Exception as e:
+        logger.error("Error al guardar cambios: %s", e)
+        raise
+
+    if tarea_eliminada is not None:
+        logger.warning("Tarea %s ELIMINADA PERMANENTEMENTE del historial", tarea_id)
+        return {
+            "mensaje": "Tarea eliminada permanentemente del sistema",
+            "advertencia": "Esta acción no se puede deshacer",
+            "tarea": tarea_eliminada.a_dict(),
+        }
 
     logger.warning(
         "Tarea %s no encontrada en historial para eliminación permanente", tarea_id
@@ -5,15 +5,24 @@ Este módulo define las rutas para consultar tareas eliminadas en el sistema.
 Proporciona endpoints para obtener todas las tareas eliminadas o una específica por ID.
 
 Funciones principales:
-- obtener_tareas_eliminadas(): Lista todas las tareas eliminadas con timestamps
+- obtener_tareas_eliminadas(): Lista las tareas eliminadas con timestamps, completas o por páginas
 - obtener_tarea_eliminada(): Obtiene una tarea eliminada específica por su ID
 """
 
 import logging
-from typing import Any
-from fastapi import APIRouter, Path, HTTPException
-from constants import Tarea
-from utils import leer_eliminadas_json
+from fastapi import APIRouter, Path, HTTPException, Query, Request, Response
+from constants import TareaEliminada, PAGINA_LIMITE_MAXIMO, CABECERA_CURSOR
+from utils import (
+    RegistroEliminada,
+    RespuestaJSON,
+    cabeceras_validacion,
+    serializar,
+    formato_transmision,
+    repositorio,
+    respuesta_comprimida,
+    respuesta_no_modificada,
+    respuesta_transmitida,
+)
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -28,15 +37,47 @@ def registrar_rutas_eliminadas(router: APIRouter) -> None:
 
     @router.get(
         "/eliminadas",
+        response_model=list[TareaEliminada],
         summary="Obtener tareas eliminadas",
-        description="Retorna una lista con todas las tareas eliminadas del sistema.",
+        description="Retorna una lista con todas las tareas eliminadas del sistema. "
+        "Con el parámetro limite la lista se pagina por cursor: la cabecera "
+        f"{CABECERA_CURSOR} indica el valor de despues_de_id para la página siguiente. "
+        "Para historiales grandes, la respuesta puede transmitirse por fragmentos con "
+        "Accept: application/x-ndjson (una tarea por línea) o ?transmitir=true.",
     )
-    def obtener_tareas_eliminadas() -> list[dict[str, Any]]:
+    def obtener_tareas_eliminadas(
+        request: Request,
+        limite: int | None = Query(
+            None,
+            description="Máximo de tareas a retornar (sin límite si se omite)",
+            ge=1,
+            le=PAGINA_LIMITE_MAXIMO,
+        ),
+        despues_de_id: int = Query(
+            0, description="Cursor: retornar solo tareas con ID mayor a este", ge=0
+        ),
+        transmitir: bool = Query(
+            False, description="Transmitir el arreglo JSON por fragmentos"
+        ),
+    ) -> Response:
         """
-        Obtiene todas las tareas eliminadas del sistema con información de auditoría.
+        Obtiene las tareas eliminadas del sistema con información de auditoría,
+        opcionalmente por páginas con cursor.
+
+        Args:
+            request (Request): Solicitud; su cabecera Accept puede pedir NDJSON
+                               y Accept-Encoding una respuesta comprimida.
+            limite (int | None): Máximo de tareas por página. Si se omite se
+                                 retornan todas las tareas restantes.
+            despues_de_id (int): Cursor; solo se retornan tareas con ID mayor.
+            transmitir (bool): Enviar el arreglo JSON por fragmentos.
 
         Returns:
-            list[dict]: Lista de todas las tareas eliminadas incluyendo fecha de eliminación.
+            list[dict]: Tareas eliminadas de la página incluyendo fecha de eliminación.
+                        Si quedan más, la cabecera X-Siguiente-Cursor contiene
+                        el cursor de la página siguiente. Si se pidió
+                        transmisión, una StreamingResponse que serializa las
+                        tareas por bloques sin construir el cuerpo completo.
 
         Ejemplo de respuesta:
             [
@@ -50,29 +91,71 @@ def registrar_rutas_eliminadas(router: APIRouter) -> None:
             ]
         """
         logger.info("Solicitud para obtener todas las tareas eliminadas")
-        tareas_eliminadas: list[dict[str, Any]] = leer_eliminadas_json()
+        # Si el cliente ya tiene la versión actual, responder 304 sin listar
+        # El 304 repite el Vary del 200 (Accept más el Accept-Encoding de la compresión)
+        no_modificada: Response | None = respuesta_no_modificada(
+            request, repositorio.version_eliminadas(), vary="Accept, Accept-Encoding"
+        )
+        if no_modificada is not None:
+            return no_modificada
+        # La versión de las cabeceras se lee junto con las tareas
+        version: tuple[str, float]
+        tareas_eliminadas: list[RegistroEliminada]
+        siguiente: int | None = None
+        completo: bool = limite is None and despues_de_id == 0
+        if completo:
+            version, tareas_eliminadas = repositorio.listado_eliminadas()
+        else:
+            version, tareas_eliminadas, siguiente = repositorio.pagina_eliminadas(
+                despues_de_id, limite
+            )
+        cabeceras: dict[str, str] = {
+            **cabeceras_validacion(version),
+            "Vary": "Accept",
+        }
+        if siguiente is not None:
+            cabeceras[CABECERA_CURSOR] = str(siguiente)
         logger.info("Tareas eliminadas cargadas: %s items", len(tareas_eliminadas))
-        return tareas_eliminadas
+
+        formato: str | None = formato_transmision(request, transmitir)
+        if formato is not None:
+            return respuesta_transmitida(tareas_eliminadas, formato, cabeceras)
+        if completo:
+            # Historial completo: serializado y comprimido una vez por versión
+            return respuesta_comprimida(
+                request,
+                "eliminadas",
+                version[0],
+                lambda: serializar(tareas_eliminadas),
+                cabeceras,
+            )
+        # Las tareas del repositorio ya fueron validadas: se serializan sin
+        # volver a pasar por response_model
+        return RespuestaJSON(tareas_eliminadas, headers=cabeceras)
 
     @router.get(
         "/eliminadas/{tarea_id}",
-        response_model=Tarea,
+        response_model=TareaEliminada,
         summary="Obtener tarea eliminada por ID",
         description="Retorna los detalles de una tarea eliminada específica identificada por su ID único.",
     )
     def obtener_tarea_eliminada(
+        request: Request,
         tarea_id: int = Path(
             ..., description="ID único de la tarea eliminada a buscar", ge=1
-        )
-    ) -> dict[str, Any]:
+        ),
+    ) -> Response:
         """
         Obtiene una tarea eliminada específica por su ID único.
 
         Args:
+            request (Request): Solicitud; puede traer If-None-Match o If-Modified-Since.
             tarea_id (int): ID único de la tarea eliminada a buscar. Debe ser mayor o igual a 1.
 
         Returns:
-            dict: Los detalles completos de la tarea eliminada incluyendo fecha de eliminación.
+            dict: Los detalles completos de la tarea eliminada incluyendo fecha de
+                  eliminación, o una respuesta 304 sin cuerpo si el cliente ya
+                  tiene la versión actual.
 
         Raises:
             HTTPException: Si la tarea eliminada con el ID especificado no existe (404).
@@ -87,12 +170,19 @@ def registrar_rutas_eliminadas(router: APIRouter) -> None:
             }
         """
         logger.info("Solicitud para obtener tarea eliminada con ID: %s", tarea_id)
-        datos: list[dict[str, Any]] = leer_eliminadas_json()
-
-        for tarea in datos:
-            if tarea["id"] == tarea_id:
-                logger.info("Tarea eliminada %s encontrada", tarea_id)
-                return tarea
+        version: tuple[str, float] = repositorio.version_eliminadas()
+        no_modificada: Response | None = respuesta_no_modificada(
+            request, version, str(tarea_id)
+        )
+        if no_modificada is not None:
+            return no_modificada
+        tarea: RegistroEliminada | None = repositorio.obtener_eliminada(tarea_id)
+
+        if tarea is not None:
+            logger.info("Tarea eliminada %s encontrada", tarea_id)
+            return RespuestaJSON(
+                tarea, headers=cabeceras_validacion(version, str(tarea_id))
+            )
 
         logger.warning("Tarea eliminada %s no encontrada", tarea_id)
         raise HTTPException(status_code=404, detail="Tarea eliminada no encontrada")
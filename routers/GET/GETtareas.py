@@ -5,18 +5,48 @@ Este módulo define las rutas para consultar tareas activas en el sistema.
 Proporciona endpoints para obtener todas las tareas o una tarea específica por ID.
 
 Funciones principales:
-- obtener_tareas(): Lista todas las tareas activas
+- obtener_tareas(): Lista las tareas activas con filtros, orden y páginas con cursor
+- buscar_tareas(): Busca tareas activas por palabras del título y la descripción
+- obtener_cambios(): Retorna solo las tareas que cambiaron desde una versión
 - obtener_tarea(): Obtiene una tarea específica por su ID
 """
 
 import logging
-from typing import Any
-from fastapi import HTTPException, APIRouter, Path
-from constants import Tarea
-from utils import leer_json
+from typing import Any, Literal
+from fastapi import HTTPException, APIRouter, Path, Query, Request, Response
+from constants import (
+    Tarea,
+    CambiosTareas,
+    PAGINA_LIMITE_MAXIMO,
+    CABECERA_CURSOR,
+    CABECERA_VERSION,
+    BUSQUEDA_LIMITE,
+)
+from utils import (
+    RegistroTarea,
+    RespuestaJSON,
+    cabeceras_validacion,
+    serializar,
+    formato_transmision,
+    repositorio,
+    respuesta_comprimida,
+    respuesta_no_modificada,
+    respuesta_transmitida,
+)
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Criterios por defecto del listado: equivalen a retornar todas las tareas
+CONSULTA_COMPLETA: dict[str, Any] = {
+    "completada": None,
+    "id_desde": None,
+    "id_hasta": None,
+    "orden": "id",
+    "descendente": False,
+    "despues_de_id": 0,
+    "limite": None,
+}
+
 
 def registrar_rutas_tareas(router: APIRouter) -> None:
     """
@@ -30,14 +60,73 @@ def registrar_rutas_tareas(router: APIRouter) -> None:
         "/tareas",
         response_model=list[Tarea],
         summary="Obtener todas las tareas",
-        description="Retorna una lista con todas las tareas activas almacenadas en el sistema.",
+        description="Retorna una lista con todas las tareas activas almacenadas en el sistema. "
+        "Se puede filtrar por estado (completada) y rango de IDs, y ordenar por ID o título. "
+        "Con el parámetro limite la lista se pagina por cursor: la cabecera "
+        f"{CABECERA_CURSOR} indica el valor de despues_de_id para la página siguiente. "
+        f"La cabecera {CABECERA_VERSION} indica la versión del listado, a partir de la "
+        "cual GET /tareas/cambios retorna solo lo que cambió. "
+        "Para listados grandes, la respuesta puede transmitirse por fragmentos con "
+        "Accept: application/x-ndjson (una tarea por línea) o ?transmitir=true.",
     )
-    def obtener_tareas() -> list[dict[str, Any]]:
+    def obtener_tareas(
+        request: Request,
+        completada: bool | None = Query(
+            None, description="Retornar solo tareas completadas (true) o pendientes (false)"
+        ),
+        id_desde: int | None = Query(None, description="ID mínimo (inclusive)", ge=1),
+        id_hasta: int | None = Query(None, description="ID máximo (inclusive)", ge=1),
+        orden: Literal["id", "titulo"] = Query("id", description="Campo de orden"),
+        descendente: bool = Query(False, description="Ordenar de forma descendente"),
+        limite: int | None = Query(
+            None,
+            description="Máximo de tareas a retornar (sin límite si se omite)",
+            ge=1,
+            le=PAGINA_LIMITE_MAXIMO,
+        ),
+        despues_de_id: int = Query(
+            0,
+            description="Cursor: ID de la última tarea de la página anterior",
+            ge=0,
+        ),
+        transmitir: bool = Query(
+            False, description="Transmitir el arreglo JSON por fragmentos"
+        ),
+    ) -> Response:
         """
-        Obtiene todas las tareas activas del sistema.
+        Obtiene las tareas activas del sistema, con filtros, orden y páginas opcionales.
+
+        La paginación es por conjunto de claves (keyset): el cursor es el último ID
+        de la página anterior, de modo que cada página cuesta O(tamaño de página)
+        sin importar cuántas tareas haya antes. El filtro por estado usa el índice
+        de IDs por estado del repositorio, así que pedir las tareas pendientes no
+        recorre las completadas.
+
+        Args:
+            request (Request): Solicitud; su cabecera Accept puede pedir NDJSON
+                               y Accept-Encoding una respuesta comprimida.
+            completada (bool | None): Filtrar por estado; si se omite, ambos.
+            id_desde (int | None): ID mínimo (inclusive).
+            id_hasta (int | None): ID máximo (inclusive).
+            orden (str): "id" (por defecto) o "titulo".
+            descendente (bool): Invertir el orden.
+            limite (int | None): Máximo de tareas por página. Si se omite se
+                                 retornan todas las tareas restantes.
+            despues_de_id (int): Cursor; se retornan las tareas que siguen a
+                                 esta en el orden pedido.
+            transmitir (bool): Enviar el arreglo JSON por fragmentos.
 
         Returns:
-            list[Tarea]: Lista de todas las tareas activas con sus detalles completos.
+            list[Tarea]: Tareas activas de la página con sus detalles completos.
+                         Si quedan más, la cabecera X-Siguiente-Cursor contiene
+                         el cursor de la página siguiente; X-Version, la
+                         versión para GET /tareas/cambios. Si se pidió
+                         transmisión, una StreamingResponse que serializa las
+                         tareas por bloques sin construir el cuerpo completo.
+
+        Raises:
+            HTTPException: Si el cursor no corresponde a una tarea al ordenar
+                           por título (400).
 
         Ejemplo de respuesta:
             [
@@ -50,9 +139,176 @@ def registrar_rutas_tareas(router: APIRouter) -> None:
             ]
         """
         logger.info("Solicitud para obtener todas las tareas")
-        tareas: list[dict[str, Any]] = leer_json()
+        # Si el cliente ya tiene la versión actual, responder 304 sin listar
+        # El 304 repite el Vary del 200 (Accept más el Accept-Encoding de la compresión)
+        no_modificada: Response | None = respuesta_no_modificada(
+            request, repositorio.version_tareas(), vary="Accept, Accept-Encoding"
+        )
+        if no_modificada is not None:
+            return no_modificada
+        criterios: dict[str, Any] = {
+            "completada": completada,
+            "id_desde": id_desde,
+            "id_hasta": id_hasta,
+            "orden": orden,
+            "descendente": descendente,
+            "despues_de_id": despues_de_id,
+            "limite": limite,
+        }
+        # La versión de las cabeceras se lee junto con las tareas, de modo que
+        # describe exactamente lo que se responde
+        version: tuple[str, float]
+        tareas: list[RegistroTarea]
+        siguiente: int | None = None
+        if criterios == CONSULTA_COMPLETA:
+            # Sin filtros ni páginas: listado completo ya ordenado y en caché
+            version, tareas = repositorio.listado_tareas()
+        else:
+            try:
+                version, tareas, siguiente = repositorio.consultar_tareas(**criterios)
+            except ValueError as e:
+                logger.warning("Consulta de tareas inválida: %s", e)
+                raise HTTPException(status_code=400, detail=str(e))
+        cabeceras: dict[str, str] = {
+            **cabeceras_validacion(version),
+            CABECERA_VERSION: version[0],
+            "Vary": "Accept",
+        }
+        if siguiente is not None:
+            cabeceras[CABECERA_CURSOR] = str(siguiente)
         logger.info("Tareas cargadas: %s items", len(tareas))
-        return tareas
+
+        formato: str | None = formato_transmision(request, transmitir)
+        if formato is not None:
+            return respuesta_transmitida(tareas, formato, cabeceras)
+        if criterios == CONSULTA_COMPLETA:
+            # Listado completo: serializado y comprimido una vez por versión
+            return respuesta_comprimida(
+                request, "tareas", version[0], lambda: serializar(tareas), cabeceras
+            )
+        # Las tareas del repositorio ya fueron validadas: se serializan sin
+        # volver a pasar por response_model
+        return RespuestaJSON(tareas, headers=cabeceras)
+
+    # Debe registrarse antes de /tareas/{tarea_id} para que "buscar" no se
+    # interprete como un ID
+    @router.get(
+        "/tareas/buscar",
+        response_model=list[Tarea],
+        summary="Buscar tareas",
+        description="Busca tareas activas cuyo título o descripción contengan todas las "
+        "palabras indicadas, sin distinguir mayúsculas ni tildes. Cada palabra puede ser "
+        "el comienzo de una palabra (prefijo). Los resultados se ordenan por relevancia.",
+    )
+    def buscar_tareas(
+        q: str = Query(..., description="Palabras a buscar", min_length=1, max_length=200),
+        completada: bool | None = Query(
+            None, description="Retornar solo tareas completadas (true) o pendientes (false)"
+        ),
+        limite: int = Query(
+            BUSQUEDA_LIMITE,
+            description="Máximo de resultados",
+            ge=1,
+            le=PAGINA_LIMITE_MAXIMO,
+        ),
+    ) -> Response:
+        """
+        Busca tareas activas por palabras usando el índice invertido del repositorio.
+
+        La búsqueda solo visita las tareas que contienen los términos buscados,
+        por lo que su costo no crece con el total de tareas almacenadas.
+
+        Args:
+            q (str): Texto a buscar, por ejemplo "program fast".
+            completada (bool | None): Filtrar por estado; si se omite, ambos.
+            limite (int): Máximo de resultados a retornar.
+
+        Returns:
+            list[Tarea]: Tareas encontradas, de mayor a menor relevancia.
+
+        Ejemplo de respuesta:
+            [
+                {
+                    "id": 1,
+                    "titulo": "Aprender FastAPI",
+                    "descripcion": "Estudiar conceptos básicos",
+                    "completada": false
+                }
+            ]
+        """
+        logger.info("Solicitud para buscar tareas: %s", q)
+        tareas: list[RegistroTarea] = repositorio.buscar_tareas(q, completada, limite)
+        logger.info("Tareas encontradas: %s items", len(tareas))
+        return RespuestaJSON(tareas)
+
+    @router.get(
+        "/tareas/cambios",
+        response_model=CambiosTareas,
+        summary="Obtener cambios desde una versión",
+        description="Retorna solo las tareas activas creadas, modificadas, eliminadas o "
+        "restauradas desde la versión indicada (la del campo version de la respuesta "
+        f"anterior o la cabecera {CABECERA_VERSION} de GET /tareas); la versión es válida "
+        "en cualquier worker. Sin versión, si es demasiado antigua o si es anterior al "
+        "arranque del proceso, retorna el listado completo con completo=true.",
+    )
+    def obtener_cambios(
+        request: Request,
+        desde: str | None = Query(
+            None, description="Versión que tiene el cliente", max_length=64
+        ),
+    ) -> Response:
+        """
+        Obtiene los cambios de las tareas activas desde la versión del cliente.
+
+        El costo es proporcional a la cantidad de cambios, no al total de
+        tareas: el repositorio recuerda qué tareas cambiaron en cada una de las
+        últimas CAMBIOS_MAXIMOS modificaciones.
+
+        Args:
+            request (Request): Solicitud; se usa su cabecera Accept-Encoding.
+            desde (str | None): Versión que tiene el cliente.
+
+        Returns:
+            CambiosTareas: Versión actual, tareas con cambios e IDs que dejaron de
+                           estar activos, o el listado completo si la versión no
+                           está disponible.
+
+        Ejemplo de respuesta:
+            {
+                "version": "12-4096",
+                "completo": false,
+                "tareas": [
+                    {
+                        "id": 3,
+                        "titulo": "Aprender FastAPI",
+                        "descripcion": "Estudiar conceptos básicos",
+                        "completada": true
+                    }
+                ],
+                "eliminadas": [2]
+            }
+        """
+        logger.info("Solicitud de cambios de tareas desde la versión %s", desde)
+        version, completo, tareas, eliminadas = repositorio.cambios_tareas(desde)
+        logger.info(
+            "Cambios desde %s: %s tareas, %s eliminadas (completo: %s)",
+            desde,
+            len(tareas),
+            len(eliminadas),
+            completo,
+        )
+        cambios: dict[str, Any] = {
+            "version": version,
+            "completo": completo,
+            "tareas": tareas,
+            "eliminadas": eliminadas,
+        }
+        if completo:
+            # Resincronización completa: serializada y comprimida una vez por versión
+            return respuesta_comprimida(
+                request, "cambios", version, lambda: serializar(cambios)
+            )
+        return RespuestaJSON(cambios)
 
     @router.get(
         "/tareas/{tarea_id}",
@@ -61,16 +317,19 @@ def registrar_rutas_tareas(router: APIRouter) -> None:
         description="Retorna los detalles de una tarea específica identificada por su ID único.",
     )
     def obtener_tarea(
-        tarea_id: int = Path(..., description="ID único de la tarea a buscar", ge=1)
-    ) -> dict[str, Any]:
+        request: Request,
+        tarea_id: int = Path(..., description="ID único de la tarea a buscar", ge=1),
+    ) -> Response:
         """
         Obtiene una tarea específica por su ID único.
 
         Args:
+            request (Request): Solicitud; puede traer If-None-Match o If-Modified-Since.
             tarea_id (int): ID único de la tarea a buscar. Debe ser mayor o igual a 1.
 
         Returns:
-            Tarea: Los detalles completos de la tarea encontrada.
+            Tarea: Los detalles completos de la tarea encontrada, o una respuesta
+                   304 sin cuerpo si el cliente ya tiene la versión actual.
 
         Raises:
             HTTPException: Si la tarea con el ID especificado no existe (404).
@@ -84,12 +343,19 @@ def registrar_rutas_tareas(router: APIRouter) -> None:
             }
         """
         logger.info("Solicitud para obtener tarea con ID: %s", tarea_id)
-        datos: list[dict[str, Any]] = leer_json()
+        version: tuple[str, float] = repositorio.version_tareas()
+        no_modificada: Response | None = respuesta_no_modificada(
+            request, version, str(tarea_id)
+        )
+        if no_modificada is not None:
+            return no_modificada
+        tarea: RegistroTarea | None = repositorio.obtener_tarea(tarea_id)
 
-        for tarea in datos:
-            if tarea["id"] == tarea_id:
-                logger.info("Tarea %s encontrada", tarea_id)
-                return tarea
+        if tarea is not None:
+            logger.info("Tarea %s encontrada", tarea_id)
+            return RespuestaJSON(
+                tarea, headers=cabeceras_validacion(version, str(tarea_id))
+            )
 
         logger.warning("Tarea %s no encontrada", tarea_id)
         raise HTTPException(status_code=404, detail="Tarea no encontrada")
@@ -6,6 +6,8 @@ organizadas por contexto (tareas activas y tareas eliminadas).
 
 Rutas disponibles:
 - GET /tareas: Lista todas las tareas activas
+- GET /tareas/buscar: Busca tareas activas por texto
+- GET /tareas/cambios: Cambios de las tareas activas desde una versión
 - GET /tareas/{id}: Obtiene una tarea específica
 - GET /eliminadas: Lista todas las tareas eliminadas
 - GET /eliminadas/{id}: Obtiene una tarea eliminada específica
@@ -6,37 +6,89 @@ Incluye la ruta raíz para servir la aplicación frontend y otras utilidades.
 
 Funciones principales:
 - get_aplicacion(): Sirve la interfaz web principal
+- obtener_metricas(): Expone las métricas en formato Prometheus
 
 Características:
-- Servidor de archivos estáticos integrado
+- Servidor de archivos estáticos integrado: index.html construido (si existe),
+  comprimido según Accept-Encoding y revalidable con ETag
 - Punto de entrada principal para la aplicación web
+- Métricas de solicitudes, almacenamiento y cantidad de tareas en /metrics
 """
 
-import os
 import logging
-from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import HTMLResponse
+
+from utils import metricas, repositorio
+from utils.MDactivos import activos
 
 router: APIRouter = APIRouter()
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Tipo de contenido del formato de texto de Prometheus (Starlette agrega el charset)
+MEDIA_PROMETHEUS: str = "text/plain; version=0.0.4"
+
+# Indicadores calculados al consultar /metrics
+metricas.indicador(
+    "tareas_activas", "Tareas activas en el repositorio", lambda: repositorio.contar()[0]
+)
+metricas.indicador(
+    "tareas_eliminadas",
+    "Tareas en el historial de eliminadas",
+    lambda: repositorio.contar()[1],
+)
+metricas.indicador(
+    "tareas_operaciones_pendientes",
+    "Operaciones registradas desde la última compactación del almacenamiento",
+    repositorio.pendientes,
+)
+
 
-@router.get("/")
-def get_aplicacion() -> FileResponse:
+@router.get("/", response_class=HTMLResponse)
+async def get_aplicacion(request: Request) -> Response:
     """
     Sirve la aplicación frontend principal (index.html).
 
     Esta ruta es el punto de entrada principal para la interfaz web de usuario.
     Sirve el archivo HTML que contiene la aplicación de gestión de tareas.
 
+    Args:
+        request (Request): Solicitud (Accept-Encoding, If-None-Match).
+
     Returns:
-        FileResponse: El archivo HTML de la aplicación frontend con tipo MIME correcto.
+        Response: El archivo HTML de la aplicación frontend con tipo MIME correcto,
+                  o 304 si el navegador ya tiene la versión actual.
 
     Notas:
         - Ruta raíz de la aplicación web
         - Sirve contenido estático desde el directorio /static
+        - Con el frontend construido, la versión de static/dist/ que apunta a
+          los activos con hash; Cache-Control no-cache para revalidar siempre
         - La aplicación incluye interfaz para gestionar tareas vía API
     """
     logger.info("Solicitud para servir la aplicación")
-    static_path: str = os.path.join(os.path.dirname(__file__), "../static/index.html")
-    return FileResponse(static_path)
+    return await activos.get_response("index.html", request.scope)
+
+
+@router.get(
+    "/metrics",
+    summary="Métricas en formato Prometheus",
+    description="Cantidad y duración de las solicitudes por ruta y estado, tiempos y "
+    "bytes del almacenamiento, y cantidad de tareas activas y eliminadas.",
+    response_class=Response,
+)
+def obtener_metricas() -> Response:
+    """
+    Expone las métricas de la aplicación para que Prometheus las recolecte.
+
+    Returns:
+        Response: Métricas en formato de texto de Prometheus 0.0.4.
+
+    Notas:
+        - Las métricas viven en memoria y se reinician con el proceso
+        - Los histogramas de almacenamiento distinguen origen o destino
+          (tareas, eliminadas, diario, sqlite) y fase (leer, decodificar,
+          validar, serializar, escribir, confirmar)
+    """
+    logger.debug("Solicitud de métricas")
+    return Response(metricas.exponer(), media_type=MEDIA_PROMETHEUS)
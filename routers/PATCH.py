@@ -6,6 +6,7 @@ Permite modificar solo los campos especificados sin afectar los demás.
 
 Funciones principales:
 - actualizar_tarea_parcial(): Modifica solo campos específicos de una tarea
+- actualizar_tareas_lote(): Modifica varias tareas con una sola escritura en disco
 
 Características:
 - Actualización parcial: solo campos proporcionados se modifican
@@ -15,15 +16,71 @@ Características:
 
 import logging
 from typing import Any
-from fastapi import HTTPException, APIRouter
+from fastapi import HTTPException, APIRouter, Body, Response
 
-from constants import Tarea, TareaUpdate
-from utils import leer_json, escribir_datos_tareas
+from constants import Tarea, TareaUpdate, TareaUpdateLote, ResultadoLote, LOTE_MAXIMO
+from utils import RegistroTarea, RespuestaJSON, escritor, repositorio
 
 router: APIRouter = APIRouter()
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+# PATCH - Actualizar parcialmente varias tareas en un lote
+# (debe registrarse antes de /{tarea_id} para que "lote" no se interprete como un ID)
+@router.patch(
+    "/lote",
+    response_model=list[ResultadoLote],
+    summary="Actualizar tareas en lote",
+    description="Actualiza parcialmente varias tareas en una sola solicitud, con una única "
+    f"escritura en disco. Máximo {LOTE_MAXIMO} elementos por lote. Un ID inexistente no "
+    "impide aplicar el resto: cada elemento tiene su propio resultado.",
+)
+def actualizar_tareas_lote(
+    actualizaciones: list[TareaUpdateLote] = Body(
+        ..., min_length=1, max_length=LOTE_MAXIMO
+    )
+) -> Response:
+    """
+    Actualiza parcialmente varias tareas aplicando los cambios en orden.
+
+    Args:
+        actualizaciones (list[TareaUpdateLote]): ID de cada tarea y los campos a
+                                                 modificar (los campos None no cambian).
+
+    Returns:
+        list[ResultadoLote]: Un resultado por elemento, en el mismo orden: estado
+                             200 con la tarea actualizada o 404 si no existe.
+
+    Ejemplo:
+        PATCH /tareas/lote
+        [{"id": 1, "completada": true}, {"id": 3, "titulo": "Nuevo título"}]
+    """
+    logger.info("Solicitud para actualizar %s tareas en lote", len(actualizaciones))
+    cambios: list[tuple[int, dict[str, Any]]] = [
+        (update.id, update.model_dump(exclude_none=True, exclude={"id"}))
+        for update in actualizaciones
+    ]
+    tareas_actualizadas: list[RegistroTarea | None] = escritor.ejecutar(
+        repositorio.actualizar_parciales, cambios
+    )
+
+    resultados: list[dict[str, Any]] = []
+    for (tarea_id, _), tarea in zip(cambios, tareas_actualizadas):
+        if tarea is None:
+            logger.warning("Tarea %s no encontrada para actualización en lote", tarea_id)
+            resultados.append(
+                {
+                    "id": tarea_id,
+                    "estado": 404,
+                    "tarea": None,
+                    "detalle": "Tarea no encontrada",
+                }
+            )
+        else:
+            resultados.append({"id": tarea_id, "estado": 200, "tarea": tarea, "detalle": None})
+    return RespuestaJSON(resultados)
+
+
 # PATCH - Actualizar parcialmente una tarea
 @router.patch(
     "/{tarea_id}",
@@ -32,7 +89,7 @@ logger: logging.Logger = logging.getLogger(__name__)
     description="Actualiza solo los campos especificados de una tarea existente. "
     "Los campos no proporcionados mantienen su valor actual.",
 )
-def actualizar_tarea_parcial(tarea_id: int, tarea_update: TareaUpdate) -> Tarea:
+def actualizar_tarea_parcial(tarea_id: int, tarea_update: TareaUpdate) -> Response:
     """
     Actualiza parcialmente una tarea existente modificando solo los campos especificados.
 
@@ -61,21 +118,16 @@ def actualizar_tarea_parcial(tarea_id: int, tarea_update: TareaUpdate) -> Tarea:
         {"titulo": "Nuevo título"}
     """
     logger.info("Solicitud para actualizar tarea parcial con ID: %s", tarea_id)
-    datos: list[dict[str, Any]] = leer_json()
-
-    for i, tarea_existente in enumerate(datos):
-        if tarea_existente["id"] == tarea_id:
-            # Aplicar actualizaciones solo a campos proporcionados
-            if tarea_update.titulo is not None:
-                datos[i]["titulo"] = tarea_update.titulo
-            if tarea_update.descripcion is not None:
-                datos[i]["descripcion"] = tarea_update.descripcion
-            if tarea_update.completada is not None:
-                datos[i]["completada"] = tarea_update.completada
-
-            escribir_datos_tareas(datos)
-            logger.info("Tarea %s actualizada parcialmente", tarea_id)
-            return Tarea(**datos[i])
+    # Aplicar actualizaciones solo a campos proporcionados; la lectura y la
+    # escritura ocurren en el escritor serializado para no perder cambios
+    cambios: dict[str, Any] = tarea_update.model_dump(exclude_none=True)
+    tarea_actualizada: RegistroTarea | None = escritor.ejecutar(
+        repositorio.actualizar_parcial, tarea_id, cambios
+    )
+
+    if tarea_actualizada is not None:
+        logger.info("Tarea %s actualizada parcialmente", tarea_id)
+        return RespuestaJSON(tarea_actualizada)
 
     logger.warning("Tarea %s no encontrada para actualización parcial", tarea_id)
     raise HTTPException(status_code=404, detail="Tarea no encontrada")
@@ -6,24 +6,27 @@ y restaurar tareas previamente eliminadas.
 
 Funciones principales:
 - crear_tarea(): Crea una nueva tarea asignando ID automáticamente
+- crear_tareas_lote(): Crea varias tareas con una sola escritura en disco
 - restaurar_tarea(): Restaura una tarea eliminada a las tareas activas
 
 Características:
-- Asignación automática de IDs únicos usando contador persistente
+- Asignación automática de IDs únicos usando bloques reservados en memoria
 - Validación completa de datos usando modelos Pydantic
 - Logging detallado de todas las operaciones
 """
 
 import logging
 from typing import Any
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Body, HTTPException, Response
 
-from constants import Tarea
+from constants import Tarea, ResultadoLote, LOTE_MAXIMO
 from utils import (
-    leer_json,
+    RegistroTarea,
+    RespuestaJSON,
+    asignador_ids,
+    escritor,
     obtener_proximo_id,
-    escribir_datos_tareas,
-    leer_eliminadas_json,
+    repositorio,
 )
 
 router: APIRouter = APIRouter()
@@ -70,7 +73,7 @@ logger: logging.Logger = logging.getLogger(__name__)
         },
     },
 )
-def crear_tarea(tarea: Tarea) -> Tarea:
+def crear_tarea(tarea: Tarea) -> Response:
     """
     Crea una nueva tarea en el sistema asignando automáticamente un ID único.
 
@@ -94,19 +97,65 @@ def crear_tarea(tarea: Tarea) -> Tarea:
         >>> print(creada.id)  # ID asignado automáticamente
     """
     logger.info("Solicitud para crear tarea: %s", tarea.titulo)
-    datos: list[dict[str, Any]] = leer_json()
-
     # Asignar ID automáticamente usando contador persistente
     nueva_tarea: dict[str, Any] = tarea.model_dump()
     nueva_tarea["id"] = obtener_proximo_id()
     logger.info("ID asignado: %s", nueva_tarea["id"])
 
-    # Agregar la nueva tarea a los datos y persistir
-    datos.append(nueva_tarea)
-    escribir_datos_tareas(datos)
+    # Agregar la nueva tarea al repositorio y persistir
+    escritor.ejecutar(repositorio.guardar_tarea, nueva_tarea)
     logger.info("Tarea creada exitosamente con ID: %s", nueva_tarea["id"])
     logger.debug("Retornando nueva_tarea: %s", nueva_tarea)
-    return Tarea(**nueva_tarea)
+    # La tarea ya fue validada al recibirla: se serializa sin volver a validarla
+    return RespuestaJSON(nueva_tarea)
+
+
+# POST - Crear varias tareas en un lote
+@router.post(
+    "/tareas/lote",
+    response_model=list[ResultadoLote],
+    summary="Crear tareas en lote",
+    description="Crea varias tareas en una sola solicitud. Los IDs se reservan de una vez "
+    f"y todas las tareas se guardan con una única escritura en disco. Máximo {LOTE_MAXIMO} "
+    "tareas por lote; el resultado conserva el orden de la solicitud.",
+    status_code=200,
+)
+def crear_tareas_lote(
+    tareas: list[Tarea] = Body(..., min_length=1, max_length=LOTE_MAXIMO)
+) -> Response:
+    """
+    Crea varias tareas asignando sus IDs en un solo paso.
+
+    A diferencia de llamar a POST /tareas una vez por tarea, los IDs se
+    reservan con una sola operación del asignador y todas las tareas se
+    escriben en el diario juntas, con un único fsync.
+
+    Args:
+        tareas (list[Tarea]): Tareas a crear; el ID de cada una se ignora y se
+                              asigna automáticamente.
+
+    Returns:
+        list[ResultadoLote]: Un resultado por tarea, en el mismo orden, con la
+                             tarea creada y su ID asignado.
+
+    Ejemplo:
+        POST /tareas/lote
+        [{"titulo": "A", "descripcion": "Primera"}, {"titulo": "B", "descripcion": "Segunda"}]
+    """
+    logger.info("Solicitud para crear %s tareas en lote", len(tareas))
+    ids: list[int] = asignador_ids.reservar(len(tareas))
+    nuevas_tareas: list[dict[str, Any]] = [
+        {**tarea.model_dump(), "id": tarea_id} for tarea, tarea_id in zip(tareas, ids)
+    ]
+
+    escritor.ejecutar(repositorio.crear_tareas, nuevas_tareas)
+    logger.info("Tareas creadas en lote: IDs %s a %s", ids[0], ids[-1])
+    return RespuestaJSON(
+        [
+            {"id": tarea["id"], "estado": 200, "tarea": tarea, "detalle": None}
+            for tarea in nuevas_tareas
+        ]
+    )
 
 
 # POST - Restaurar una tarea eliminada
@@ -140,7 +189,7 @@ def crear_tarea(tarea: Tarea) -> Tarea:
         },
     },
 )
-def restaurar_tarea(tarea_id: int) -> Tarea:
+def restaurar_tarea(tarea_id: int) -> Response:
     """
     Restaura una tarea previamente eliminada moviéndola de vuelta a las tareas activas.
 
@@ -164,45 +213,15 @@ def restaurar_tarea(tarea_id: int) -> Tarea:
     """
     logger.info("Solicitud para restaurar tarea con ID: %s", tarea_id)
 
-    # Leer datos actuales de tareas activas y eliminadas
-    datos: list[dict[str, Any]] = leer_json()
-    eliminadas: list[dict[str, Any]] = leer_eliminadas_json()
-
-    # Buscar y extraer la tarea del historial de eliminadas
-    tarea_a_restaurar: dict[str, Any] | None = None
-    for i, tarea in enumerate(eliminadas):
-        if tarea["id"] == tarea_id:
-            tarea_a_restaurar = eliminadas.pop(i)
-            break
+    # Mover de vuelta a las tareas activas con un solo registro del diario,
+    # removiendo la metadata de eliminación (el repositorio mantiene el orden por ID)
+    tarea_restaurada: RegistroTarea | None = escritor.ejecutar(
+        repositorio.restaurar_tarea, tarea_id
+    )
 
-    if not tarea_a_restaurar:
+    if not tarea_restaurada:
         logger.warning("Tarea %s no encontrada en eliminadas", tarea_id)
         raise HTTPException(status_code=404, detail="Tarea no encontrada en eliminadas")
 
-    # Limpiar la tarea removiendo metadata de eliminación
-    tarea_restaurada: dict[str, Any] = {
-        k: v for k, v in tarea_a_restaurar.items() if k != "fecha_eliminacion"
-    }
-
-    # Insertar en posición correcta para mantener orden por ID
-    id_restaurado: int = tarea_restaurada["id"]
-    for i, tarea in enumerate(datos):
-        if tarea["id"] > id_restaurado:
-            posicion: int = i
-            break
-    else:
-        posicion = len(datos)
-    datos.insert(posicion, tarea_restaurada)
-
-    # Persistir cambios en ambos archivos
-    escribir_datos_tareas(datos)
-
-    # Actualizar archivo de eliminadas (sin la tarea restaurada)
-    import json
-    from constants import DELETED_JSON
-
-    with open(DELETED_JSON, "w", encoding="utf-8") as file:
-        json.dump(eliminadas, file, indent=2, ensure_ascii=False)
-
     logger.info("Tarea %s restaurada exitosamente", tarea_id)
-    return Tarea(**tarea_restaurada)
+    return RespuestaJSON(tarea_restaurada)
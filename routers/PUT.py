@@ -14,11 +14,10 @@ Características:
 """
 
 import logging
-from typing import Any
-from fastapi import HTTPException, APIRouter
+from fastapi import HTTPException, APIRouter, Response
 
 from constants import Tarea
-from utils import leer_json, escribir_datos_tareas
+from utils import RegistroTarea, RespuestaJSON, escritor, repositorio
 
 router: APIRouter = APIRouter()
 logger: logging.Logger = logging.getLogger(__name__)
@@ -32,7 +31,7 @@ logger: logging.Logger = logging.getLogger(__name__)
     description="Reemplaza completamente una tarea existente con nuevos datos. "
     "Todos los campos deben ser proporcionados.",
 )
-def actualizar_tarea_completa(tarea_id: int, tarea: Tarea) -> Tarea:
+def actualizar_tarea_completa(tarea_id: int, tarea: Tarea) -> Response:
     """
     Actualiza completamente una tarea existente reemplazando todos sus campos.
 
@@ -57,17 +56,14 @@ def actualizar_tarea_completa(tarea_id: int, tarea: Tarea) -> Tarea:
         - La validación Pydantic se aplica a los nuevos datos
     """
     logger.info("Solicitud para actualizar tarea completa con ID: %s", tarea_id)
-    datos: list[dict[str, Any]] = leer_json()
+    # Reemplazar la tarea manteniendo el ID original
+    tarea_actualizada: RegistroTarea | None = escritor.ejecutar(
+        repositorio.actualizar_tarea, tarea_id, tarea.model_dump()
+    )
 
-    for i, tarea_existente in enumerate(datos):
-        if tarea_existente["id"] == tarea_id:
-            # Preparar actualización manteniendo el ID original
-            tarea_actualizada: dict[str, Any] = tarea.model_dump()
-            tarea_actualizada["id"] = tarea_id
-            datos[i] = tarea_actualizada
-            escribir_datos_tareas(datos)
-            logger.info("Tarea %s actualizada completamente", tarea_id)
-            return Tarea(**tarea_actualizada)
+    if tarea_actualizada is not None:
+        logger.info("Tarea %s actualizada completamente", tarea_id)
+        return RespuestaJSON(tarea_actualizada)
 
     logger.warning("Tarea %s no encontrada para actualización completa", tarea_id)
     raise HTTPException(status_code=404, detail="Tarea no encontrada")
@@ -3,9 +3,17 @@ const API_BASE_URL = "http://localhost:8000";
 
 console.log("Script app.js cargado correctamente");
 
+// Cantidad de tareas solicitadas por página
+const TAMANO_PAGINA = 50;
+
 // Variables globales
 let editandoTarea = false;
 let tareaEditandoId = null;
+let siguienteCursor = null; // Cursor de la siguiente página (null si no hay más)
+let cargandoPagina = false;
+let temporizadorBusqueda = null;
+let versionTareas = null; // Versión de la lista mostrada (null si no se puede sincronizar)
+let tareasMostradas = new Map(); // Tareas de las páginas cargadas, por ID
 
 // Función para mostrar mensajes
 function mostrarMensaje(mensaje, tipo = "success") {
@@ -22,29 +30,127 @@ function mostrarMensaje(mensaje, tipo = "success") {
   }, 5000);
 }
 
-// Función para cargar todas las tareas
+// Función para cargar las tareas desde la primera página
 async function cargarTareas() {
+  siguienteCursor = null;
+  const consulta = document.getElementById("busqueda").value.trim();
+  if (consulta) {
+    await buscarTareas(consulta);
+    return;
+  }
+  await cargarPaginaTareas(false);
+}
+
+// Función para buscar tareas por texto en el servidor
+async function buscarTareas(consulta) {
   try {
-    const response = await fetch(`${API_BASE_URL}/tareas`);
+    const params = new URLSearchParams({ q: consulta, limite: TAMANO_PAGINA });
+    const response = await fetch(`${API_BASE_URL}/tareas/buscar?${params}`);
     if (!response.ok) {
-      throw new Error("Error al cargar las tareas");
+      throw new Error("Error al buscar tareas");
     }
 
     const tareas = await response.json();
+    siguienteCursor = null;
+    // Los resultados de búsqueda no se sincronizan por cambios
+    versionTareas = null;
     mostrarTareas(tareas);
+    actualizarBotonCargarMas();
+  } catch (error) {
+    console.error("Error:", error);
+    mostrarMensaje("Error al buscar tareas", "error");
+  }
+}
+
+// Función para cargar la siguiente página y agregarla a la lista
+async function cargarMasTareas() {
+  if (siguienteCursor === null || cargandoPagina) {
+    return;
+  }
+  await cargarPaginaTareas(true);
+}
+
+// Función para pedir una página de tareas usando el cursor
+async function cargarPaginaTareas(agregar) {
+  cargandoPagina = true;
+  try {
+    const params = new URLSearchParams({ limite: TAMANO_PAGINA });
+    if (agregar && siguienteCursor !== null) {
+      params.set("despues_de_id", siguienteCursor);
+    }
+    const response = await fetch(`${API_BASE_URL}/tareas?${params}`);
+    if (!response.ok) {
+      throw new Error("Error al cargar las tareas");
+    }
+
+    const tareas = await response.json();
+    siguienteCursor = response.headers.get("X-Siguiente-Cursor");
+    if (!agregar) {
+      versionTareas = response.headers.get("X-Version");
+      tareasMostradas = new Map();
+    }
+    tareas.forEach((tarea) => tareasMostradas.set(tarea.id, tarea));
+    mostrarTareas(tareas, agregar);
+    actualizarBotonCargarMas();
   } catch (error) {
     console.error("Error:", error);
     mostrarMensaje("Error al cargar las tareas", "error");
     document.getElementById("tasks-container").innerHTML =
       '<div class="alert alert-error">Error al cargar las tareas. Verifica que la API esté ejecutándose.</div>';
+  } finally {
+    cargandoPagina = false;
   }
 }
 
-// Función para mostrar las tareas en el HTML
-function mostrarTareas(tareas) {
+// Función para aplicar a la lista solo los cambios desde la versión mostrada
+async function sincronizarTareas() {
+  if (versionTareas === null) {
+    await cargarTareas();
+    return;
+  }
+  try {
+    const params = new URLSearchParams({ desde: versionTareas });
+    const response = await fetch(`${API_BASE_URL}/tareas/cambios?${params}`);
+    if (!response.ok) {
+      throw new Error("Error al sincronizar las tareas");
+    }
+
+    const cambios = await response.json();
+    if (cambios.completo) {
+      // El servidor no tenía los cambios desde nuestra versión: volver a
+      // cargar la primera página (respeta la paginación y el cursor)
+      await cargarTareas();
+      return;
+    }
+    // Solo se muestran las tareas de las páginas ya cargadas; las siguientes
+    // llegan con "Cargar más"
+    const ultimoId =
+      siguienteCursor === null ? Infinity : Number(siguienteCursor);
+    cambios.tareas.forEach((tarea) => {
+      if (tarea.id <= ultimoId) {
+        tareasMostradas.set(tarea.id, tarea);
+      }
+    });
+    cambios.eliminadas.forEach((id) => tareasMostradas.delete(id));
+    versionTareas = cambios.version;
+    mostrarTareas([...tareasMostradas.values()].sort((a, b) => a.id - b.id));
+  } catch (error) {
+    console.error("Error:", error);
+    await cargarTareas();
+  }
+}
+
+// Función para mostrar u ocultar el botón de cargar más según el cursor
+function actualizarBotonCargarMas() {
+  document.getElementById("load-more-btn").style.display =
+    siguienteCursor !== null ? "inline-block" : "none";
+}
+
+// Función para mostrar las tareas en el HTML (agregar = true las añade al final)
+function mostrarTareas(tareas, agregar = false) {
   const container = document.getElementById("tasks-container");
 
-  if (tareas.length === 0) {
+  if (tareas.length === 0 && !agregar) {
     container.innerHTML =
       '<div class="no-tasks">No hay tareas todavía. ¡Crea la primera!</div>';
     return;
@@ -83,7 +189,11 @@ function mostrarTareas(tareas) {
     })
     .join("");
 
-  container.innerHTML = tareasHTML;
+  if (agregar) {
+    container.insertAdjacentHTML("beforeend", tareasHTML);
+  } else {
+    container.innerHTML = tareasHTML;
+  }
 }
 
 // Función para crear una nueva tarea
@@ -103,7 +213,7 @@ async function crearTarea(tarea) {
 
     const nuevaTarea = await response.json();
     mostrarMensaje(`Tarea "${nuevaTarea.titulo}" creada exitosamente!`);
-    cargarTareas();
+    sincronizarTareas();
     return nuevaTarea;
   } catch (error) {
     console.error("Error:", error);
@@ -130,7 +240,7 @@ async function actualizarTarea(id, tarea) {
     mostrarMensaje(
       `Tarea "${tareaActualizada.titulo}" actualizada exitosamente!`
     );
-    cargarTareas();
+    sincronizarTareas();
     return tareaActualizada;
   } catch (error) {
     console.error("Error:", error);
@@ -157,7 +267,7 @@ async function toggleCompletada(id, completada) {
     mostrarMensaje(
       `Tarea marcada como ${completada ? "completada" : "pendiente"}!`
     );
-    cargarTareas();
+    sincronizarTareas();
   } catch (error) {
     console.error("Error:", error);
     mostrarMensaje("Error al actualizar el estado", "error");
@@ -181,7 +291,7 @@ async function eliminarTarea(id) {
 
     const resultado = await response.json();
     mostrarMensaje("Tarea eliminada exitosamente!");
-    cargarTareas();
+    sincronizarTareas();
   } catch (error) {
     console.error("Error:", error);
     mostrarMensaje("Error al eliminar la tarea", "error");
@@ -260,5 +370,25 @@ document
   .getElementById("cancel-btn")
   .addEventListener("click", limpiarFormulario);
 
+// Buscar mientras se escribe, esperando una pausa para no saturar la API
+document.getElementById("busqueda").addEventListener("input", () => {
+  clearTimeout(temporizadorBusqueda);
+  temporizadorBusqueda = setTimeout(cargarTareas, 250);
+});
+
+// Manejar el botón de cargar más
+document
+  .getElementById("load-more-btn")
+  .addEventListener("click", cargarMasTareas);
+
+// Cargar la siguiente página automáticamente al llegar al final de la lista
+if ("IntersectionObserver" in window) {
+  new IntersectionObserver((entradas) => {
+    if (entradas.some((entrada) => entrada.isIntersecting)) {
+      cargarMasTareas();
+    }
+  }).observe(document.getElementById("load-more-btn"));
+}
+
 // Cargar las tareas al cargar la página
 window.addEventListener("load", cargarTareas);
@@ -1,6 +1,13 @@
 // URL base de la API
 const API_BASE_URL = "http://localhost:8000";
 
+// Cantidad de tareas eliminadas solicitadas por página
+const TAMANO_PAGINA = 50;
+
+// Cursor de la siguiente página (null si no hay más)
+let siguienteCursor = null;
+let cargandoPagina = false;
+
 // Función para mostrar mensajes
 function mostrarMensaje(mensaje, tipo = "success") {
   const messageArea = document.getElementById("message-area");
@@ -16,12 +23,31 @@ function mostrarMensaje(mensaje, tipo = "success") {
   }, 5000);
 }
 
-// Función para cargar todas las tareas eliminadas
+// Función para cargar las tareas eliminadas desde la primera página
 async function cargarTareasEliminadas() {
+  siguienteCursor = null;
+  await cargarPaginaEliminadas(false);
+}
+
+// Función para cargar la siguiente página y agregarla a la lista
+async function cargarMasEliminadas() {
+  if (siguienteCursor === null || cargandoPagina) {
+    return;
+  }
+  await cargarPaginaEliminadas(true);
+}
+
+// Función para pedir una página de tareas eliminadas usando el cursor
+async function cargarPaginaEliminadas(agregar) {
+  cargandoPagina = true;
+  const params = new URLSearchParams({ limite: TAMANO_PAGINA });
+  if (agregar && siguienteCursor !== null) {
+    params.set("despues_de_id", siguienteCursor);
+  }
   console.log("Iniciando carga de tareas eliminadas...");
-  console.log("URL de la API:", `${API_BASE_URL}/eliminadas`);
+  console.log("URL de la API:", `${API_BASE_URL}/eliminadas?${params}`);
   try {
-    const response = await fetch(`${API_BASE_URL}/eliminadas`);
+    const response = await fetch(`${API_BASE_URL}/eliminadas?${params}`);
     console.log("Respuesta del fetch - Status:", response.status, "OK:", response.ok);
     if (!response.ok) {
       console.error("Respuesta no OK. Status:", response.status, "StatusText:", response.statusText);
@@ -30,20 +56,25 @@ async function cargarTareasEliminadas() {
 
     const tareas = await response.json();
     console.log("Tareas eliminadas recibidas:", tareas);
-    mostrarTareasEliminadas(tareas);
+    siguienteCursor = response.headers.get("X-Siguiente-Cursor");
+    mostrarTareasEliminadas(tareas, agregar);
+    document.getElementById("load-more-btn").style.display =
+      siguienteCursor !== null ? "inline-block" : "none";
   } catch (error) {
     console.error("Error completo en cargarTareasEliminadas:", error);
     mostrarMensaje("Error al cargar las tareas eliminadas", "error");
     document.getElementById("eliminadas-container").innerHTML =
       '<div class="alert alert-error">Error al cargar las tareas eliminadas. Verifica que la API esté ejecutándose.</div>';
+  } finally {
+    cargandoPagina = false;
   }
 }
 
-// Función para mostrar las tareas eliminadas en el HTML
-function mostrarTareasEliminadas(tareas) {
+// Función para mostrar las tareas eliminadas en el HTML (agregar = true las añade al final)
+function mostrarTareasEliminadas(tareas, agregar = false) {
   const container = document.getElementById("eliminadas-container");
 
-  if (tareas.length === 0) {
+  if (tareas.length === 0 && !agregar) {
     container.innerHTML =
       '<div class="no-tasks">No hay tareas eliminadas.</div>';
     return;
@@ -83,7 +114,11 @@ function mostrarTareasEliminadas(tareas) {
     })
     .join("");
 
-  container.innerHTML = tareasHTML;
+  if (agregar) {
+    container.insertAdjacentHTML("beforeend", tareasHTML);
+  } else {
+    container.innerHTML = tareasHTML;
+  }
 }
 
 // Función para restaurar una tarea eliminada
@@ -137,5 +172,19 @@ function volverATareas() {
   window.location.href = "/";
 }
 
+// Manejar el botón de cargar más
+document
+  .getElementById("load-more-btn")
+  .addEventListener("click", cargarMasEliminadas);
+
+// Cargar la siguiente página automáticamente al llegar al final de la lista
+if ("IntersectionObserver" in window) {
+  new IntersectionObserver((entradas) => {
+    if (entradas.some((entrada) => entrada.isIntersecting)) {
+      cargarMasEliminadas();
+    }
+  }).observe(document.getElementById("load-more-btn"));
+}
+
 // Cargar las tareas eliminadas al cargar la página
 window.addEventListener("load", cargarTareasEliminadas);
\ No newline at end of file
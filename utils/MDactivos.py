@@ -0,0 +1,272 @@
+"""
+Módulo de los activos estáticos del frontend
+
+Este módulo construye y sirve el frontend de static/ de forma que el navegador
+descargue cada archivo una sola vez. La construcción (python -m utils.MDactivos)
+copia cada CSS/JS a static/dist/ con el hash de su contenido en el nombre,
+reescribe los HTML para que apunten a esas copias y genera las variantes
+comprimidas de todo lo que sea texto.
+
+Clases principales:
+- ActivosEstaticos: StaticFiles que sirve primero lo construido, con variantes
+  comprimidas y Cache-Control según el tipo de archivo
+
+Funciones principales:
+- construir_activos(): Genera static/dist/ a partir de static/
+
+Estructura en disco (static/dist/):
+- css/styles.<hash>.css, js/app.<hash>.js, ...: Copias con hash del contenido
+- index.html, eliminadas.html: HTML con las referencias reescritas
+- *.gz, *.br, *.zst: Variantes precomprimidas (solo si ocupan menos que el original)
+- manifiesto.json: {"css/styles.css": "css/styles.<hash>.css", ...}
+
+Características:
+- Activos con hash: Cache-Control public, max-age de un año, immutable (un
+  cambio de contenido cambia la URL)
+- HTML y archivos sin hash: Cache-Control no-cache con ETag y Last-Modified,
+  de modo que revalidar cuesta un 304 sin cuerpo
+- Variante .br, .zst o .gz elegida según Accept-Encoding, con Content-Encoding, el
+  Content-Type del original y Vary: Accept-Encoding
+- Sin construir, se sirven los originales de static/ tal como antes
+- .br y .zst solo si los paquetes brotli y zstandard están instalados
+"""
+
+import os
+import re
+import shutil
+import hashlib
+import logging
+import argparse
+import mimetypes
+from typing import Any
+
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Scope
+
+from constants import DIR_STATIC, DIR_STATIC_DIST, URL_STATIC
+
+from .MDjson import serializar
+from .MDcompresion import CODIFICACIONES, EXTENSIONES, comprimir, elegir_codificacion
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Cache-Control de los activos con hash y del resto (HTML, sin construir)
+CACHE_INMUTABLE: str = "public, max-age=31536000, immutable"
+CACHE_REVALIDAR: str = "no-cache"
+
+# Archivos de texto que vale la pena comprimir
+EXTENSIONES_COMPRIMIBLES: tuple[str, ...] = (
+    ".html",
+    ".css",
+    ".js",
+    ".json",
+    ".svg",
+    ".txt",
+)
+
+# Longitud del hash del contenido en los nombres de archivo
+LONGITUD_HASH: int = 12
+
+# Nombre con hash: nombre.<hash>.ext
+_PATRON_HASH: re.Pattern[str] = re.compile(
+    rf"\.[0-9a-f]{{{LONGITUD_HASH}}}\.[^./]+$"
+)
+
+
+def _escribir(destino: str, relativa: str, contenido: bytes) -> None:
+    """
+    Escribe un archivo construido y sus variantes comprimidas.
+    """
+    ruta: str = os.path.join(destino, relativa)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "wb") as file:
+        file.write(contenido)
+    if not ruta.endswith(EXTENSIONES_COMPRIMIBLES):
+        return
+    for codificacion in CODIFICACIONES:
+        comprimido: bytes = comprimir(contenido, codificacion, maximo=True)
+        if len(comprimido) < len(contenido):
+            with open(ruta + EXTENSIONES[codificacion], "wb") as file:
+                file.write(comprimido)
+
+
+# Función para construir el frontend con hash y precomprimido
+def construir_activos(
+    origen: str = DIR_STATIC, destino: str = DIR_STATIC_DIST
+) -> dict[str, str]:
+    """
+    Genera la versión construida del frontend.
+
+    Args:
+        origen (str): Directorio con los archivos originales.
+        destino (str): Directorio a generar (se reemplaza por completo).
+
+    Returns:
+        dict[str, str]: Manifiesto {ruta original: ruta con hash}, relativas
+                        al directorio y con "/" como separador.
+
+    Notas:
+        - Los HTML conservan su nombre (son los puntos de entrada) y se
+          reescriben las URLs URL_STATIC/<original> por las de las copias con hash
+        - Las referencias dentro de CSS y JS no se reescriben
+        - Se ejecuta después de cada cambio del frontend, antes de desplegar
+    """
+    origen = os.path.abspath(origen)
+    destino = os.path.abspath(destino)
+    shutil.rmtree(destino, ignore_errors=True)
+
+    relativas: list[str] = []
+    for raiz, directorios, archivos in os.walk(origen):
+        # No recorrer una construcción anterior dentro del origen
+        directorios[:] = sorted(
+            d for d in directorios if os.path.join(raiz, d) != destino
+        )
+        relativas.extend(
+            os.path.relpath(os.path.join(raiz, archivo), origen).replace(os.sep, "/")
+            for archivo in sorted(archivos)
+        )
+
+    manifiesto: dict[str, str] = {}
+    paginas: list[str] = []
+    for relativa in relativas:
+        if relativa.endswith(".html"):
+            paginas.append(relativa)
+            continue
+        with open(os.path.join(origen, relativa), "rb") as file:
+            contenido: bytes = file.read()
+        huella: str = hashlib.sha256(contenido).hexdigest()[:LONGITUD_HASH]
+        base, extension = os.path.splitext(relativa)
+        con_hash: str = f"{base}.{huella}{extension}"
+        _escribir(destino, con_hash, contenido)
+        manifiesto[relativa] = con_hash
+
+    for relativa in paginas:
+        with open(os.path.join(origen, relativa), "r", encoding="utf-8") as file:
+            html: str = file.read()
+        for original, con_hash in manifiesto.items():
+            html = html.replace(f"{URL_STATIC}/{original}", f"{URL_STATIC}/{con_hash}")
+        _escribir(destino, relativa, html.encode("utf-8"))
+
+    _escribir(destino, "manifiesto.json", serializar(manifiesto, indentar=True))
+    logger.info(
+        "Frontend construido en %s: %s activos con hash, %s páginas",
+        destino,
+        len(manifiesto),
+        len(paginas),
+    )
+    return manifiesto
+
+
+class ActivosEstaticos(StaticFiles):
+    """
+    Archivos estáticos con variantes precomprimidas y caché de larga duración.
+
+    Busca cada ruta primero en el directorio construido y después en el de
+    originales, de modo que las páginas reescritas reemplazan a las originales
+    y los activos sin hash siguen disponibles.
+
+    Attributes:
+        directorio (str): Directorio con los archivos originales.
+        construido (str): Directorio generado por construir_activos().
+
+    Ejemplo:
+        >>> activos = ActivosEstaticos(DIR_STATIC, DIR_STATIC_DIST)
+        >>> app.mount(URL_STATIC, activos, name="static")
+    """
+
+    def __init__(self, directorio: str, construido: str) -> None:
+        super().__init__(directory=directorio)
+        self.directorio: str = directorio
+        self.construido: str = construido
+        self.all_directories = [construido, directorio]
+        # Variantes comprimidas de cada archivo: {ruta: (mtime_ns, codificaciones)}
+        self._variantes: dict[str, tuple[int, tuple[str, ...]]] = {}
+
+    def _codificaciones(self, ruta: str, stat_result: os.stat_result) -> tuple[str, ...]:
+        """
+        Codificaciones con variante precomprimida de un archivo.
+
+        Se recuerdan mientras el archivo no cambie (mtime), para no comprobar
+        la existencia de las variantes en cada solicitud.
+        """
+        conocidas: tuple[int, tuple[str, ...]] | None = self._variantes.get(ruta)
+        if conocidas is not None and conocidas[0] == stat_result.st_mtime_ns:
+            return conocidas[1]
+        codificaciones: tuple[str, ...] = tuple(
+            codificacion
+            for codificacion in CODIFICACIONES
+            if os.path.isfile(ruta + EXTENSIONES[codificacion])
+        )
+        self._variantes[ruta] = (stat_result.st_mtime_ns, codificaciones)
+        return codificaciones
+
+    def file_response(
+        self,
+        full_path: Any,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        ruta: str = os.fspath(full_path)
+        cabeceras: Headers = Headers(scope=scope)
+        comprimible: bool = ruta.endswith(EXTENSIONES_COMPRIMIBLES)
+
+        codificacion: str | None = None
+        if comprimible:
+            codificacion = elegir_codificacion(
+                cabeceras.get("accept-encoding", ""),
+                self._codificaciones(ruta, stat_result),
+            )
+        archivo: str = ruta
+        if codificacion is not None:
+            archivo = ruta + EXTENSIONES[codificacion]
+            stat_result = os.stat(archivo)
+
+        respuesta: FileResponse = FileResponse(
+            archivo,
+            status_code=status_code,
+            stat_result=stat_result,
+            method=scope["method"],
+            media_type=mimetypes.guess_type(ruta)[0] or "text/plain",
+        )
+        # El ETag de FileResponse depende del tamaño: cada variante tiene el suyo
+        respuesta.headers["Cache-Control"] = (
+            CACHE_INMUTABLE if _PATRON_HASH.search(ruta) else CACHE_REVALIDAR
+        )
+        if comprimible:
+            respuesta.headers["Vary"] = "Accept-Encoding"
+        if codificacion is not None:
+            respuesta.headers["Content-Encoding"] = codificacion
+
+        if self.is_not_modified(respuesta.headers, cabeceras):
+            return NotModifiedResponse(respuesta.headers)
+        return respuesta
+
+    def construido_disponible(self) -> bool:
+        """
+        Indica si existe el frontend construido por construir_activos().
+        """
+        return os.path.isdir(self.construido)
+
+
+# Archivos estáticos de la aplicación (montados en URL_STATIC)
+activos: ActivosEstaticos = ActivosEstaticos(DIR_STATIC, DIR_STATIC_DIST)
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Construye el frontend con nombres con hash y variantes comprimidas"
+    )
+    parser.add_argument("--origen", default=DIR_STATIC, help="Directorio del frontend")
+    parser.add_argument(
+        "--destino", default=DIR_STATIC_DIST, help="Directorio a generar (se reemplaza)"
+    )
+    argumentos: argparse.Namespace = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    construidos: dict[str, str] = construir_activos(
+        argumentos.origen, argumentos.destino
+    )
+    for original, con_hash in construidos.items():
+        print(f"{original} -> {con_hash}")
@@ -0,0 +1,510 @@
+"""
+Módulo de almacenamiento persistente de tareas
+
+Este módulo separa el repositorio en memoria del medio donde se guardan las
+tareas. El repositorio solo conoce la interfaz Almacenamiento: cargar el
+estado completo, registrar cada operación, agrupar operaciones en lotes y
+detectar cambios hechos por otros procesos. Cada implementación decide cómo
+persistirlas.
+
+Clases principales:
+- Almacenamiento: Interfaz común de los medios de almacenamiento
+- AlmacenamientoJSON: Instantáneas JSON más diario de escritura anticipada,
+  con el historial de eliminadas segmentado por mes (ver MDhistorial)
+
+Funciones principales:
+- crear_almacenamiento(): Construye el almacenamiento configurado
+
+Características:
+- Medio elegido por configuración (variable TAREAS_ALMACENAMIENTO: json o sqlite)
+- Operaciones expresadas como registros del diario ({"op": ..., "tarea": ...}),
+  iguales para todos los medios
+- Contador de IDs persistente propio de cada medio
+- Validación estricta de los archivos JSON al cargarlos
+- Instantáneas escritas de forma atómica (temporal + fsync + rename)
+- Bloqueo entre procesos (compartido para leer, exclusivo para escribir)
+  sobre un archivo auxiliar del directorio de datos, para varios workers
+"""
+
+import os
+import json
+import logging
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Any, ContextManager
+
+from constants import (
+    ADAPTADOR_TAREAS,
+    ALMACENAMIENTO,
+    ALMACENAMIENTO_JSON,
+    ALMACENAMIENTO_SQLITE,
+    DATA_JSON,
+    DELETED_JSON,
+    DIR_ELIMINADAS,
+    ID_COUNTER_JSON,
+    JOURNAL_JSONL,
+    SQLITE_DB,
+    DURABILIDAD,
+    DURABILIDAD_ESTRICTA,
+    DURABILIDAD_MEMORIA,
+    DURABILIDAD_GRUPO_MS,
+    JSON_COMPACTO,
+)
+
+from .MDbloqueo import BloqueoArchivo
+from .MDdiario import Diario
+from .MDhistorial import HistorialSegmentado
+from .MDarchivos import Firma, escribir_archivo, firma_archivo, leer_archivo
+from .MDjson import deserializar, serializar
+from .MDregistro import RegistroEliminada, RegistroTarea
+from .MDescritura_atomica import escribir_atomico
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Estado completo leído de un almacenamiento: tareas activas, eliminadas y
+# registros del diario pendientes de aplicar sobre ellas
+Estado = tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]
+
+# Marca que cambios() intercala cuando otro proceso compactó el almacenamiento:
+# los registros anteriores ya están en las instantáneas
+OP_COMPACTADO: str = "compactado"
+
+
+class Almacenamiento(ABC):
+    """
+    Interfaz de un medio de almacenamiento persistente de tareas.
+
+    El repositorio llama a estos métodos siempre bajo su propio cerrojo, de
+    modo que las implementaciones no necesitan sincronización adicional.
+    Cada medio implementa los métodos abstractos; bloquear(), compactar(),
+    version(), sincronizar() y cerrar() tienen un comportamiento por defecto.
+
+    Las operaciones llegan como registros del diario:
+
+    - {"op": "crear" | "actualizar", "tarea": {...}}: crea o reemplaza una tarea activa
+    - {"op": "eliminar", "tarea": {...}}: mueve una tarea al historial (con su fecha)
+    - {"op": "restaurar", "tarea": {...}}: mueve una tarea del historial a las activas
+    - {"op": "purgar", "id": n}: quita una tarea del historial
+
+    "eliminar" y "restaurar" mueven la tarea entre ambos conjuntos y deben
+    persistirse de forma atómica: una sola línea del diario con JSON, una sola
+    sentencia sobre la fila de la tarea con SQLite.
+
+    Varios procesos pueden compartir el mismo almacenamiento. El repositorio
+    llama a cargar() y cambios() con el bloqueo compartido, y a las
+    escrituras con el exclusivo, que además mantiene desde la lectura de los
+    cambios ajenos hasta confirmar las propias.
+
+    Attributes:
+        durabilidad (str): Modo de durabilidad ("estricta", "grupo" o "memoria").
+        bloqueo (BloqueoArchivo | None): Bloqueo entre procesos; None si el
+                                         medio no se comparte (modo memoria).
+    """
+
+    durabilidad: str = DURABILIDAD_ESTRICTA
+    bloqueo: BloqueoArchivo | None = None
+
+    def bloquear(self, exclusivo: bool = False) -> ContextManager[None]:
+        """
+        Bloquea el almacenamiento frente a otros procesos durante un bloque with.
+
+        Args:
+            exclusivo (bool): True para escribir, False para leer.
+        """
+        if self.bloqueo is None:
+            return nullcontext()
+        return self.bloqueo.bloquear(exclusivo)
+
+    @abstractmethod
+    def cargar(self) -> Estado:
+        """
+        Lee el estado completo persistido.
+
+        Returns:
+            Estado: Tareas activas, tareas eliminadas y registros pendientes
+                    que deben aplicarse sobre ellas en orden.
+        """
+
+    @abstractmethod
+    def cambios(self) -> list[dict[str, Any]] | None:
+        """
+        Detecta modificaciones hechas por otros procesos desde la última lectura.
+
+        Returns:
+            list[dict[str, Any]] | None: Registros nuevos a aplicar (lista vacía
+                                         si no hubo cambios), o None si hay que
+                                         volver a cargar el estado completo. Un
+                                         registro {"op": OP_COMPACTADO} indica
+                                         que los anteriores ya se compactaron.
+        """
+
+    @abstractmethod
+    def registrar(self, registro: dict[str, Any]) -> None:
+        """
+        Persiste una operación.
+
+        Args:
+            registro (dict[str, Any]): Operación con clave 'op' (ver arriba).
+        """
+
+    @abstractmethod
+    def iniciar_lote(self) -> None:
+        """
+        Empieza a agrupar operaciones hasta confirmar_lote().
+        """
+
+    @abstractmethod
+    def confirmar_lote(self) -> None:
+        """
+        Persiste juntas las operaciones agrupadas desde iniciar_lote().
+
+        Raises:
+            Exception: Si la escritura falla; las operaciones del lote se descartan.
+        """
+
+    @abstractmethod
+    def guardar_todo(
+        self, tareas: list[RegistroTarea], eliminadas: list[RegistroEliminada]
+    ) -> None:
+        """
+        Reemplaza el estado persistido completo por el indicado.
+
+        Args:
+            tareas (list[RegistroTarea]): Tareas activas.
+            eliminadas (list[RegistroEliminada]): Historial de eliminadas.
+        """
+
+    def compactar(
+        self, tareas: list[RegistroTarea], eliminadas: list[RegistroEliminada]
+    ) -> None:
+        """
+        Consolida las operaciones registradas; por defecto guarda el estado completo.
+
+        Args:
+            tareas (list[RegistroTarea]): Tareas activas actuales.
+            eliminadas (list[RegistroEliminada]): Historial de eliminadas actual.
+        """
+        self.guardar_todo(tareas, eliminadas)
+
+    @abstractmethod
+    def leer_contador(self) -> int:
+        """
+        Retorna el mayor ID reservado por el contador persistente (0 si no hay).
+        """
+
+    @abstractmethod
+    def guardar_contador(self, ultimo_id: int) -> None:
+        """
+        Persiste el mayor ID reservado.
+
+        Args:
+            ultimo_id (int): Nuevo límite del contador.
+        """
+
+    def version(self) -> tuple[int, ...] | None:
+        """
+        Retorna la versión de los datos leídos o escritos por este proceso.
+
+        Es igual en todos los procesos que vieron el mismo estado, se conserva
+        al reiniciar y crece con cada operación confirmada (se compara como
+        tupla). Se consulta después de cargar() o cambios() y fuera de un lote.
+
+        Returns:
+            tuple[int, ...] | None: Versión, o None si el medio no se comparte
+                                    ni se conserva (modo memoria).
+        """
+        return None
+
+    def sincronizar(self) -> None:
+        """
+        Fuerza a disco las operaciones aún no sincronizadas (si el medio las difiere).
+        """
+
+    def cerrar(self) -> None:
+        """
+        Libera los recursos del medio (archivos, conexiones).
+        """
+
+
+class AlmacenamientoJSON(Almacenamiento):
+    """
+    Almacenamiento en instantáneas JSON más un diario de escritura anticipada.
+
+    Cada operación solo anexa un registro al diario; al compactar, el estado
+    completo de las tareas activas se escribe en tareas.json, del historial de
+    eliminadas se reescriben solo los segmentos mensuales que cambiaron, y el
+    diario se rota. Los cambios de otros procesos se detectan comparando las
+    firmas de tareas.json y del manifiesto del historial y el tamaño del
+    diario con los conocidos. Si otro proceso compactó una sola vez desde la
+    última lectura, los registros que faltan se leen del diario anterior y las
+    instantáneas nuevas se adoptan sin volver a leerlas.
+
+    En modo de durabilidad "memoria" no se lee ni se escribe nada en disco.
+    En solo lectura no se crea el archivo de bloqueo, no se recorta una
+    escritura interrumpida del diario (se ignora) y cualquier escritura falla.
+
+    Attributes:
+        ruta_tareas (str): Instantánea JSON de tareas activas.
+        historial (HistorialSegmentado): Segmentos del historial de eliminadas.
+        ruta_contador (str): Archivo JSON del contador de IDs.
+        diario (Diario): Diario de operaciones pendientes de compactar.
+        durabilidad (str): Modo de durabilidad.
+        solo_lectura (bool): Si se abrió solo para leer (ver MDmigracion).
+
+    Ejemplo:
+        >>> almacenamiento = AlmacenamientoJSON(
+        ...     DATA_JSON, DIR_ELIMINADAS, JOURNAL_JSONL, ID_COUNTER_JSON
+        ... )
+        >>> tareas, eliminadas, registros = almacenamiento.cargar()
+    """
+
+    def __init__(
+        self,
+        ruta_tareas: str,
+        dir_eliminadas: str,
+        ruta_diario: str,
+        ruta_contador: str,
+        durabilidad: str = DURABILIDAD_ESTRICTA,
+        grupo_ms: int = DURABILIDAD_GRUPO_MS,
+        ruta_eliminadas_legado: str | None = None,
+        solo_lectura: bool = False,
+    ) -> None:
+        self.ruta_tareas: str = ruta_tareas
+        self.historial: HistorialSegmentado = HistorialSegmentado(
+            dir_eliminadas, ruta_eliminadas_legado
+        )
+        self.ruta_contador: str = ruta_contador
+        self.durabilidad: str = durabilidad
+        self.solo_lectura: bool = solo_lectura
+        self.diario: Diario = Diario(ruta_diario, durabilidad, grupo_ms)
+        self._firma_tareas: Firma = None
+        if durabilidad != DURABILIDAD_MEMORIA and not solo_lectura:
+            self.bloqueo = BloqueoArchivo(
+                os.path.join(os.path.dirname(os.path.abspath(ruta_tareas)), "tareas.lock")
+            )
+
+    def cargar(self) -> Estado:
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            logger.info("Almacenamiento en modo memoria, sin acceso a disco")
+            return [], [], []
+        # Otro proceso pudo rotar el diario: volver a abrirlo al escribir
+        self.diario.cerrar()
+        self.diario.epoca = self.diario.leer_epoca()[0]
+        self._firma_tareas = firma_archivo(self.ruta_tareas)
+        tareas: list[dict[str, Any]] = leer_archivo(
+            self.ruta_tareas, ADAPTADOR_TAREAS
+        )
+        eliminadas: list[dict[str, Any]] = self.historial.leer()
+        registros: list[dict[str, Any]]
+        registros, self.diario.posicion = self.diario.leer(0)
+        if not self.solo_lectura and self.diario.tamano() > self.diario.posicion:
+            # Descartar una escritura interrumpida antes de anexar más registros
+            self.diario.recortar(self.diario.posicion)
+        for registro in registros:
+            self.historial.marcar(registro)
+        return tareas, eliminadas, registros
+
+    def cambios(self) -> list[dict[str, Any]] | None:
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return []
+        if (
+            firma_archivo(self.ruta_tareas) != self._firma_tareas
+            or self.historial.modificado()
+        ):
+            return self._seguir_compactacion()
+        tamano: int = self.diario.tamano()
+        if tamano < self.diario.posicion:
+            logger.info("Diario truncado externamente, recargando")
+            return None
+        if tamano == self.diario.posicion:
+            return []
+        registros: list[dict[str, Any]]
+        registros, self.diario.posicion = self.diario.leer(self.diario.posicion)
+        logger.debug("Leídos %s registros externos del diario", len(registros))
+        for registro in registros:
+            self.historial.marcar(registro)
+        return registros
+
+    def _seguir_compactacion(self) -> list[dict[str, Any]] | None:
+        """
+        Alcanza una compactación hecha por otro proceso sin recargar las instantáneas.
+
+        Solo es posible si hubo exactamente una compactación incremental desde
+        la última lectura: los registros aún no aplicados se leen del diario
+        anterior y, tras ellos, el estado en memoria coincide con las
+        instantáneas nuevas.
+
+        Returns:
+            list[dict[str, Any]] | None: Registros pendientes del diario
+                                         anterior, la marca OP_COMPACTADO y los
+                                         del diario nuevo; None si hay que recargar.
+        """
+        epoca, tamano_anterior = self.diario.leer_epoca()
+        if (
+            epoca != self.diario.epoca + 1
+            or tamano_anterior is None
+            or self.diario.posicion > tamano_anterior
+        ):
+            logger.info("Instantáneas modificadas en disco, recargando")
+            return None
+        anteriores: list[dict[str, Any]]
+        posicion_anterior: int
+        anteriores, posicion_anterior = self.diario.leer(
+            self.diario.posicion, self.diario.ruta_anterior
+        )
+        if posicion_anterior != tamano_anterior:
+            logger.warning("Diario anterior incompleto, recargando")
+            return None
+        self.diario.cerrar()
+        nuevos: list[dict[str, Any]]
+        nuevos, self.diario.posicion = self.diario.leer(0)
+        self.diario.epoca = epoca
+        self._firma_tareas = firma_archivo(self.ruta_tareas)
+        self.historial.adoptar()
+        for registro in nuevos:
+            self.historial.marcar(registro)
+        logger.info(
+            "Compactación de otro proceso alcanzada: %s registros anteriores, %s nuevos",
+            len(anteriores),
+            len(nuevos),
+        )
+        return [*anteriores, {"op": OP_COMPACTADO}, *nuevos]
+
+    def _comprobar_escritura(self) -> None:
+        """
+        Impide escribir en un almacenamiento abierto en solo lectura.
+
+        Raises:
+            RuntimeError: Si el almacenamiento es de solo lectura.
+        """
+        if self.solo_lectura:
+            raise RuntimeError(f"Almacenamiento de solo lectura: {self.ruta_tareas}")
+
+    def registrar(self, registro: dict[str, Any]) -> None:
+        self._comprobar_escritura()
+        self.diario.registrar(registro)
+        self.historial.marcar(registro)
+
+    def iniciar_lote(self) -> None:
+        self._comprobar_escritura()
+        self.diario.iniciar_lote()
+
+    def confirmar_lote(self) -> None:
+        self.diario.confirmar_lote()
+
+    def _volcar(
+        self,
+        tareas: list[RegistroTarea],
+        eliminadas: list[RegistroEliminada],
+        completo: bool,
+    ) -> None:
+        """
+        Escribe la instantánea de tareas y el historial, y rota el diario
+        (o lo vacía, si se reemplazó el estado completo).
+
+        Notas:
+            - Si el proceso se interrumpe entre los pasos no se pierde nada:
+              los registros son idempotentes y se vuelven a aplicar al cargar
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return
+        self._comprobar_escritura()
+        escribir_archivo(self.ruta_tareas, tareas)
+        self._firma_tareas = firma_archivo(self.ruta_tareas)
+        self.historial.guardar(eliminadas, completo)
+        if completo:
+            self.diario.truncar()
+        else:
+            self.diario.rotar()
+
+    def guardar_todo(
+        self, tareas: list[RegistroTarea], eliminadas: list[RegistroEliminada]
+    ) -> None:
+        """
+        Escribe la instantánea de tareas y todos los segmentos del historial.
+        """
+        self._volcar(tareas, eliminadas, completo=True)
+
+    def compactar(
+        self, tareas: list[RegistroTarea], eliminadas: list[RegistroEliminada]
+    ) -> None:
+        """
+        Escribe la instantánea de tareas y solo los segmentos del historial que
+        cambiaron desde la última compactación.
+        """
+        self._volcar(tareas, eliminadas, completo=False)
+
+    def leer_contador(self) -> int:
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return 0
+        try:
+            with open(self.ruta_contador, "rb") as file:
+                contador: dict[str, int] = deserializar(file.read())
+                return contador.get("ultimo_id", 0)
+        except (FileNotFoundError, json.JSONDecodeError):
+            logger.warning("Archivo de contador no encontrado, inicializando en 0")
+            return 0
+
+    def guardar_contador(self, ultimo_id: int) -> None:
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return
+        self._comprobar_escritura()
+        contenido: bytes = serializar(
+            {"ultimo_id": ultimo_id}, indentar=not JSON_COMPACTO
+        )
+        escribir_atomico(self.ruta_contador, contenido)
+
+    def version(self) -> tuple[int, ...] | None:
+        """
+        Época del diario y posición hasta la que se leyó o escribió.
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return None
+        return self.diario.epoca, self.diario.posicion
+
+    def sincronizar(self) -> None:
+        self.diario.sincronizar()
+
+    def cerrar(self) -> None:
+        self.diario.cerrar()
+
+
+# Función para construir el almacenamiento configurado
+def crear_almacenamiento(
+    tipo: str = ALMACENAMIENTO,
+    durabilidad: str = DURABILIDAD,
+    grupo_ms: int = DURABILIDAD_GRUPO_MS,
+) -> Almacenamiento:
+    """
+    Construye el almacenamiento indicado con las rutas por defecto de data/.
+
+    Args:
+        tipo (str): "json" (instantáneas + diario) o "sqlite" (base de datos).
+        durabilidad (str): Modo de durabilidad de las escrituras.
+        grupo_ms (int): Intervalo del fsync agrupado en milisegundos.
+
+    Returns:
+        Almacenamiento: Instancia lista para pasar a RepositorioTareas.
+
+    Raises:
+        ValueError: Si el tipo de almacenamiento es desconocido.
+
+    Ejemplo:
+        >>> almacenamiento = crear_almacenamiento("sqlite")
+    """
+    if tipo == ALMACENAMIENTO_JSON:
+        return AlmacenamientoJSON(
+            DATA_JSON,
+            DIR_ELIMINADAS,
+            JOURNAL_JSONL,
+            ID_COUNTER_JSON,
+            durabilidad,
+            grupo_ms,
+            DELETED_JSON,
+        )
+    if tipo == ALMACENAMIENTO_SQLITE:
+        # Importación diferida: MDsqlite depende de este módulo
+        from .MDsqlite import AlmacenamientoSQLite
+
+        return AlmacenamientoSQLite(SQLITE_DB, durabilidad)
+    raise ValueError(f"Almacenamiento desconocido: {tipo}")
@@ -0,0 +1,144 @@
+"""
+Módulo de archivos JSON de datos
+
+Este módulo reúne las operaciones sobre los archivos JSON de data/ que usan
+los almacenamientos basados en archivos: detectar si un archivo cambió, leer
+una lista de tareas validándola y escribirla de forma atómica.
+
+Funciones principales:
+- firma_archivo(): Obtiene (inodo, tamaño, mtime) para detectar cambios
+- leer_archivo(): Lee y valida una lista de tareas
+- escribir_archivo(): Escribe una lista de tareas de forma atómica
+
+Características:
+- Detección de cambios sin leer el contenido del archivo
+- Validación estricta opcional con un TypeAdapter
+- JSON malformado como error, nunca como lista vacía
+- Formato legible o compacto según JSON_COMPACTO
+- Duración de cada fase y bytes escritos registrados en las métricas
+"""
+
+import os
+import json
+import logging
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from constants import JSON_COMPACTO
+
+from .MDjson import deserializar, serializar
+from .MDregistro import RegistroTarea
+from .MDescritura_atomica import escribir_atomico
+from .MDmetricas import (
+    BYTES_ESCRITOS,
+    ESCRITURA_ALMACENAMIENTO,
+    LECTURA_ALMACENAMIENTO,
+    cronometrar,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Firma de un archivo en disco: (inodo, tamaño, fecha de modificación en ns)
+Firma = tuple[int, int, int] | None
+
+
+# Función para obtener la firma de un archivo
+def firma_archivo(ruta: str) -> Firma:
+    """
+    Obtiene la firma de un archivo para detectar cambios sin leer su contenido.
+
+    Args:
+        ruta (str): Ruta del archivo a inspeccionar.
+
+    Returns:
+        Firma: Tupla (inodo, tamaño, mtime_ns) o None si el archivo no existe.
+    """
+    try:
+        estado: os.stat_result = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return (estado.st_ino, estado.st_size, estado.st_mtime_ns)
+
+
+# Función para leer una lista de tareas de un archivo JSON
+def leer_archivo(
+    ruta: str, adaptador: TypeAdapter[Any] | None = None, etiqueta: str = "tareas"
+) -> list[dict[str, Any]]:
+    """
+    Lee una lista de tareas desde un archivo JSON y opcionalmente la valida.
+
+    La validación se hace una sola vez al cargar: a partir de ahí las tareas
+    en memoria se consideran confiables y las respuestas las serializan sin
+    volver a validarlas.
+
+    Args:
+        ruta (str): Ruta del archivo JSON a leer.
+        adaptador (TypeAdapter[Any] | None): Validador de la lista completa
+                                             (en modo estricto); None para no validar.
+        etiqueta (str): Origen informado en las métricas de lectura.
+
+    Returns:
+        list[dict[str, Any]]: Tareas contenidas en el archivo. Lista vacía si el
+                              archivo no existe.
+
+    Raises:
+        json.JSONDecodeError: Si el archivo contiene JSON malformado. No se
+                              retorna una lista vacía para no sobrescribir
+                              datos dañados en la siguiente compactación.
+        ValidationError: Si alguna tarea no cumple el modelo.
+    """
+    logger.debug("Leyendo archivo JSON: %s", ruta)
+    if not os.path.exists(ruta):
+        logger.warning("Archivo %s no encontrado, retornando lista vacía", ruta)
+        return []
+    try:
+        with cronometrar(LECTURA_ALMACENAMIENTO, etiqueta, "leer"):
+            with open(ruta, "rb") as file:
+                contenido: bytes = file.read()
+        with cronometrar(LECTURA_ALMACENAMIENTO, etiqueta, "decodificar"):
+            data: list[dict[str, Any]] = deserializar(contenido)
+        logger.debug("Datos leídos de %s: %s elementos", ruta, len(data))
+    except json.JSONDecodeError as e:
+        logger.error("Error al decodificar JSON en %s: %s", ruta, e)
+        raise
+    if adaptador is not None:
+        try:
+            with cronometrar(LECTURA_ALMACENAMIENTO, etiqueta, "validar"):
+                adaptador.validate_python(data, strict=True)
+        except ValidationError as e:
+            logger.error("Tareas inválidas en %s: %s", ruta, e)
+            raise
+    return data
+
+
+# Función para escribir una lista de tareas en un archivo JSON
+def escribir_archivo(
+    ruta: str, datos: list[RegistroTarea], etiqueta: str = "tareas"
+) -> None:
+    """
+    Escribe una lista de tareas en un archivo JSON, con formato legible o
+    compacto según JSON_COMPACTO.
+
+    La escritura es atómica: ante una caída el archivo conserva la versión
+    anterior completa o la nueva completa, nunca un contenido parcial.
+
+    Args:
+        ruta (str): Ruta del archivo JSON a escribir.
+        datos (list[RegistroTarea]): Tareas a serializar.
+        etiqueta (str): Destino informado en las métricas de escritura.
+
+    Raises:
+        Exception: Si ocurre un error durante la apertura o escritura del archivo.
+    """
+    logger.debug("Escribiendo %s elementos al archivo JSON: %s", len(datos), ruta)
+    try:
+        with cronometrar(ESCRITURA_ALMACENAMIENTO, etiqueta, "serializar"):
+            contenido: bytes = serializar(datos, indentar=not JSON_COMPACTO)
+        with cronometrar(ESCRITURA_ALMACENAMIENTO, etiqueta, "escribir"):
+            escribir_atomico(ruta, contenido)
+        BYTES_ESCRITOS.observar(len(contenido), etiqueta)
+        logger.debug("Datos escritos exitosamente")
+    except Exception as e:
+        logger.error("Error al escribir datos en %s: %s", ruta, e)
+        raise
@@ -0,0 +1,128 @@
+"""
+Módulo de bloqueo de archivos entre procesos
+
+Este módulo coordina a varios procesos (por ejemplo, los workers de uvicorn)
+que comparten el mismo directorio de datos. Cada almacenamiento toma un
+bloqueo sobre un archivo auxiliar: compartido mientras lee lo que otros
+procesos escribieron, exclusivo mientras escribe.
+
+Clases principales:
+- BloqueoArchivo: Bloqueo compartido o exclusivo sobre un archivo, reentrante
+
+Características:
+- fcntl.flock en Linux y macOS: varios lectores a la vez, un solo escritor
+- En Windows (msvcrt) todo bloqueo es exclusivo: los procesos se turnan
+  también para leer, pero siguen sin pisarse
+- Reentrante dentro del proceso: un bloqueo compartido pedido mientras se
+  tiene el exclusivo no lo rebaja
+- El sistema operativo libera el bloqueo si el proceso termina
+"""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Espera entre intentos de msvcrt.locking, que no bloquea indefinidamente
+ESPERA_WINDOWS_S: float = 0.01
+
+
+class BloqueoArchivo:
+    """
+    Bloqueo entre procesos sobre un archivo auxiliar.
+
+    El archivo se abre en el primer uso y se mantiene abierto; su contenido no
+    importa. Dentro del proceso el bloqueo se comparte entre anidamientos del
+    mismo hilo y los demás hilos esperan a que se libere.
+
+    Attributes:
+        ruta (str): Archivo sobre el que se toma el bloqueo.
+
+    Ejemplo:
+        >>> bloqueo = BloqueoArchivo("data/tareas.lock")
+        >>> with bloqueo.bloquear(exclusivo=True):
+        ...     escribir_archivo(DATA_JSON, tareas)
+    """
+
+    def __init__(self, ruta: str) -> None:
+        self.ruta: str = ruta
+        self._archivo: BinaryIO | None = None
+        self._cerrojo: threading.RLock = threading.RLock()
+        self._nivel: int = 0
+        self._exclusivo: bool = False
+
+    def _tomar(self, exclusivo: bool) -> None:
+        """
+        Toma el bloqueo del sistema operativo, esperando si otro proceso lo tiene.
+        """
+        if self._archivo is None:
+            self._archivo = open(self.ruta, "a+b")
+        descriptor: int = self._archivo.fileno()
+        if fcntl is not None:
+            fcntl.flock(descriptor, fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+            return
+        self._archivo.seek(0)
+        while True:
+            try:
+                msvcrt.locking(descriptor, msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(ESPERA_WINDOWS_S)
+
+    def _soltar(self) -> None:
+        """
+        Libera el bloqueo del sistema operativo.
+        """
+        assert self._archivo is not None
+        if fcntl is not None:
+            fcntl.flock(self._archivo.fileno(), fcntl.LOCK_UN)
+            return
+        self._archivo.seek(0)
+        msvcrt.locking(self._archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @contextmanager
+    def bloquear(self, exclusivo: bool = False) -> Iterator[None]:
+        """
+        Mantiene el bloqueo durante el bloque with.
+
+        Args:
+            exclusivo (bool): True para escribir (ningún otro proceso lee ni
+                              escribe), False para leer.
+
+        Raises:
+            RuntimeError: Si se pide el exclusivo mientras el mismo hilo tiene
+                          el compartido (promoverlo no es atómico).
+        """
+        with self._cerrojo:
+            if self._nivel == 0:
+                self._tomar(exclusivo)
+                self._exclusivo = exclusivo
+            elif exclusivo and not self._exclusivo:
+                raise RuntimeError(
+                    f"No se puede promover a exclusivo el bloqueo de {self.ruta}"
+                )
+            self._nivel += 1
+            try:
+                yield
+            finally:
+                self._nivel -= 1
+                if self._nivel == 0:
+                    self._soltar()
+
+    def cerrar(self) -> None:
+        """
+        Cierra el archivo auxiliar (el bloqueo debe estar libre).
+        """
+        with self._cerrojo:
+            if self._archivo is not None and self._nivel == 0:
+                self._archivo.close()
+                self._archivo = None
@@ -0,0 +1,303 @@
+"""
+Módulo del índice de búsqueda de texto
+
+Este módulo implementa un índice invertido en memoria sobre el título y la
+descripción de las tareas. Los textos se normalizan (minúsculas y sin tildes)
+y se dividen en términos; cada término apunta a las tareas que lo contienen,
+de modo que una búsqueda solo visita las tareas que coinciden.
+
+Clases principales:
+- IndiceBusqueda: Índice invertido con búsqueda por prefijo y ranking
+
+Funciones principales:
+- normalizar(): Convierte un texto a minúsculas y elimina tildes y diacríticos
+- terminos(): Divide un texto normalizado en términos
+
+Características:
+- Búsqueda insensible a mayúsculas y tildes ("canción" coincide con "cancion")
+- Coincidencia por prefijo del término ("prog" coincide con "programación"),
+  considerando todos los términos del índice que empiezan por él
+- Todas las palabras de la consulta deben aparecer (intersección)
+- Ranking por frecuencia del término, rareza en la colección y campo (el título
+  pesa más que la descripción)
+- Actualización incremental al agregar, modificar o quitar una tarea
+"""
+
+import re
+import math
+import heapq
+import bisect
+import logging
+import unicodedata
+from collections import Counter
+from typing import Callable, Iterable
+
+from constants import BUSQUEDA_PREFIJO_MINIMO
+
+from .MDregistro import RegistroTarea
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Peso de cada aparición de un término según el campo donde aparece
+PESO_TITULO: int = 3
+PESO_DESCRIPCION: int = 1
+
+# Factor aplicado a los términos que coinciden solo por prefijo
+FACTOR_PREFIJO: float = 0.5
+
+_PATRON_TERMINO: re.Pattern[str] = re.compile(r"\w+")
+
+# Tabla para quitar las tildes más comunes sin descomponer todo el texto
+_SIN_TILDES: dict[int, str] = str.maketrans(
+    "áàâäãéèêëíìîïóòôöõúùûüñçý", "aaaaaeeeeiiiiooooouuuuncy"
+)
+
+
+# Función para normalizar un texto antes de indexarlo o buscarlo
+def normalizar(texto: str) -> str:
+    """
+    Convierte un texto a minúsculas y elimina tildes y diacríticos.
+
+    Args:
+        texto (str): Texto original.
+
+    Returns:
+        str: Texto normalizado.
+
+    Ejemplo:
+        >>> normalizar("Programación Básica")
+        'programacion basica'
+    """
+    plano: str = texto.casefold().translate(_SIN_TILDES)
+    if plano.isascii():
+        return plano
+    # Otros diacríticos: descomponer y descartar las marcas combinantes
+    descompuesto: str = unicodedata.normalize("NFKD", plano)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+# Función para dividir un texto en términos normalizados
+def terminos(texto: str) -> list[str]:
+    """
+    Divide un texto en términos normalizados (secuencias de letras y dígitos).
+
+    Args:
+        texto (str): Texto original.
+
+    Returns:
+        list[str]: Términos en el orden en que aparecen.
+
+    Ejemplo:
+        >>> terminos("¡Aprender FastAPI, módulo 2!")
+        ['aprender', 'fastapi', 'modulo', '2']
+    """
+    return _PATRON_TERMINO.findall(normalizar(texto))
+
+
+class IndiceBusqueda:
+    """
+    Índice invertido de términos sobre el título y la descripción de las tareas.
+
+    Para cada término se guarda un diccionario id -> peso (apariciones en el
+    título por PESO_TITULO más apariciones en la descripción), y además una
+    lista ordenada de todos los términos para resolver prefijos con bisect.
+    Por cada tarea se recuerdan sus términos para poder quitarla sin recorrer
+    el índice completo.
+
+    Attributes:
+        prefijo_minimo (int): Longitud mínima de un término de la consulta para
+                              buscarlo también por prefijo.
+
+    Ejemplo:
+        >>> indice = IndiceBusqueda()
+        >>> indice.agregar(RegistroTarea(1, "Canción", "Ensayar"))
+        >>> indice.buscar("cancion")
+        [1]
+    """
+
+    def __init__(self, prefijo_minimo: int = BUSQUEDA_PREFIJO_MINIMO) -> None:
+        self.prefijo_minimo: int = prefijo_minimo
+        self._indice: dict[str, dict[int, int]] = {}
+        self._vocabulario: list[str] = []
+        self._por_tarea: dict[int, dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._por_tarea)
+
+    @staticmethod
+    def _pesos(tarea: RegistroTarea) -> dict[str, int]:
+        """
+        Calcula el peso de cada término de una tarea.
+        """
+        # Counter(iterable) cuenta en C; el título se suma con su peso aparte
+        pesos: Counter[str] = Counter(terminos(tarea.descripcion))
+        if PESO_DESCRIPCION != 1:
+            for termino in pesos:
+                pesos[termino] *= PESO_DESCRIPCION
+        for termino in terminos(tarea.titulo):
+            pesos[termino] = pesos.get(termino, 0) + PESO_TITULO
+        return pesos
+
+    def cargar(self, tareas: Iterable[RegistroTarea]) -> None:
+        """
+        Reconstruye el índice completo a partir de un conjunto de tareas.
+
+        Args:
+            tareas (Iterable[RegistroTarea]): Tareas a indexar.
+        """
+        indice: dict[str, dict[int, int]] = {}
+        por_tarea: dict[int, dict[str, int]] = {}
+        for tarea in tareas:
+            tarea_id: int = tarea.id
+            pesos: dict[str, int] = self._pesos(tarea)
+            por_tarea[tarea_id] = pesos
+            for termino, peso in pesos.items():
+                publicaciones: dict[int, int] | None = indice.get(termino)
+                if publicaciones is None:
+                    indice[termino] = {tarea_id: peso}
+                else:
+                    publicaciones[tarea_id] = peso
+        self._indice = indice
+        self._por_tarea = por_tarea
+        self._vocabulario = sorted(indice)
+        logger.debug(
+            "Índice de búsqueda construido: %s tareas, %s términos",
+            len(self._por_tarea),
+            len(self._vocabulario),
+        )
+
+    def agregar(self, tarea: RegistroTarea) -> None:
+        """
+        Indexa una tarea, reemplazando su versión anterior si ya estaba.
+
+        Args:
+            tarea (RegistroTarea): Tarea a indexar.
+        """
+        tarea_id: int = tarea.id
+        self.quitar(tarea_id)
+        pesos: dict[str, int] = self._pesos(tarea)
+        self._por_tarea[tarea_id] = pesos
+        for termino, peso in pesos.items():
+            publicaciones: dict[int, int] | None = self._indice.get(termino)
+            if publicaciones is None:
+                publicaciones = self._indice[termino] = {}
+                bisect.insort(self._vocabulario, termino)
+            publicaciones[tarea_id] = peso
+
+    def quitar(self, tarea_id: int) -> None:
+        """
+        Quita una tarea del índice (no hace nada si no estaba indexada).
+
+        Args:
+            tarea_id (int): ID de la tarea a quitar.
+        """
+        pesos: dict[str, int] | None = self._por_tarea.pop(tarea_id, None)
+        if pesos is None:
+            return
+        for termino in pesos:
+            publicaciones: dict[int, int] = self._indice[termino]
+            del publicaciones[tarea_id]
+            if not publicaciones:
+                del self._indice[termino]
+                del self._vocabulario[bisect.bisect_left(self._vocabulario, termino)]
+
+    def _coincidencias(self, termino: str) -> list[tuple[dict[int, int], float]]:
+        """
+        Retorna las publicaciones que coinciden con un término de la consulta y
+        el factor de cada una (rareza del término, reducida si es solo prefijo).
+        """
+        total: int = len(self._por_tarea)
+        coincidencias: list[tuple[dict[int, int], float]] = []
+        exacto: dict[int, int] | None = self._indice.get(termino)
+        if exacto is not None:
+            coincidencias.append((exacto, math.log(1 + total / len(exacto))))
+        if len(termino) >= self.prefijo_minimo:
+            vocabulario: list[str] = self._vocabulario
+            posicion: int = bisect.bisect_right(vocabulario, termino)
+            while posicion < len(vocabulario) and vocabulario[posicion].startswith(
+                termino
+            ):
+                publicaciones: dict[int, int] = self._indice[vocabulario[posicion]]
+                rareza: float = math.log(1 + total / len(publicaciones))
+                coincidencias.append((publicaciones, rareza * FACTOR_PREFIJO))
+                posicion += 1
+        return coincidencias
+
+    @staticmethod
+    def _unir(coincidencias: list[tuple[dict[int, int], float]]) -> dict[int, float]:
+        """
+        Une las publicaciones de un término de la consulta en puntajes por tarea.
+        """
+        puntajes: dict[int, float] = {}
+        for publicaciones, factor in coincidencias:
+            for tarea_id, peso in publicaciones.items():
+                puntajes[tarea_id] = puntajes.get(tarea_id, 0.0) + peso * factor
+        return puntajes
+
+    def buscar(
+        self,
+        consulta: str,
+        limite: int | None = None,
+        filtro: Callable[[int], bool] | None = None,
+    ) -> list[int]:
+        """
+        Busca las tareas que contienen todas las palabras de la consulta.
+
+        Los términos se procesan de menor a mayor cantidad de coincidencias:
+        el primero define los candidatos y los siguientes solo se consultan
+        para esos candidatos, de modo que el costo depende de las tareas que
+        coinciden y no del total indexado. Un prefijo coincide con todos los
+        términos que empiezan por él; si son muchos y quedan muchos
+        candidatos, sus publicaciones se unen una vez en lugar de consultar
+        cada término por cada candidato.
+
+        Args:
+            consulta (str): Texto a buscar; cada palabra puede ser un prefijo.
+            limite (int | None): Máximo de resultados; None para todos.
+            filtro (Callable[[int], bool] | None): Función que decide si un ID
+                                                   candidato se incluye.
+
+        Returns:
+            list[int]: IDs de las tareas encontradas, de mayor a menor relevancia
+                       (a igual relevancia, por ID ascendente).
+        """
+        palabras: list[str] = list(dict.fromkeys(terminos(consulta)))
+        if not palabras:
+            return []
+        por_termino: list[list[tuple[dict[int, int], float]]] = sorted(
+            (self._coincidencias(palabra) for palabra in palabras),
+            key=lambda coincidencias: sum(len(p) for p, _ in coincidencias),
+        )
+
+        puntajes: dict[int, float] = self._unir(por_termino[0])
+        if filtro is not None:
+            puntajes = {i: p for i, p in puntajes.items() if filtro(i)}
+
+        for coincidencias in por_termino[1:]:
+            if not puntajes:
+                break
+            siguientes: dict[int, float] = {}
+            if len(puntajes) * len(coincidencias) > sum(len(p) for p, _ in coincidencias):
+                unidos: dict[int, float] = self._unir(coincidencias)
+                for tarea_id, puntaje in puntajes.items():
+                    extra_unido: float | None = unidos.get(tarea_id)
+                    if extra_unido is not None:
+                        siguientes[tarea_id] = puntaje + extra_unido
+                puntajes = siguientes
+                continue
+            for tarea_id, puntaje in puntajes.items():
+                extra: float = 0.0
+                for publicaciones, factor in coincidencias:
+                    peso: int | None = publicaciones.get(tarea_id)
+                    if peso is not None:
+                        extra += peso * factor
+                if extra:
+                    siguientes[tarea_id] = puntaje + extra
+            puntajes = siguientes
+
+        mejores: list[tuple[int, float]] = heapq.nsmallest(
+            len(puntajes) if limite is None else limite,
+            puntajes.items(),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return [tarea_id for tarea_id, _ in mejores]
@@ -0,0 +1,556 @@
+"""
+Módulo de negociación y compresión de contenido
+
+Este módulo decide, a partir de la cabecera Accept-Encoding del cliente, qué
+codificación de contenido usar, y comprime las respuestas con ella. Lo usan
+los archivos estáticos (variantes precomprimidas al construir el frontend),
+los listados completos de tareas (cuerpos comprimidos en caché) y un
+middleware que comprime el resto de las respuestas grandes.
+
+Clases principales:
+- CacheCompresion: Cuerpos serializados y comprimidos por versión del repositorio
+- MiddlewareCompresion: Middleware ASGI que comprime las respuestas grandes
+
+Funciones principales:
+- elegir_codificacion(): Elige la codificación preferida que el cliente acepta
+- comprimir(): Comprime bytes con una codificación
+- respuesta_comprimida(): Respuesta JSON servida desde la caché de compresión
+
+Características:
+- Codificaciones en orden de preferencia: br y zstd si los paquetes brotli y
+  zstandard están instalados, gzip siempre
+- Valores q de Accept-Encoding respetados (q=0 rechaza la codificación) y
+  comodín "*" para las no mencionadas; a igual q se elige según el orden de
+  preferencia del servidor
+- Solo se comprimen los tipos de texto (JSON, NDJSON, HTML, CSS, JS) de al
+  menos COMPRESION_UMBRAL bytes; las respuestas transmitidas se comprimen
+  fragmento a fragmento
+- Caché acotada a COMPRESION_CACHE_MAXIMO bytes, con descarte de lo menos usado
+- El middleware comprime los cuerpos grandes en un hilo, sin bloquear el bucle
+  de eventos
+- Las respuestas que ya traen Content-Encoding se envían tal cual
+- Vary: Accept-Encoding en toda respuesta cuya codificación depende del cliente
+- Aciertos y fallos de la caché en la métrica tareas_compresion_cache_total
+"""
+
+import gzip
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Sequence
+
+import anyio.to_thread
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+
+from constants import COMPRESION_CACHE_MAXIMO, COMPRESION_UMBRAL
+
+from .MDmetricas import Contador, metricas
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende del entorno
+    zstandard = None
+
+# Extensión de las variantes precomprimidas de cada codificación
+EXTENSIONES: dict[str, str] = {"br": ".br", "zstd": ".zst", "gzip": ".gz"}
+
+# Codificaciones disponibles, en orden de preferencia
+CODIFICACIONES: tuple[str, ...] = tuple(
+    codificacion
+    for codificacion, disponible in (
+        ("br", brotli is not None),
+        ("zstd", zstandard is not None),
+        ("gzip", True),
+    )
+    if disponible
+)
+
+# Niveles de compresión: moderados para las respuestas (se comprimen al
+# servirlas) y máximos para los activos construidos de antemano
+NIVELES: dict[str, int] = {"br": 5, "zstd": 3, "gzip": 6}
+NIVELES_MAXIMOS: dict[str, int] = {"br": 11, "zstd": 19, "gzip": 9}
+
+# Fragmentos de al menos este tamaño se comprimen en un hilo del pool de anyio
+# (los más pequeños tardan menos que el cambio de hilo)
+COMPRIMIR_EN_HILO: int = 64 * 1024
+
+# Tipos de contenido que vale la pena comprimir
+TIPOS_COMPRIMIBLES: tuple[str, ...] = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+CACHE_COMPRESION: Contador = metricas.contador(
+    "tareas_compresion_cache_total",
+    "Consultas a la caché de respuestas comprimidas, por resultado",
+    ("resultado",),
+)
+
+
+def _variar_por_codificacion(cabeceras: MutableHeaders) -> None:
+    """
+    Agrega Accept-Encoding a la cabecera Vary si todavía no la incluye.
+    """
+    vary: str = cabeceras.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        cabeceras.add_vary_header("Accept-Encoding")
+
+
+def _aceptadas(accept_encoding: str) -> dict[str, float]:
+    """
+    Interpreta Accept-Encoding como {codificación: q}.
+    """
+    aceptadas: dict[str, float] = {}
+    for parte in accept_encoding.split(","):
+        nombre, _, parametros = parte.partition(";")
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        q: float = 1.0
+        parametro: str = parametros.strip().lower()
+        if parametro.startswith("q="):
+            try:
+                q = float(parametro[2:])
+            except ValueError:
+                q = 0.0
+        aceptadas[nombre] = q
+    return aceptadas
+
+
+# Función para elegir la codificación de una respuesta
+def elegir_codificacion(
+    accept_encoding: str, disponibles: Sequence[str] = CODIFICACIONES
+) -> str | None:
+    """
+    Elige la codificación con la que responder a un cliente.
+
+    Args:
+        accept_encoding (str): Valor de la cabecera Accept-Encoding (vacío si
+                               el cliente no la envió).
+        disponibles (Sequence[str]): Codificaciones que se pueden usar, en orden
+                                     de preferencia.
+
+    Returns:
+        str | None: La codificación disponible con mayor q (a igual q, la
+                    primera en orden de preferencia), o None para responder
+                    sin comprimir.
+
+    Ejemplo:
+        >>> elegir_codificacion("gzip, deflate, br", ("br", "gzip"))
+        'br'
+        >>> elegir_codificacion("gzip;q=0, identity", ("gzip",)) is None
+        True
+    """
+    if not accept_encoding:
+        return None
+    aceptadas: dict[str, float] = _aceptadas(accept_encoding)
+    comodin: float = aceptadas.get("*", 0.0)
+    elegida: str | None = None
+    mejor_q: float = 0.0
+    for codificacion in disponibles:
+        q: float = aceptadas.get(codificacion, comodin)
+        if q > mejor_q:
+            elegida, mejor_q = codificacion, q
+    return elegida
+
+
+# Función para comprimir datos con una codificación
+def comprimir(datos: bytes, codificacion: str, maximo: bool = False) -> bytes:
+    """
+    Comprime datos con una codificación.
+
+    Args:
+        datos (bytes): Contenido sin comprimir.
+        codificacion (str): "gzip", "br" o "zstd" (estas dos requieren sus paquetes).
+        maximo (bool): Usar la máxima compresión (más lenta), para contenido
+                       que se comprime una sola vez.
+
+    Returns:
+        bytes: Contenido comprimido. Con gzip no incluye fecha, de modo que el
+               mismo contenido produce siempre los mismos bytes.
+
+    Raises:
+        ValueError: Si la codificación no está disponible.
+    """
+    nivel: int = (NIVELES_MAXIMOS if maximo else NIVELES).get(codificacion, 0)
+    if codificacion == "gzip":
+        return gzip.compress(datos, compresslevel=nivel, mtime=0)
+    if codificacion == "br" and brotli is not None:
+        return brotli.compress(datos, quality=nivel)
+    if codificacion == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=nivel).compress(datos)
+    raise ValueError(f"Codificación no disponible: {codificacion}")
+
+
+class _Compresor:
+    """
+    Compresión incremental de un cuerpo enviado por fragmentos.
+
+    Cada fragmento se vacía al enviarlo (flush de sincronización), de modo que
+    el cliente puede descomprimirlo sin esperar al resto de la respuesta.
+    """
+
+    def __init__(self, codificacion: str) -> None:
+        nivel: int = NIVELES[codificacion]
+        self._objeto: Any
+        if codificacion == "br":
+            self._objeto = brotli.Compressor(quality=nivel)
+        elif codificacion == "zstd":
+            self._objeto = zstandard.ZstdCompressor(level=nivel).compressobj()
+        else:
+            self._objeto = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+        self.codificacion: str = codificacion
+
+    def fragmento(self, datos: bytes) -> bytes:
+        """
+        Comprime un fragmento y vacía el compresor.
+        """
+        if self.codificacion == "br":
+            return self._objeto.process(datos) + self._objeto.flush()
+        if self.codificacion == "zstd":
+            return self._objeto.compress(datos) + self._objeto.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        return self._objeto.compress(datos) + self._objeto.flush(zlib.Z_SYNC_FLUSH)
+
+    def terminar(self, datos: bytes = b"") -> bytes:
+        """
+        Comprime el último fragmento y cierra el flujo comprimido.
+        """
+        if self.codificacion == "br":
+            return self._objeto.process(datos) + self._objeto.finish()
+        return self._objeto.compress(datos) + self._objeto.flush()
+
+
+async def _comprimir_fragmento(compresor: _Compresor, datos: bytes, ultimo: bool) -> bytes:
+    """
+    Comprime un fragmento de una respuesta, en un hilo si es grande.
+
+    Args:
+        compresor (_Compresor): Compresor de la respuesta.
+        datos (bytes): Fragmento sin comprimir.
+        ultimo (bool): Si es el último fragmento (cierra el flujo comprimido).
+
+    Returns:
+        bytes: Fragmento comprimido.
+    """
+    funcion: Callable[[bytes], bytes] = (
+        compresor.terminar if ultimo else compresor.fragmento
+    )
+    if len(datos) < COMPRIMIR_EN_HILO:
+        return funcion(datos)
+    return await anyio.to_thread.run_sync(funcion, datos)
+
+
+class CacheCompresion:
+    """
+    Caché de cuerpos de respuesta serializados y comprimidos.
+
+    Cada clave (por ejemplo, "tareas" para el listado completo) guarda solo
+    la versión más reciente: al cambiar la versión del repositorio sus
+    cuerpos se descartan y el primer cliente de cada codificación los vuelve
+    a construir. Mientras no haya escrituras, el listado se serializa una vez
+    y se comprime una vez por codificación, sin importar cuántos clientes lo
+    pidan.
+
+    El total de bytes guardados no supera maximo: al agregar un cuerpo se
+    descartan los usados hace más tiempo, y un cuerpo mayor que maximo se
+    retorna sin guardarlo.
+
+    Attributes:
+        umbral (int): Los cuerpos más pequeños se retornan sin comprimir.
+        maximo (int): Bytes máximos del total de cuerpos guardados.
+
+    Ejemplo:
+        >>> cuerpo, codificacion = cache_compresion.obtener(
+        ...     "tareas", "a1b2-7", "gzip", lambda: serializar(repositorio.tareas())
+        ... )
+    """
+
+    def __init__(
+        self, umbral: int = COMPRESION_UMBRAL, maximo: int = COMPRESION_CACHE_MAXIMO
+    ) -> None:
+        self.umbral: int = umbral
+        self.maximo: int = maximo
+        # Por (clave, codificación; None sin comprimir): versión y cuerpo, del
+        # usado hace más tiempo al más reciente
+        self._entradas: OrderedDict[tuple[str, str | None], tuple[str, bytes]] = (
+            OrderedDict()
+        )
+        self._tamano: int = 0
+        self._cerrojo: threading.Lock = threading.Lock()
+
+    def _buscar(self, clave: str, version: str, codificacion: str | None) -> bytes | None:
+        """
+        Retorna un cuerpo guardado de la versión indicada y lo marca como usado.
+
+        Notas:
+            - Se llama con el cerrojo tomado
+        """
+        entrada: tuple[str, bytes] | None = self._entradas.get((clave, codificacion))
+        if entrada is None or entrada[0] != version:
+            return None
+        self._entradas.move_to_end((clave, codificacion))
+        return entrada[1]
+
+    def _guardar(
+        self, clave: str, version: str, codificacion: str | None, cuerpo: bytes
+    ) -> None:
+        """
+        Guarda un cuerpo, descartando las versiones anteriores de la clave y,
+        si hace falta, los cuerpos usados hace más tiempo.
+
+        Notas:
+            - Se llama con el cerrojo tomado
+        """
+        for variante in (None, *CODIFICACIONES):
+            anterior: tuple[str, bytes] | None = self._entradas.get((clave, variante))
+            if anterior is not None and (
+                anterior[0] != version or variante == codificacion
+            ):
+                del self._entradas[(clave, variante)]
+                self._tamano -= len(anterior[1])
+        if len(cuerpo) > self.maximo:
+            logger.debug(
+                "Cuerpo de %s (%s bytes) mayor que la caché, no se guarda",
+                clave,
+                len(cuerpo),
+            )
+            return
+        while self._entradas and self._tamano + len(cuerpo) > self.maximo:
+            _, (_, descartado) = self._entradas.popitem(last=False)
+            self._tamano -= len(descartado)
+        self._entradas[(clave, codificacion)] = (version, cuerpo)
+        self._tamano += len(cuerpo)
+
+    def obtener(
+        self,
+        clave: str,
+        version: str,
+        codificacion: str | None,
+        producir: Callable[[], bytes],
+    ) -> tuple[bytes, str | None]:
+        """
+        Obtiene el cuerpo de una versión en una codificación, construyéndolo si falta.
+
+        Args:
+            clave (str): Recurso al que pertenece el cuerpo.
+            version (str): Versión del recurso (identificador del ETag).
+            codificacion (str | None): Codificación pedida; None sin comprimir.
+            producir (Callable[[], bytes]): Serializa el recurso si el cuerpo
+                                            sin comprimir no está en caché.
+
+        Returns:
+            tuple[bytes, str | None]: El cuerpo y su codificación, que es None
+                                      si no se pidió o si el cuerpo sin
+                                      comprimir no alcanza el umbral.
+
+        Notas:
+            - La serialización y la compresión se hacen fuera del cerrojo: dos
+              solicitudes simultáneas pueden construir el mismo cuerpo, pero
+              ninguna espera a la otra
+        """
+        with self._cerrojo:
+            sin_comprimir: bytes | None = self._buscar(clave, version, None)
+            if sin_comprimir is not None and len(sin_comprimir) < self.umbral:
+                codificacion = None
+            cuerpo: bytes | None = (
+                sin_comprimir
+                if codificacion is None
+                else self._buscar(clave, version, codificacion)
+            )
+        if cuerpo is not None:
+            CACHE_COMPRESION.incrementar("acierto")
+            return cuerpo, codificacion
+
+        CACHE_COMPRESION.incrementar("fallo")
+        guardar: dict[str | None, bytes] = {}
+        if sin_comprimir is None:
+            sin_comprimir = guardar[None] = producir()
+        if codificacion is not None and len(sin_comprimir) >= self.umbral:
+            cuerpo = guardar[codificacion] = comprimir(sin_comprimir, codificacion)
+        else:
+            cuerpo, codificacion = sin_comprimir, None
+
+        with self._cerrojo:
+            for variante, contenido in guardar.items():
+                self._guardar(clave, version, variante, contenido)
+        logger.debug(
+            "Cuerpo de %s (%s) construido para la versión %s: %s bytes",
+            clave,
+            codificacion or "sin comprimir",
+            version,
+            len(cuerpo),
+        )
+        return cuerpo, codificacion
+
+    def tamano(self) -> int:
+        """
+        Retorna el total de bytes guardados.
+        """
+        with self._cerrojo:
+            return self._tamano
+
+    def limpiar(self) -> None:
+        """
+        Descarta todos los cuerpos en caché.
+        """
+        with self._cerrojo:
+            self._entradas.clear()
+            self._tamano = 0
+
+
+# Caché compartida de los listados completos
+cache_compresion: CacheCompresion = CacheCompresion()
+
+
+# Función para construir una respuesta JSON desde la caché de compresión
+def respuesta_comprimida(
+    request: Request,
+    clave: str,
+    version: str,
+    producir: Callable[[], bytes],
+    cabeceras: dict[str, str] | None = None,
+) -> Response:
+    """
+    Construye una respuesta JSON cuyo cuerpo (comprimido o no) sale de la caché.
+
+    Args:
+        request (Request): Solicitud; se usa su cabecera Accept-Encoding.
+        clave (str): Recurso en caché ("tareas", "eliminadas").
+        version (str): Versión actual del recurso.
+        producir (Callable[[], bytes]): Serializa el recurso a JSON.
+        cabeceras (dict[str, str] | None): Cabeceras adicionales (ETag, Vary...).
+
+    Returns:
+        Response: Respuesta application/json con Content-Encoding si se comprimió.
+
+    Ejemplo:
+        >>> return respuesta_comprimida(
+        ...     request, "tareas", version[0], lambda: serializar(tareas), cabeceras
+        ... )
+    """
+    cuerpo, codificacion = cache_compresion.obtener(
+        clave,
+        version,
+        elegir_codificacion(request.headers.get("accept-encoding", "")),
+        producir,
+    )
+    respuesta: Response = Response(
+        cuerpo, media_type="application/json", headers=cabeceras
+    )
+    _variar_por_codificacion(respuesta.headers)
+    if codificacion is not None:
+        respuesta.headers["Content-Encoding"] = codificacion
+    return respuesta
+
+
+class MiddlewareCompresion:
+    """
+    Middleware ASGI que comprime las respuestas según Accept-Encoding.
+
+    Las respuestas de un solo mensaje se comprimen si alcanzan el umbral; las
+    transmitidas (más de un mensaje) se comprimen siempre, fragmento a
+    fragmento. Al comprimir se quita Content-Length (el cuerpo cambia de
+    tamaño) salvo en las de un solo mensaje, donde se recalcula. Los
+    fragmentos de COMPRIMIR_EN_HILO bytes o más se comprimen en un hilo, de
+    modo que una respuesta grande no detiene a las demás solicitudes.
+
+    Attributes:
+        umbral (int): Bytes mínimos para comprimir una respuesta de un mensaje.
+
+    Ejemplo:
+        >>> app.add_middleware(MiddlewareCompresion, umbral=1024)
+    """
+
+    def __init__(
+        self, app: Callable[..., Awaitable[None]], umbral: int = COMPRESION_UMBRAL
+    ) -> None:
+        self.app: Callable[..., Awaitable[None]] = app
+        self.umbral: int = umbral
+
+    async def __call__(
+        self,
+        scope: dict[str, Any],
+        receive: Callable[[], Awaitable[dict[str, Any]]],
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacion: str | None = elegir_codificacion(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        inicio: dict[str, Any] | None = None
+        compresor: _Compresor | None = None
+        # Pasar los mensajes sin tocarlos (respuesta no comprimible o ya comprimida)
+        directo: bool = False
+
+        async def enviar(mensaje: dict[str, Any]) -> None:
+            nonlocal inicio, compresor, directo
+            if directo:
+                await send(mensaje)
+                return
+            if mensaje["type"] == "http.response.start":
+                cabeceras: Headers = Headers(raw=mensaje["headers"])
+                tipo: str = cabeceras.get("content-type", "")
+                if (
+                    "content-encoding" in cabeceras
+                    or not tipo.startswith(TIPOS_COMPRIMIBLES)
+                    or mensaje["status"] in (204, 304)
+                ):
+                    directo = True
+                    await send(mensaje)
+                    return
+                # Esperar al primer fragmento del cuerpo para decidir
+                inicio = mensaje
+                return
+
+            assert inicio is not None
+            cuerpo: bytes = mensaje.get("body", b"")
+            mas: bool = mensaje.get("more_body", False)
+            cabeceras_inicio: MutableHeaders = MutableHeaders(raw=inicio["headers"])
+
+            if compresor is None:
+                # Un cuerpo mayor podría comprimirse: la respuesta varía igual
+                _variar_por_codificacion(cabeceras_inicio)
+                if not mas and len(cuerpo) < self.umbral:
+                    directo = True
+                    await send(inicio)
+                    await send(mensaje)
+                    return
+                if codificacion is None:
+                    directo = True
+                    await send(inicio)
+                    await send(mensaje)
+                    return
+                compresor = _Compresor(codificacion)
+                cabeceras_inicio["Content-Encoding"] = codificacion
+                if not mas:
+                    comprimido: bytes = await _comprimir_fragmento(
+                        compresor, cuerpo, True
+                    )
+                    cabeceras_inicio["Content-Length"] = str(len(comprimido))
+                    await send(inicio)
+                    await send({"type": "http.response.body", "body": comprimido})
+                    return
+                del cabeceras_inicio["Content-Length"]
+                await send(inicio)
+
+            datos: bytes = await _comprimir_fragmento(compresor, cuerpo, not mas)
+            await send({"type": "http.response.body", "body": datos, "more_body": mas})
+
+        await self.app(scope, receive, enviar)
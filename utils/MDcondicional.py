@@ -0,0 +1,124 @@
+"""
+Módulo de solicitudes condicionales HTTP (ETag y Last-Modified)
+
+Este módulo permite responder 304 Not Modified a los clientes que ya tienen la
+versión actual de un recurso. La versión se obtiene de la generación del
+repositorio en memoria, por lo que comprobarla no lee archivos de datos ni
+serializa tareas.
+
+Funciones principales:
+- cabeceras_validacion(): Cabeceras ETag, Last-Modified y Cache-Control de una versión
+- respuesta_no_modificada(): Retorna la respuesta 304 si el cliente tiene la versión actual
+
+Características:
+- ETag débil: el mismo estado puede enviarse en varias representaciones
+  (JSON, NDJSON, comprimido)
+- If-None-Match tiene prioridad sobre If-Modified-Since (RFC 9110)
+- Last-Modified solo se envía cuando la última modificación ocurrió en un
+  segundo ya terminado, para que dos cambios en el mismo segundo no compartan
+  la misma fecha
+- Cache-Control: no-cache, de modo que el navegador siempre revalida
+- El 304 repite la cabecera Vary de la respuesta 200 (RFC 9110 §15.4.5), que
+  el middleware de compresión no completa porque el 304 no tiene cuerpo
+"""
+
+import time
+import logging
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Versión de un recurso: identificador que cambia con cada modificación e
+# instante (epoch) de la última modificación
+Version = tuple[str, float]
+
+# Vary de las respuestas JSON: el middleware de compresión siempre agrega
+# Accept-Encoding, también a las que quedan por debajo del umbral
+VARY_CODIFICACION: str = "Accept-Encoding"
+
+
+def _etag(version: Version, recurso: str = "") -> str:
+    """
+    Construye el ETag débil de una versión, opcionalmente para un recurso concreto.
+    """
+    sufijo: str = f"-{recurso}" if recurso else ""
+    return f'W/"{version[0]}{sufijo}"'
+
+
+# Función para construir las cabeceras de validación de una versión
+def cabeceras_validacion(version: Version, recurso: str = "") -> dict[str, str]:
+    """
+    Construye las cabeceras que permiten al cliente revalidar su copia.
+
+    Args:
+        version (Version): Versión actual del conjunto de tareas.
+        recurso (str): Distingue recursos dentro del mismo conjunto (por ejemplo
+                       el ID de una tarea); vacío para el listado.
+
+    Returns:
+        dict[str, str]: Cabeceras ETag, Cache-Control y, si corresponde, Last-Modified.
+
+    Ejemplo:
+        >>> cabeceras_validacion(("a1b2-7", 1700000000.0))
+        {'ETag': 'W/"a1b2-7"', 'Cache-Control': 'no-cache', 'Last-Modified': '...'}
+    """
+    cabeceras: dict[str, str] = {"ETag": _etag(version, recurso), "Cache-Control": "no-cache"}
+    modificado: int = int(version[1])
+    if modificado < int(time.time()):
+        cabeceras["Last-Modified"] = formatdate(modificado, usegmt=True)
+    return cabeceras
+
+
+def _coincide_etag(if_none_match: str, etag: str) -> bool:
+    """
+    Compara If-None-Match con un ETag usando la comparación débil.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaco: str = etag.removeprefix("W/")
+    return any(
+        candidato.strip().removeprefix("W/") == opaco
+        for candidato in if_none_match.split(",")
+    )
+
+
+# Función para responder 304 si el cliente ya tiene la versión actual
+def respuesta_no_modificada(
+    request: Request, version: Version, recurso: str = "", vary: str = VARY_CODIFICACION
+) -> Response | None:
+    """
+    Evalúa las cabeceras condicionales de la solicitud contra la versión actual.
+
+    Args:
+        request (Request): Solicitud entrante.
+        version (Version): Versión actual del conjunto de tareas.
+        recurso (str): Mismo valor usado en cabeceras_validacion().
+        vary (str): Cabecera Vary que lleva la respuesta 200 del recurso,
+                    incluido el Accept-Encoding que agrega la compresión.
+
+    Returns:
+        Response | None: Respuesta 304 sin cuerpo si el cliente tiene la versión
+                         actual, o None si hay que responder normalmente.
+    """
+    if_none_match: str | None = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        vigente: bool = _coincide_etag(if_none_match, _etag(version, recurso))
+    else:
+        if_modified_since: str | None = request.headers.get("if-modified-since")
+        if if_modified_since is None:
+            return None
+        try:
+            desde: float = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return None
+        # Solo se envía Last-Modified de segundos ya terminados (ver arriba)
+        vigente = int(version[1]) <= desde and int(version[1]) < int(time.time())
+    if not vigente:
+        return None
+    logger.debug("Recurso %s sin cambios, respondiendo 304", request.url.path)
+    cabeceras: dict[str, str] = cabeceras_validacion(version, recurso)
+    if vary:
+        cabeceras["Vary"] = vary
+    return Response(status_code=304, headers=cabeceras)
@@ -0,0 +1,372 @@
+"""
+Módulo del diario de escritura anticipada (write-ahead log)
+
+Este módulo implementa un diario de solo anexado en formato JSON Lines donde
+cada modificación de tareas se registra como una línea independiente. Así el
+costo de escritura es proporcional al cambio y no al tamaño total de los datos.
+
+Clases principales:
+- Diario: Archivo de registros de solo anexado con lectura desde un desplazamiento
+
+Características:
+- Un registro JSON por línea, codificado en UTF-8
+- Lectura incremental a partir de un desplazamiento en bytes
+- Tolerancia a una última línea incompleta (escritura interrumpida)
+- Rotación tras la compactación en las instantáneas JSON: el diario
+  compactado se conserva como diario.anterior.jsonl y diario.epoca.json cuenta
+  las compactaciones, para que otros procesos lo terminen de leer sin recargar
+- Modos de durabilidad: fsync por escritura, fsync agrupado o solo memoria
+- Lotes: varios registros se escriben con una sola escritura y un solo fsync
+- Duración de la serialización, la escritura (con su fsync) y la lectura, y
+  bytes escritos, registrados en las métricas
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, BinaryIO
+
+from constants import DURABILIDAD_ESTRICTA, DURABILIDAD_GRUPO, DURABILIDAD_MEMORIA
+
+from .MDjson import deserializar, serializar
+from .MDescritura_atomica import escribir_atomico, sincronizar_directorio
+from .MDmetricas import (
+    BYTES_ESCRITOS,
+    ESCRITURA_ALMACENAMIENTO,
+    LECTURA_ALMACENAMIENTO,
+    cronometrar,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class Diario:
+    """
+    Diario de solo anexado con un registro JSON por línea.
+
+    Cada registro describe una operación completa e idempotente (por ejemplo
+    {"op": "actualizar", "tarea": {...}}), de modo que volver a aplicar el diario
+    sobre una instantánea que ya incluye algunos de sus cambios produce el mismo
+    resultado.
+
+    La durabilidad de cada registro depende del modo configurado:
+
+    - "estricta": fsync tras cada registro; al retornar el registro está en disco
+    - "grupo": el registro se entrega al sistema operativo y un hilo en segundo
+      plano hace fsync cada grupo_ms milisegundos si hubo escrituras; una caída
+      del sistema puede perder como máximo esa ventana
+    - "memoria": no se escribe nada en disco (pensado para pruebas)
+
+    Entre iniciar_lote() y confirmar_lote() los registros se acumulan en memoria
+    y se escriben juntos al confirmar, con un único fsync para todo el lote.
+
+    Attributes:
+        ruta (str): Archivo del diario.
+        durabilidad (str): Modo de durabilidad.
+        grupo_ms (int): Intervalo de fsync agrupado en milisegundos.
+        posicion (int): Bytes del diario ya escritos o aplicados por este proceso.
+        epoca (int): Compactaciones del diario conocidas por este proceso.
+        ruta_anterior (str): Diario de la última compactación incremental.
+        ruta_epoca (str): Archivo con la época actual y el tamaño del diario anterior.
+
+    Ejemplo:
+        >>> diario = Diario(JOURNAL_JSONL, DURABILIDAD_ESTRICTA)
+        >>> diario.registrar({"op": "purgar", "id": 3})
+        >>> registros, posicion = diario.leer(0)
+    """
+
+    def __init__(
+        self, ruta: str, durabilidad: str = DURABILIDAD_ESTRICTA, grupo_ms: int = 10
+    ) -> None:
+        if durabilidad not in (
+            DURABILIDAD_ESTRICTA,
+            DURABILIDAD_GRUPO,
+            DURABILIDAD_MEMORIA,
+        ):
+            raise ValueError(f"Modo de durabilidad desconocido: {durabilidad}")
+        self.ruta: str = ruta
+        self.durabilidad: str = durabilidad
+        self.grupo_ms: int = grupo_ms
+        self.posicion: int = 0
+        self.epoca: int = 0
+        base: str = os.path.splitext(ruta)[0]
+        self.ruta_anterior: str = base + ".anterior.jsonl"
+        self.ruta_epoca: str = base + ".epoca.json"
+        self._archivo: BinaryIO | None = None
+        self._cerrojo: threading.Lock = threading.Lock()
+        self._sucio: bool = False
+        self._hilo_sincronizacion: threading.Thread | None = None
+        self._diferido: bool = False
+        self._pendientes: list[bytes] = []
+
+    def _abrir(self) -> BinaryIO:
+        """
+        Abre (una sola vez) el archivo del diario en modo anexado binario.
+        """
+        if self._archivo is None or self._archivo.closed:
+            self._archivo = open(self.ruta, "ab")
+        return self._archivo
+
+    def _sincronizar_periodicamente(self) -> None:
+        """
+        Bucle del hilo de fsync agrupado: sincroniza si hubo escrituras.
+        """
+        while True:
+            time.sleep(self.grupo_ms / 1000)
+            self.sincronizar()
+
+    def sincronizar(self) -> None:
+        """
+        Fuerza a disco (fsync) los registros escritos y aún no sincronizados.
+        """
+        with self._cerrojo:
+            if self._sucio and self._archivo is not None and not self._archivo.closed:
+                os.fsync(self._archivo.fileno())
+                self._sucio = False
+
+    def tamano(self) -> int:
+        """
+        Retorna el tamaño actual del diario en disco (0 si no existe).
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return self.posicion
+        try:
+            return os.stat(self.ruta).st_size
+        except FileNotFoundError:
+            return 0
+
+    def registrar(self, registro: dict[str, Any]) -> None:
+        """
+        Anexa un registro al final del diario.
+
+        Args:
+            registro (dict[str, Any]): Operación a registrar; debe ser serializable.
+
+        Raises:
+            Exception: Si ocurre un error de escritura.
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return
+        with cronometrar(ESCRITURA_ALMACENAMIENTO, "diario", "serializar"):
+            linea: bytes = serializar(registro) + b"\n"
+        with self._cerrojo:
+            if self._diferido:
+                self._pendientes.append(linea)
+                return
+            self._escribir(linea)
+
+    def _escribir(self, contenido: bytes) -> None:
+        """
+        Escribe bytes al final del diario según el modo de durabilidad
+        (requiere el cerrojo tomado).
+        """
+        archivo: BinaryIO = self._abrir()
+        with cronometrar(ESCRITURA_ALMACENAMIENTO, "diario", "escribir"):
+            archivo.write(contenido)
+            archivo.flush()
+            if self.durabilidad == DURABILIDAD_ESTRICTA:
+                os.fsync(archivo.fileno())
+            else:
+                self._sucio = True
+        BYTES_ESCRITOS.observar(len(contenido), "diario")
+        self.posicion = archivo.tell()
+        if self.durabilidad == DURABILIDAD_GRUPO and self._hilo_sincronizacion is None:
+            self._hilo_sincronizacion = threading.Thread(
+                target=self._sincronizar_periodicamente,
+                name="diario-fsync",
+                daemon=True,
+            )
+            self._hilo_sincronizacion.start()
+
+    def iniciar_lote(self) -> None:
+        """
+        Empieza a acumular registros en memoria hasta confirmar_lote().
+        """
+        with self._cerrojo:
+            self._diferido = True
+
+    def confirmar_lote(self) -> None:
+        """
+        Escribe los registros acumulados con una sola escritura y un solo fsync.
+
+        Raises:
+            Exception: Si ocurre un error de escritura; los registros del lote
+                       se descartan.
+        """
+        with self._cerrojo:
+            self._diferido = False
+            pendientes: list[bytes] = self._pendientes
+            self._pendientes = []
+            if pendientes:
+                self._escribir(b"".join(pendientes))
+
+    def leer(
+        self, desde: int = 0, ruta: str | None = None
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Lee los registros completos a partir de un desplazamiento en bytes.
+
+        Args:
+            desde (int): Desplazamiento inicial en bytes.
+            ruta (str | None): Archivo a leer; por defecto el diario actual.
+
+        Returns:
+            tuple[list[dict[str, Any]], int]: Registros leídos y desplazamiento
+                                              del final de la última línea completa.
+
+        Raises:
+            json.JSONDecodeError: Si una línea completa del diario está corrupta.
+
+        Notas:
+            - Una última línea sin salto de línea se considera una escritura
+              interrumpida y se ignora (se volverá a leer si se completa)
+        """
+        ruta = ruta or self.ruta
+        registros: list[dict[str, Any]] = []
+        if self.durabilidad == DURABILIDAD_MEMORIA or not os.path.exists(ruta):
+            return registros, desde
+        with cronometrar(LECTURA_ALMACENAMIENTO, "diario", "leer"):
+            with open(ruta, "rb") as archivo:
+                archivo.seek(desde)
+                contenido: bytes = archivo.read()
+        completo: int = contenido.rfind(b"\n") + 1
+        with cronometrar(LECTURA_ALMACENAMIENTO, "diario", "decodificar"):
+            for linea in contenido[:completo].splitlines():
+                if not linea.strip():
+                    continue
+                try:
+                    registros.append(deserializar(linea))
+                except json.JSONDecodeError as e:
+                    logger.error("Registro corrupto en el diario %s: %s", ruta, e)
+                    raise
+        if completo < len(contenido):
+            logger.warning(
+                "Última línea incompleta en el diario %s, se ignora", ruta
+            )
+        return registros, desde + completo
+
+    def recortar(self, tamano: int) -> None:
+        """
+        Descarta del diario todo lo que sigue a un desplazamiento.
+
+        Se usa al cargar para eliminar una última línea incompleta, de modo que
+        los registros siguientes no queden anexados a un fragmento corrupto.
+
+        Args:
+            tamano (int): Nuevo tamaño del diario en bytes.
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return
+        with self._cerrojo:
+            self._cerrar_archivo()
+            os.truncate(self.ruta, tamano)
+            self.posicion = tamano
+
+    def truncar(self) -> None:
+        """
+        Vacía el diario después de reemplazar el estado completo de las instantáneas.
+
+        Notas:
+            - Los registros de un lote aún sin confirmar también se descartan,
+              ya que su efecto quedó incluido en las instantáneas
+            - Avanza la época sin diario anterior: los demás procesos deben
+              recargar el estado completo
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            self.posicion = 0
+            return
+        with self._cerrojo:
+            self._pendientes = []
+            self._cerrar_archivo()
+            with open(self.ruta, "wb") as archivo:
+                os.fsync(archivo.fileno())
+            try:
+                os.remove(self.ruta_anterior)
+            except FileNotFoundError:
+                pass
+            self.posicion = 0
+            self._avanzar_epoca(None)
+
+    def rotar(self) -> None:
+        """
+        Reemplaza el diario por uno vacío después de compactarlo en las instantáneas.
+
+        El diario compactado se conserva como ruta_anterior hasta la siguiente
+        compactación: los procesos que aún no leyeron sus últimos registros
+        los toman de allí y no necesitan recargar las instantáneas.
+
+        Notas:
+            - Los registros de un lote aún sin confirmar se escriben antes de
+              rotar: ya están en las instantáneas, pero los demás procesos solo
+              los conocen a través del diario anterior
+            - Requiere el bloqueo exclusivo del almacenamiento: ningún otro
+              proceso puede anexar registros durante la rotación
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            self.posicion = 0
+            return
+        with self._cerrojo:
+            if self._pendientes:
+                self._escribir(b"".join(self._pendientes))
+                self._pendientes = []
+            self._cerrar_archivo()
+            tamano: int = self.tamano()
+            if os.path.exists(self.ruta):
+                os.replace(self.ruta, self.ruta_anterior)
+            with open(self.ruta, "wb") as archivo:
+                os.fsync(archivo.fileno())
+            sincronizar_directorio(os.path.dirname(os.path.abspath(self.ruta)))
+            self.posicion = 0
+            self._avanzar_epoca(tamano)
+
+    def _avanzar_epoca(self, tamano_anterior: int | None) -> None:
+        """
+        Incrementa y persiste la época (requiere el cerrojo tomado).
+
+        Args:
+            tamano_anterior (int | None): Tamaño del diario conservado en
+                                          ruta_anterior, o None si no se conservó.
+        """
+        self.epoca = self.leer_epoca()[0] + 1
+        escribir_atomico(
+            self.ruta_epoca,
+            serializar({"epoca": self.epoca, "anterior": tamano_anterior}),
+        )
+
+    def leer_epoca(self) -> tuple[int, int | None]:
+        """
+        Lee la época persistida y el tamaño del diario anterior.
+
+        Returns:
+            tuple[int, int | None]: Compactaciones realizadas (0 si nunca se
+                                    compactó) y tamaño de ruta_anterior, o None
+                                    si la última no lo conservó.
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return self.epoca, None
+        try:
+            with open(self.ruta_epoca, "rb") as archivo:
+                estado: dict[str, Any] = deserializar(archivo.read())
+        except FileNotFoundError:
+            return 0, None
+        return estado["epoca"], estado["anterior"]
+
+    def _cerrar_archivo(self) -> None:
+        """
+        Sincroniza y cierra el archivo del diario (requiere el cerrojo tomado).
+        """
+        if self._archivo is not None and not self._archivo.closed:
+            if self._sucio:
+                os.fsync(self._archivo.fileno())
+                self._sucio = False
+            self._archivo.close()
+        self._archivo = None
+
+    def cerrar(self) -> None:
+        """
+        Sincroniza los registros pendientes y cierra el archivo del diario.
+        """
+        with self._cerrojo:
+            self._cerrar_archivo()
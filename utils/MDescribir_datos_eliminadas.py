@@ -1,60 +1,52 @@
 """
-Módulo para escribir datos de tareas eliminadas en archivos JSON
+Módulo para reemplazar el historial completo de tareas eliminadas
 
-Este módulo proporciona funciones para escribir datos estructurados
-de tareas eliminadas en archivos JSON con formato legible y manejo de errores.
+Este módulo proporciona una función que reemplaza todo el historial de
+eliminadas del repositorio y persiste el estado completo en el almacenamiento
+configurado (segmentos JSON o SQLite).
 
 Funciones principales:
-- escribir_datos_eliminadas(): Guarda lista de tareas eliminadas en archivo JSON
+- escribir_datos_eliminadas(): Reemplaza el historial completo de eliminadas
 
 Características:
-- Formato JSON legible con indentación
-- Encoding UTF-8 para caracteres especiales
-- Logging detallado de operaciones
-- Manejo robusto de errores de escritura
+- Escritura a través del escritor serializado (en orden con las demás)
+- Persistencia del estado completo, no de una operación del diario
+- Actualización de la caché del repositorio en memoria
 """
 
 from typing import Any
-import json
 import logging
-from constants import DELETED_JSON
+
+from .MDrepositorio import repositorio
+from .MDescritor import escritor
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
-# Función para escribir datos al archivo JSON
+# Función para reemplazar el historial de eliminadas
 def escribir_datos_eliminadas(datos: list[dict[str, Any]]) -> None:
     """
-    Escribe una lista de datos de tareas eliminadas en el archivo JSON de historial.
+    Reemplaza el historial completo de tareas eliminadas y persiste el estado.
 
-    Esta función serializa una lista de diccionarios representando tareas eliminadas
-    en formato JSON con indentación legible y encoding UTF-8. Cada tarea incluye
-    información de auditoría como timestamp de eliminación.
+    Encola repositorio.reemplazar_eliminadas en el escritor serializado y
+    espera a que termine, de modo que no se intercala con otras modificaciones.
 
     Args:
-        datos (list[dict[str, Any]]): Lista de diccionarios representando tareas eliminadas
-                                    con sus timestamps a escribir en el archivo.
+        datos (list[dict[str, Any]]): Nuevo historial; cada tarea incluye su
+                                    'fecha_eliminacion'.
 
     Raises:
-        Exception: Si ocurre un error durante la apertura o escritura del archivo.
+        Exception: La excepción del repositorio o del almacenamiento al guardar.
 
     Notas:
-        - Archivo objetivo: tareas_eliminadas.json en directorio data/
-        - Formato: JSON con indentación de 2 espacios
-        - Encoding: UTF-8 para caracteres especiales
-        - Logging automático de operaciones y errores
-        - Sobrescribe completamente el archivo existente
+        - Guarda el estado completo (Almacenamiento.guardar_todo): con JSON
+          reescribe la instantánea y todos los segmentos mensuales de
+          data/eliminadas/; con SQLite reemplaza las filas en una transacción
+        - Las tareas activas no cambian
 
     Ejemplo:
         >>> eliminadas = [{"id": 1, "titulo": "Eliminada", "fecha_eliminacion": "2023-01-01T..."}]
         >>> escribir_datos_eliminadas(eliminadas)
-        # Archivo tareas_eliminadas.json actualizado
+        # Historial reemplazado y persistido
     """
-    logger.debug("Escribiendo {len(datos)} elementos al archivo JSON: %s", DELETED_JSON)
-    try:
-        with open(DELETED_JSON, "w", encoding="utf-8") as file:
-            json.dump(datos, file, indent=2, ensure_ascii=False)
-        logger.debug("Datos escritos exitosamente")
-    except Exception as e:
-        logger.error("Error al escribir datos en {DELETED_JSON}: %s", e)
-        raise
+    escritor.ejecutar(repositorio.reemplazar_eliminadas, datos)
@@ -1,60 +1,52 @@
 """
-Módulo para escribir datos en archivos JSON
+Módulo para reemplazar la lista completa de tareas activas
 
-Este módulo proporciona funciones para escribir datos estructurados
-en archivos JSON con formato legible y manejo de errores.
+Este módulo proporciona una función que reemplaza todas las tareas activas del
+repositorio y persiste el estado completo en el almacenamiento configurado
+(instantánea JSON o SQLite).
 
 Funciones principales:
-- escribir_datos_tareas(): Guarda lista de tareas en archivo JSON
+- escribir_datos_tareas(): Reemplaza la lista completa de tareas activas
 
 Características:
-- Formato JSON legible con indentación
-- Encoding UTF-8 para caracteres especiales
-- Logging detallado de operaciones
-- Manejo robusto de errores de escritura
+- Escritura a través del escritor serializado (en orden con las demás)
+- Persistencia del estado completo, no de una operación del diario
+- Actualización de la caché del repositorio en memoria
 """
 
 from typing import Any
-import json
 import logging
-from constants import DATA_JSON
+
+from .MDrepositorio import repositorio
+from .MDescritor import escritor
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
-# Función para escribir datos al archivo JSON
+# Función para reemplazar todas las tareas activas
 def escribir_datos_tareas(datos: list[dict[str, Any]]) -> None:
     """
-    Escribe una lista de datos de tareas en el archivo JSON principal.
+    Reemplaza la lista completa de tareas activas y persiste el estado.
 
-    Esta función serializa una lista de diccionarios representando tareas
-    en formato JSON con indentación legible y encoding UTF-8 para soporte
-    completo de caracteres especiales.
+    Encola repositorio.reemplazar_tareas en el escritor serializado y espera
+    a que termine, de modo que no se intercala con otras modificaciones.
 
     Args:
-        datos (list[dict[str, Any]]): Lista de diccionarios representando tareas
-                                    a escribir en el archivo.
+        datos (list[dict[str, Any]]): Nueva lista de tareas activas.
 
     Raises:
-        Exception: Si ocurre un error durante la apertura o escritura del archivo.
+        Exception: La excepción del repositorio o del almacenamiento al guardar.
 
     Notas:
-        - Archivo objetivo: tareas.json en directorio data/
-        - Formato: JSON con indentación de 2 espacios
-        - Encoding: UTF-8 para caracteres especiales
-        - Logging automático de operaciones y errores
-        - Sobrescribe completamente el archivo existente
+        - Guarda el estado completo (Almacenamiento.guardar_todo): con JSON
+          reescribe la instantánea y todos los segmentos del historial; con
+          SQLite reemplaza las filas en una transacción
+        - El historial de eliminadas no cambia
+        - Los demás workers ven el nuevo estado en su siguiente lectura
 
     Ejemplo:
         >>> tareas = [{"id": 1, "titulo": "Tarea 1", "descripcion": "...", "completada": False}]
         >>> escribir_datos_tareas(tareas)
-        # Archivo tareas.json actualizado
+        # Tareas activas reemplazadas y persistidas
     """
-    logger.debug("Escribiendo {len(datos)} elementos al archivo JSON: %s", DATA_JSON)
-    try:
-        with open(DATA_JSON, "w", encoding="utf-8") as file:
-            json.dump(datos, file, indent=2, ensure_ascii=False)
-        logger.debug("Datos escritos exitosamente")
-    except Exception as e:
-        logger.error("Error al escribir datos en {DATA_JSON}: %s", e)
-        raise
+    escritor.ejecutar(repositorio.reemplazar_tareas, datos)
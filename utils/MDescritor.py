@@ -0,0 +1,164 @@
+"""
+Módulo del escritor serializado de modificaciones
+
+Este módulo proporciona un único hilo escritor que consume una cola de
+modificaciones y las aplica en orden sobre el repositorio. Los endpoints se
+ejecutan en paralelo en el threadpool de Starlette, pero todas las escrituras
+pasan por este hilo, de modo que ninguna lectura-modificación-escritura se
+intercala con otra.
+
+Clases principales:
+- EscritorSerializado: Hilo escritor con cola de modificaciones
+
+Objetos principales:
+- escritor: Instancia única compartida por toda la aplicación
+
+Características:
+- Aplicación de modificaciones en orden de llegada
+- Agrupación de las modificaciones pendientes en lotes con un solo fsync
+- Respuesta al cliente solo después de que su lote está en disco
+- Inicio perezoso si la aplicación no lo arrancó desde el lifespan
+"""
+
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from .MDrepositorio import RepositorioTareas, repositorio
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Máximo de modificaciones aplicadas en un mismo lote
+MAX_LOTE: int = 256
+
+# Elemento de la cola: función a ejecutar, argumentos y futuro del resultado
+Modificacion = tuple[Callable[..., Any], tuple[Any, ...], Future]
+
+
+class EscritorSerializado:
+    """
+    Hilo dedicado que aplica en orden las modificaciones del repositorio.
+
+    Cada llamada a ejecutar() encola la modificación y espera su resultado.
+    El hilo toma todas las modificaciones pendientes (hasta MAX_LOTE), las
+    aplica dentro de repositorio.lote() y, una vez confirmado el lote en
+    disco, entrega el resultado (o la excepción) a cada solicitante.
+
+    Attributes:
+        repositorio (RepositorioTareas): Repositorio sobre el que se escribe.
+
+    Ejemplo:
+        >>> escritor.iniciar()
+        >>> escritor.ejecutar(repositorio.actualizar_parcial, 1, {"completada": True})
+        >>> escritor.detener()
+    """
+
+    def __init__(self, repo: RepositorioTareas) -> None:
+        self.repositorio: RepositorioTareas = repo
+        self._cola: "queue.Queue[Modificacion | None]" = queue.Queue()
+        self._hilo: threading.Thread | None = None
+        self._cerrojo: threading.Lock = threading.Lock()
+
+    def iniciar(self) -> None:
+        """
+        Arranca el hilo escritor si no está en marcha.
+        """
+        with self._cerrojo:
+            if self._hilo is not None and self._hilo.is_alive():
+                return
+            self._hilo = threading.Thread(
+                target=self._bucle, name="escritor-tareas", daemon=True
+            )
+            self._hilo.start()
+            logger.info("Escritor serializado iniciado")
+
+    def detener(self) -> None:
+        """
+        Aplica las modificaciones pendientes y detiene el hilo escritor.
+        """
+        with self._cerrojo:
+            if self._hilo is None:
+                return
+            self._cola.put(None)
+            self._hilo.join()
+            self._hilo = None
+            logger.info("Escritor serializado detenido")
+
+    def ejecutar(self, funcion: Callable[..., Any], *args: Any) -> Any:
+        """
+        Encola una modificación y espera a que se aplique y persista.
+
+        Args:
+            funcion (Callable[..., Any]): Método del repositorio a ejecutar.
+            *args (Any): Argumentos de la función.
+
+        Returns:
+            Any: El valor retornado por la función.
+
+        Raises:
+            Exception: La excepción lanzada por la función o por la escritura
+                       del lote en disco.
+        """
+        if threading.current_thread() is self._hilo:
+            # Llamada anidada desde el propio escritor: ejecutar directamente
+            return funcion(*args)
+        if self._hilo is None:
+            self.iniciar()
+        futuro: Future = Future()
+        self._cola.put((funcion, args, futuro))
+        return futuro.result()
+
+    def _bucle(self) -> None:
+        """
+        Bucle del hilo escritor: toma lotes de la cola y los aplica en orden.
+        """
+        while True:
+            primera: Modificacion | None = self._cola.get()
+            lote: list[Modificacion] = []
+            detener: bool = primera is None
+            if primera is not None:
+                lote.append(primera)
+            while not detener and len(lote) < MAX_LOTE:
+                try:
+                    siguiente: Modificacion | None = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is None:
+                    detener = True
+                else:
+                    lote.append(siguiente)
+            if lote:
+                self._aplicar_lote(lote)
+            if detener:
+                return
+
+    def _aplicar_lote(self, lote: list[Modificacion]) -> None:
+        """
+        Aplica un lote de modificaciones y notifica el resultado de cada una.
+        """
+        resultados: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            with self.repositorio.lote():
+                for funcion, args, futuro in lote:
+                    try:
+                        resultados.append((futuro, funcion(*args), None))
+                    except Exception as e:
+                        logger.error("Error al aplicar modificación: %s", e)
+                        resultados.append((futuro, None, e))
+        except Exception as e:
+            # El lote no llegó a disco: ninguna modificación quedó confirmada
+            for _, _, futuro in lote:
+                futuro.set_exception(e)
+            return
+        for futuro, resultado, error in resultados:
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultado)
+        logger.debug("Lote de %s modificaciones aplicado", len(lote))
+
+
+# Instancia única compartida por routers y utilidades
+escritor: EscritorSerializado = EscritorSerializado(repositorio)
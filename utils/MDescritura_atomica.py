@@ -0,0 +1,82 @@
+"""
+Módulo de escritura atómica de archivos
+
+Este módulo proporciona funciones para reemplazar archivos de datos de forma
+segura ante caídas: el contenido se escribe primero en un archivo temporal del
+mismo directorio, se sincroniza con el disco y luego se renombra sobre el
+archivo destino, de modo que nunca queda un archivo vacío o a medio escribir.
+
+Funciones principales:
+- escribir_atomico(): Reemplaza un archivo con temporal + fsync + rename
+- sincronizar_directorio(): Sincroniza la entrada de directorio tras un rename
+
+Características:
+- El archivo destino siempre contiene la versión anterior o la nueva completa
+- fsync del archivo y del directorio (cuando el sistema operativo lo permite)
+- Limpieza del temporal si la escritura falla
+"""
+
+import os
+import logging
+import tempfile
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def sincronizar_directorio(directorio: str) -> None:
+    """
+    Sincroniza con el disco la entrada de un directorio.
+
+    Es necesario tras os.replace() para que el renombrado sobreviva a una caída.
+    En sistemas que no permiten abrir directorios (Windows) no hace nada.
+
+    Args:
+        directorio (str): Directorio a sincronizar.
+    """
+    try:
+        descriptor: int = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def escribir_atomico(ruta: str, contenido: bytes) -> None:
+    """
+    Reemplaza atómicamente el contenido de un archivo.
+
+    Args:
+        ruta (str): Archivo destino.
+        contenido (bytes): Contenido completo a escribir.
+
+    Raises:
+        Exception: Si ocurre un error de escritura; el archivo destino no se modifica.
+
+    Ejemplo:
+        >>> escribir_atomico(DATA_JSON, b"[]")
+    """
+    directorio: str = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(
+        prefix=os.path.basename(ruta) + ".", suffix=".tmp", dir=directorio
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            archivo.write(contenido)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        # mkstemp crea el temporal con permisos 0600; conservar los del destino
+        if os.path.exists(ruta):
+            os.chmod(temporal, os.stat(ruta).st_mode & 0o777)
+        os.replace(temporal, ruta)
+    except Exception:
+        logger.error("Error en la escritura atómica de %s", ruta)
+        try:
+            os.unlink(temporal)
+        except OSError:
+            pass
+        raise
+    sincronizar_directorio(directorio)
@@ -11,14 +11,15 @@ Características:
 - Timestamp automático de eliminación
 - Mantenimiento del orden por ID
 - Logging detallado de operaciones
-- Integración con sistema de archivos JSON
+- Un único registro en el almacenamiento (línea del diario o fila de SQLite)
 """
 
 from datetime import datetime
 from typing import Any
 import logging
 
-from utils import leer_eliminadas_json, escribir_datos_eliminadas
+from .MDrepositorio import repositorio
+from .MDescritor import escritor
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -29,18 +30,21 @@ def guardar_eliminada(tarea_a_eliminar: dict[str, Any]) -> None:
     Guarda una tarea eliminada en el archivo de historial con marca de tiempo.
 
     Esta función toma una tarea eliminada, le agrega un timestamp de eliminación
-    y la almacena en el archivo de historial manteniendo el orden por ID.
+    y la mueve al historial del repositorio a través del escritor serializado.
     Esto permite auditoría completa y recuperación histórica de eliminaciones.
 
     Args:
         tarea_a_eliminar (dict[str, Any]): La tarea que fue eliminada, con todos sus campos originales.
 
     Raises:
-        Exception: Si ocurre un error durante la lectura/escritura de archivos.
+        Exception: Si el repositorio o el almacenamiento fallan al guardar.
 
     Notas:
         - Agrega automáticamente campo 'fecha_eliminacion' con timestamp ISO 8601
-        - Mantiene orden ascendente por ID en el archivo de historial
+        - La tarea sale de las activas si seguía allí (repositorio.guardar_eliminada)
+        - Mantiene orden ascendente por ID en el historial (inserción O(log n))
+        - Con JSON se agrega una línea al diario; al compactar solo se
+          reescriben los segmentos mensuales que cambiaron
         - Logging automático de operaciones exitosas y errores
         - Parte integral del sistema de auditoría de eliminaciones
 
@@ -56,19 +60,8 @@ def guardar_eliminada(tarea_a_eliminar: dict[str, Any]) -> None:
     tarea_eliminada["fecha_eliminacion"] = datetime.now().isoformat()
 
     try:
-        data: list[dict[str, Any]] = leer_eliminadas_json()
-
-        # Insertar en posición correcta para mantener orden por ID
-        id_tarea: int = tarea_eliminada["id"]
-        for i, tarea in enumerate(data):
-            if tarea["id"] > id_tarea:
-                posicion: int = i
-                break
-        else:
-            posicion = len(data)
-        data.insert(posicion, tarea_eliminada)
-
-        escribir_datos_eliminadas(data)
+        # El repositorio mantiene el orden por ID con una búsqueda binaria
+        escritor.ejecutar(repositorio.guardar_eliminada, tarea_eliminada)
         logger.info("Tarea eliminada guardada exitosamente")
     except Exception as e:
         logger.error("Error al guardar tarea eliminada: %s", e)
@@ -0,0 +1,247 @@
+"""
+Módulo del historial de eliminadas segmentado por mes
+
+Este módulo guarda el historial de tareas eliminadas del almacenamiento JSON
+en un archivo por mes de eliminación más un manifiesto pequeño que los
+enumera. El historial solo crece, pero cada eliminación cae en el segmento
+del mes en curso: al compactar se reescriben únicamente los segmentos que
+cambiaron, y los meses anteriores quedan intactos.
+
+Clases principales:
+- HistorialSegmentado: Segmentos mensuales del historial y su manifiesto
+
+Estructura en disco (data/eliminadas/):
+- manifiesto.json: {"segmentos": [{"mes", "archivo", "tareas", "primer_id", "ultimo_id"}]}
+- eliminadas-AAAA-MM.json: Tareas eliminadas ese mes, ordenadas por ID
+- eliminadas-sin-fecha.json: Tareas sin fecha_eliminacion válida
+
+Características:
+- Un segmento se reescribe solo si recibió eliminaciones (marcadas al
+  registrarlas) o si cambió su cantidad de tareas (restauradas o purgadas)
+- El manifiesto se escribe después de los segmentos: ante una caída, el
+  manifiesto anterior sigue apuntando a archivos completos
+- Migración automática desde tareas_eliminadas.json: se lee mientras no
+  exista el manifiesto y la primera compactación crea los segmentos
+- Escrituras atómicas y lectura con validación estricta, como las instantáneas
+"""
+
+import os
+import re
+import logging
+from typing import Any
+
+from constants import ADAPTADOR_ELIMINADAS, JSON_COMPACTO
+
+from .MDarchivos import Firma, escribir_archivo, firma_archivo, leer_archivo
+from .MDjson import deserializar, serializar
+from .MDregistro import RegistroEliminada
+from .MDescritura_atomica import escribir_atomico
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Segmento de las tareas cuya fecha de eliminación falta o no es ISO 8601
+SEGMENTO_SIN_FECHA: str = "sin-fecha"
+
+# Prefijo AAAA-MM de una fecha ISO 8601
+_PATRON_MES: re.Pattern[str] = re.compile(r"\d{4}-\d{2}")
+
+
+def _mes(fecha_eliminacion: str | None) -> str:
+    """
+    Obtiene el segmento (AAAA-MM) al que pertenece una fecha de eliminación.
+    """
+    if fecha_eliminacion and _PATRON_MES.match(fecha_eliminacion):
+        return fecha_eliminacion[:7]
+    return SEGMENTO_SIN_FECHA
+
+
+class HistorialSegmentado:
+    """
+    Historial de tareas eliminadas repartido en segmentos mensuales.
+
+    El contenido se mantiene en memoria en el repositorio; esta clase solo
+    decide qué segmentos leer y cuáles reescribir.
+
+    Attributes:
+        directorio (str): Directorio de los segmentos y el manifiesto.
+        ruta_manifiesto (str): Archivo del manifiesto.
+        ruta_legado (str | None): Historial en un único archivo (formato
+                                  anterior), leído si no hay manifiesto.
+
+    Ejemplo:
+        >>> historial = HistorialSegmentado(DIR_ELIMINADAS, DELETED_JSON)
+        >>> eliminadas = historial.leer()
+        >>> historial.marcar({"op": "eliminar", "tarea": tarea_eliminada})
+        >>> historial.guardar(repositorio.eliminadas())
+    """
+
+    def __init__(self, directorio: str, ruta_legado: str | None = None) -> None:
+        self.directorio: str = directorio
+        self.ruta_manifiesto: str = os.path.join(directorio, "manifiesto.json")
+        self.ruta_legado: str | None = ruta_legado
+        self._segmentos: dict[str, dict[str, Any]] = {}
+        self._sucios: set[str] = set()
+        self._firma: Firma = None
+
+    def _ruta(self, archivo: str) -> str:
+        return os.path.join(self.directorio, archivo)
+
+    def leer(self) -> list[dict[str, Any]]:
+        """
+        Lee el historial completo desde los segmentos del manifiesto.
+
+        Returns:
+            list[dict[str, Any]]: Tareas eliminadas de todos los segmentos, o del
+                                  archivo anterior si todavía no hay manifiesto.
+
+        Raises:
+            FileNotFoundError: Si falta un segmento listado en el manifiesto.
+            json.JSONDecodeError: Si el manifiesto o un segmento están dañados.
+            ValidationError: Si alguna tarea no cumple el modelo.
+        """
+        self._firma = firma_archivo(self.ruta_manifiesto)
+        self._sucios = set()
+        if self._firma is None:
+            self._segmentos = {}
+            if self.ruta_legado is None or not os.path.exists(self.ruta_legado):
+                return []
+            logger.info(
+                "Historial sin segmentar en %s; se segmentará al compactar",
+                self.ruta_legado,
+            )
+            return leer_archivo(self.ruta_legado, ADAPTADOR_ELIMINADAS, "eliminadas")
+
+        self._leer_manifiesto()
+        eliminadas: list[dict[str, Any]] = []
+        for segmento in self._segmentos.values():
+            ruta: str = self._ruta(segmento["archivo"])
+            if not os.path.exists(ruta):
+                logger.error("Segmento del historial no encontrado: %s", ruta)
+                raise FileNotFoundError(ruta)
+            eliminadas.extend(leer_archivo(ruta, ADAPTADOR_ELIMINADAS, "eliminadas"))
+        logger.debug(
+            "Historial leído: %s segmentos, %s tareas",
+            len(self._segmentos),
+            len(eliminadas),
+        )
+        return eliminadas
+
+    def _leer_manifiesto(self) -> None:
+        """
+        Lee la lista de segmentos del manifiesto (sin leer los segmentos).
+        """
+        with open(self.ruta_manifiesto, "rb") as file:
+            manifiesto: dict[str, Any] = deserializar(file.read())
+        self._segmentos = {
+            segmento["mes"]: segmento for segmento in manifiesto["segmentos"]
+        }
+
+    def adoptar(self) -> None:
+        """
+        Toma como propio el manifiesto escrito por otro proceso al compactar.
+
+        Se usa cuando el contenido en memoria ya coincide con el de los
+        segmentos (los registros compactados fueron aplicados): solo se
+        actualizan la lista de segmentos y la firma, sin leer las tareas.
+        """
+        self._firma = firma_archivo(self.ruta_manifiesto)
+        if self._firma is None:
+            self._segmentos = {}
+            return
+        self._leer_manifiesto()
+
+    def firma(self) -> Firma:
+        """
+        Firma actual del manifiesto en disco, para detectar compactaciones de
+        otros procesos (todo cambio de segmentos reescribe el manifiesto).
+        """
+        return firma_archivo(self.ruta_manifiesto)
+
+    def modificado(self) -> bool:
+        """
+        Indica si el manifiesto cambió en disco desde la última lectura o escritura.
+        """
+        return self.firma() != self._firma
+
+    def marcar(self, registro: dict[str, Any]) -> None:
+        """
+        Anota el segmento que recibe una tarea eliminada por un registro del diario.
+
+        Args:
+            registro (dict[str, Any]): Operación del diario; solo "eliminar"
+                                       agrega tareas al historial.
+        """
+        if registro["op"] == "eliminar":
+            self._sucios.add(_mes(registro["tarea"].get("fecha_eliminacion")))
+
+    def guardar(
+        self, eliminadas: list[RegistroEliminada], completo: bool = False
+    ) -> None:
+        """
+        Escribe los segmentos que cambiaron y, si hubo alguno, el manifiesto.
+
+        Args:
+            eliminadas (list[RegistroEliminada]): Historial completo, ordenado por ID.
+            completo (bool): Reescribir todos los segmentos (al reemplazar el
+                             historial entero).
+
+        Notas:
+            - Un segmento se considera cambiado si recibió eliminaciones desde la
+              última escritura o si su cantidad de tareas difiere del manifiesto
+            - Los segmentos que quedan vacíos se borran después de escribir el
+              manifiesto
+        """
+        grupos: dict[str, list[RegistroEliminada]] = {}
+        for tarea in eliminadas:
+            grupos.setdefault(_mes(tarea.fecha_eliminacion), []).append(tarea)
+
+        cambiados: list[str] = [
+            mes
+            for mes, tareas in grupos.items()
+            if completo
+            or mes in self._sucios
+            or mes not in self._segmentos
+            or self._segmentos[mes]["tareas"] != len(tareas)
+        ]
+        vacios: list[str] = [mes for mes in self._segmentos if mes not in grupos]
+        if not cambiados and not vacios and self._firma is not None:
+            self._sucios = set()
+            return
+
+        os.makedirs(self.directorio, exist_ok=True)
+        for mes in cambiados:
+            escribir_archivo(
+                self._ruta(f"eliminadas-{mes}.json"), grupos[mes], "eliminadas"
+            )
+
+        segmentos: dict[str, dict[str, Any]] = {
+            mes: {
+                "mes": mes,
+                "archivo": f"eliminadas-{mes}.json",
+                "tareas": len(tareas),
+                "primer_id": tareas[0].id,
+                "ultimo_id": tareas[-1].id,
+            }
+            for mes, tareas in sorted(grupos.items())
+        }
+        escribir_atomico(
+            self.ruta_manifiesto,
+            serializar(
+                {"segmentos": list(segmentos.values())}, indentar=not JSON_COMPACTO
+            ),
+        )
+        for mes in vacios:
+            try:
+                os.remove(self._ruta(self._segmentos[mes]["archivo"]))
+            except FileNotFoundError:
+                pass
+
+        self._segmentos = segmentos
+        self._sucios = set()
+        self._firma = firma_archivo(self.ruta_manifiesto)
+        logger.info(
+            "Historial guardado: %s de %s segmentos reescritos, %s borrados",
+            len(cambiados),
+            len(segmentos),
+            len(vacios),
+        )
@@ -0,0 +1,131 @@
+"""
+Módulo de serialización JSON
+
+Este módulo centraliza la conversión entre objetos Python y JSON para las
+respuestas HTTP y para los archivos de data/. Si el paquete orjson está
+instalado se usa como codificador (varias veces más rápido que json de la
+biblioteca estándar); si no, se recurre a json sin cambiar el resultado.
+
+Clases principales:
+- RespuestaJSON: Clase de respuesta de FastAPI que usa el codificador rápido
+
+Funciones principales:
+- serializar(): Convierte un objeto a bytes JSON (UTF-8), compacto o indentado
+- deserializar(): Convierte bytes o texto JSON a objetos Python
+
+Características:
+- orjson opcional: la aplicación funciona igual sin él
+- Salida UTF-8 sin escapar caracteres no ASCII (tildes, eñes)
+- Errores de decodificación como json.JSONDecodeError en ambos casos
+- Registros del repositorio y otras dataclasses serializados como objetos JSON
+"""
+
+import json
+import logging
+import dataclasses
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Indica si se usa orjson como codificador
+ORJSON_DISPONIBLE: bool = orjson is not None
+
+# Opciones de orjson: las dataclasses pasan por _convertir()
+_OPCIONES_ORJSON: int = orjson.OPT_PASSTHROUGH_DATACLASS if orjson is not None else 0
+
+
+def _convertir(objeto: Any) -> dict[str, Any]:
+    """
+    Convierte a diccionario los objetos que el codificador no serializa por sí
+    mismo. Los registros del repositorio aportan su propio a_dict(), más rápido
+    que recorrer los campos de la dataclass (también en orjson, cuyo soporte
+    nativo de dataclasses con __slots__ es más lento que este camino).
+    """
+    try:
+        return objeto.a_dict()
+    except AttributeError:
+        pass
+    if dataclasses.is_dataclass(objeto) and not isinstance(objeto, type):
+        return {
+            campo.name: getattr(objeto, campo.name)
+            for campo in dataclasses.fields(objeto)
+        }
+    raise TypeError(f"Objeto de tipo {type(objeto).__name__} no serializable a JSON")
+
+
+# Función para serializar un objeto a JSON
+def serializar(datos: Any, indentar: bool = False) -> bytes:
+    """
+    Convierte un objeto a JSON codificado en UTF-8.
+
+    Args:
+        datos (Any): Objeto serializable (listas, diccionarios, textos, números,
+                     dataclasses...).
+        indentar (bool): Si es True, indenta con 2 espacios (formato legible);
+                         si es False, genera JSON compacto sin espacios.
+
+    Returns:
+        bytes: JSON codificado en UTF-8.
+
+    Ejemplo:
+        >>> serializar({"titulo": "Canción"})
+        b'{"titulo":"Canci\\xc3\\xb3n"}'
+    """
+    if orjson is not None:
+        opciones: int = _OPCIONES_ORJSON | (orjson.OPT_INDENT_2 if indentar else 0)
+        return orjson.dumps(datos, default=_convertir, option=opciones)
+    if indentar:
+        return json.dumps(
+            datos, ensure_ascii=False, indent=2, default=_convertir
+        ).encode("utf-8")
+    return json.dumps(
+        datos, ensure_ascii=False, separators=(",", ":"), default=_convertir
+    ).encode("utf-8")
+
+
+# Función para deserializar JSON a objetos Python
+def deserializar(contenido: bytes | str) -> Any:
+    """
+    Convierte JSON (bytes o texto) a objetos Python.
+
+    Args:
+        contenido (bytes | str): JSON a decodificar.
+
+    Returns:
+        Any: Objeto decodificado.
+
+    Raises:
+        json.JSONDecodeError: Si el contenido no es JSON válido (orjson lanza
+                              una subclase de este error).
+    """
+    if orjson is not None:
+        return orjson.loads(contenido)
+    return json.loads(contenido)
+
+
+class RespuestaJSON(JSONResponse):
+    """
+    Respuesta JSON de FastAPI que serializa con el codificador rápido.
+
+    Se configura como clase de respuesta por defecto de la aplicación, de modo
+    que todos los endpoints la usan sin cambios. Los endpoints que retornan
+    tareas del repositorio la construyen directamente: como esas tareas ya se
+    validaron al recibirlas o al cargar los archivos, FastAPI no vuelve a
+    validarlas contra response_model (que se conserva para la documentación).
+
+    Ejemplo:
+        >>> app = FastAPI(default_response_class=RespuestaJSON)
+    """
+
+    def render(self, content: Any) -> bytes:
+        return serializar(content)
+
+
+logger.debug("Codificador JSON: %s", "orjson" if ORJSON_DISPONIBLE else "json")
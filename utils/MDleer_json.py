@@ -1,24 +1,24 @@
 """
 Módulo para leer datos desde archivos JSON
 
-Este módulo proporciona funciones para cargar datos desde archivos JSON
-con manejo robusto de errores y archivos inexistentes.
+Este módulo proporciona funciones para obtener las tareas activas. Los datos
+se sirven desde el repositorio en memoria, que solo vuelve a leer el archivo
+JSON cuando este cambia en disco.
 
 Funciones principales:
 - leer_json(): Carga datos desde el archivo JSON principal de tareas
 
 Características:
+- Lectura desde memoria sin decodificar JSON en cada solicitud
 - Manejo automático de archivos inexistentes
-- Recuperación de errores de decodificación JSON
 - Logging detallado de operaciones
-- Retorno de lista vacía en caso de error
+- Retorno de lista vacía si el archivo no existe
 """
 
-import os
-import json
 import logging
 from typing import Any
-from constants import DATA_JSON
+
+from .MDrepositorio import repositorio
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -28,33 +28,27 @@ def leer_json() -> list[dict[str, Any]]:
     """
     Lee los datos desde el archivo JSON principal de tareas activas.
 
-    Esta función carga todas las tareas activas desde el archivo de datos principal.
-    Maneja automáticamente casos donde el archivo no existe (retornando lista vacía)
-    o contiene JSON malformado.
+    Esta función es una vista sobre el repositorio en memoria: convierte los
+    registros de las tareas activas en diccionarios nuevos, que el llamador
+    puede modificar sin alterar la caché.
 
     Returns:
         list[dict[str, Any]]: Lista de diccionarios representando las tareas activas.
-                            Retorna lista vacía si el archivo no existe o hay error de formato.
+                            Retorna lista vacía si el archivo no existe.
+
+    Raises:
+        json.JSONDecodeError: Si el archivo en disco contiene JSON malformado.
 
     Notas:
-        - Archivo objetivo: tareas.json en directorio data/
-        - Retorna lista vacía en lugar de lanzar excepciones
-        - Logging automático de operaciones y errores
-        - Encoding UTF-8 para soporte de caracteres especiales
+        - Archivo origen: tareas.json en directorio data/
+        - El archivo solo se vuelve a leer si cambió en disco
+        - Los diccionarios son copias: modificarlos no altera la caché
+        - Un archivo dañado produce un error en lugar de una lista vacía
 
     Ejemplo:
         >>> tareas = leer_json()
         >>> print(len(tareas))  # Número de tareas activas
     """
-    logger.debug("Leyendo archivo JSON: %s", DATA_JSON)
-    if not os.path.exists(DATA_JSON):
-        logger.warning("Archivo %s no existe, retornando lista vacía", DATA_JSON)
-        return []
-    try:
-        with open(DATA_JSON, "r", encoding="utf-8") as file:
-            data: list[dict[str, Any]] = json.load(file)
-            logger.debug("Datos leídos: %s elementos", len(data))
-            return data
-    except json.JSONDecodeError as e:
-        logger.error("Error al decodificar JSON en {DATA_JSON}: %s", e)
-        return []
+    datos: list[dict[str, Any]] = [tarea.a_dict() for tarea in repositorio.tareas()]
+    logger.debug("Datos leídos: %s elementos", len(datos))
+    return datos
@@ -0,0 +1,168 @@
+"""
+Módulo de configuración de logs sin bloqueo
+
+Este módulo configura los logs de la aplicación de modo que ningún hilo que
+atiende solicitudes espere a que se escriba en disco o en la consola: el
+manejador raíz solo encola cada registro y un hilo aparte (QueueListener) lo
+escribe en logs/app.log y en la consola.
+
+Clases principales:
+- FiltroMuestreo: Muestreo y límite por segundo de los logs de cada ruta
+
+Funciones principales:
+- configurar_logging(): Instala la cola de logs y arranca el hilo que los escribe
+
+Características:
+- Los WARNING, ERROR y CRITICAL se conservan siempre
+- Los INFO/DEBUG de los routers (los que se emiten en cada solicitud) se
+  muestrean por mensaje y función: se conserva 1 de cada LOG_MUESTREO y, si
+  LOG_LIMITE_POR_SEGUNDO es mayor que 0, como mucho esa cantidad por segundo
+- Los logs descartados se cuentan en la métrica tareas_logs_descartados_total
+- El hilo de escritura se detiene al salir del proceso, vaciando la cola
+"""
+
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from constants import LOG_LIMITE_POR_SEGUNDO, LOG_MUESTREO, LOG_NIVEL
+
+from .MDmetricas import Contador, metricas
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Formato de cada línea de log
+FORMATO_LOG: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Loggers cuyos INFO/DEBUG se emiten por solicitud y se muestrean
+PREFIJOS_MUESTREO: tuple[str, ...] = ("routers.",)
+
+LOGS_DESCARTADOS: Contador = metricas.contador(
+    "tareas_logs_descartados_total",
+    "Logs INFO/DEBUG por solicitud descartados por el muestreo",
+    ("logger",),
+)
+
+# Hilo que escribe los logs, una vez configurados
+_oyente: QueueListener | None = None
+
+
+class FiltroMuestreo(logging.Filter):
+    """
+    Filtro que muestrea los logs por solicitud y conserva siempre los avisos.
+
+    Cada mensaje (logger, función y plantilla del mensaje) se cuenta por
+    separado, de modo que las líneas de una misma solicitud se conservan o se
+    descartan juntas mientras la ruta emita siempre las mismas.
+
+    Attributes:
+        muestreo (int): Se conserva 1 de cada `muestreo` registros.
+        limite_por_segundo (int): Máximo de registros conservados por mensaje y
+                                  segundo; 0 sin límite.
+        prefijos (tuple[str, ...]): Loggers sujetos al muestreo.
+
+    Ejemplo:
+        >>> manejador.addFilter(FiltroMuestreo(muestreo=10, limite_por_segundo=50))
+    """
+
+    def __init__(
+        self,
+        muestreo: int = 1,
+        limite_por_segundo: int = 0,
+        prefijos: tuple[str, ...] = PREFIJOS_MUESTREO,
+    ) -> None:
+        super().__init__()
+        self.muestreo: int = max(1, muestreo)
+        self.limite_por_segundo: int = limite_por_segundo
+        self.prefijos: tuple[str, ...] = prefijos
+        # Por mensaje: registros vistos, segundo actual y conservados en ese segundo
+        self._estado: dict[tuple[str, str, str], list[int]] = {}
+        self._cerrojo: threading.Lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not record.name.startswith(
+            self.prefijos
+        ):
+            return True
+        if self.muestreo == 1 and self.limite_por_segundo <= 0:
+            return True
+
+        clave: tuple[str, str, str] = (record.name, record.funcName, str(record.msg))
+        with self._cerrojo:
+            estado: list[int] | None = self._estado.get(clave)
+            if estado is None:
+                estado = self._estado[clave] = [0, 0, 0]
+            vistos: int = estado[0]
+            estado[0] += 1
+            conservar: bool = vistos % self.muestreo == 0
+            if conservar and self.limite_por_segundo > 0:
+                segundo: int = int(time.monotonic())
+                if estado[1] != segundo:
+                    estado[1] = segundo
+                    estado[2] = 0
+                conservar = estado[2] < self.limite_por_segundo
+                if conservar:
+                    estado[2] += 1
+
+        if not conservar:
+            LOGS_DESCARTADOS.incrementar(record.name)
+        return conservar
+
+
+# Función para configurar los logs de la aplicación
+def configurar_logging(
+    ruta_archivo: str,
+    nivel: str | int = LOG_NIVEL,
+    muestreo: int = LOG_MUESTREO,
+    limite_por_segundo: int = LOG_LIMITE_POR_SEGUNDO,
+) -> QueueListener:
+    """
+    Envía los logs a una cola y arranca el hilo que los escribe.
+
+    Args:
+        ruta_archivo (str): Archivo de logs (se agrega al final).
+        nivel (str | int): Nivel mínimo del logger raíz.
+        muestreo (int): Se conserva 1 de cada N logs por solicitud.
+        limite_por_segundo (int): Máximo de logs por solicitud por mensaje y
+                                  segundo; 0 sin límite.
+
+    Returns:
+        QueueListener: Hilo que escribe los logs. Si ya estaba configurado,
+                       retorna el existente sin volver a configurarlo.
+
+    Notas:
+        - El registro se formatea en el hilo que lo emite (QueueHandler) y se
+          escribe en el hilo del QueueListener
+        - La cola no tiene límite: emitir un log nunca espera
+    """
+    global _oyente
+    if _oyente is not None:
+        return _oyente
+
+    formato: logging.Formatter = logging.Formatter(FORMATO_LOG)
+    archivo: logging.FileHandler = logging.FileHandler(ruta_archivo)
+    consola: logging.StreamHandler = logging.StreamHandler()
+    archivo.setFormatter(formato)
+    consola.setFormatter(formato)
+
+    cola: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    manejador: QueueHandler = QueueHandler(cola)
+    manejador.addFilter(FiltroMuestreo(muestreo, limite_por_segundo))
+
+    raiz: logging.Logger = logging.getLogger()
+    raiz.setLevel(nivel)
+    raiz.addHandler(manejador)
+
+    _oyente = QueueListener(cola, archivo, consola, respect_handler_level=True)
+    _oyente.start()
+    atexit.register(_oyente.stop)
+    logger.debug(
+        "Logs en cola configurados: nivel %s, muestreo 1/%s, límite %s/s",
+        nivel,
+        muestreo,
+        limite_por_segundo,
+    )
+    return _oyente
@@ -0,0 +1,365 @@
+"""
+Módulo de métricas en formato Prometheus
+
+Este módulo registra contadores, histogramas e indicadores en memoria y los
+expone en el formato de texto de Prometheus (versión 0.0.4) para el endpoint
+/metrics. No depende de prometheus_client: las métricas de la API son pocas y
+el formato de exposición es simple.
+
+Clases principales:
+- Contador: Valor que solo aumenta, por combinación de etiquetas
+- Histograma: Distribución de observaciones en cubetas acumulativas
+- Indicador: Valor calculado en el momento de exponer (por ejemplo, conteos)
+- RegistroMetricas: Conjunto de métricas y su exposición en texto
+- MiddlewareMetricas: Middleware ASGI que mide cada solicitud HTTP
+
+Objetos principales:
+- metricas: Registro único de la aplicación
+- SOLICITUDES, DURACION_SOLICITUDES: Solicitudes por método, ruta y estado
+- LECTURA_ALMACENAMIENTO: Lectura, decodificación y validación de datos
+- ESCRITURA_ALMACENAMIENTO: Serialización y escritura de datos
+- BYTES_ESCRITOS: Tamaño de cada escritura en disco
+
+Características:
+- Etiqueta de ruta con la plantilla ("/tareas/{tarea_id}"), no la URL real,
+  para acotar la cantidad de series
+- Observaciones protegidas con un cerrojo por métrica (seguras entre hilos)
+- Costo por observación de unos pocos microsegundos
+"""
+
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Límites de las cubetas de duración, en segundos
+LIMITES_SEGUNDOS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Límites de las cubetas de tamaño, en bytes
+LIMITES_BYTES: tuple[float, ...] = tuple(float(4**n * 256) for n in range(11))
+
+# Etiqueta de ruta de las solicitudes que no coinciden con ninguna ruta
+RUTA_DESCONOCIDA: str = "sin_ruta"
+
+
+def _escapar(valor: str) -> str:
+    """
+    Escapa un valor de etiqueta según el formato de texto de Prometheus.
+    """
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(
+    nombres: tuple[str, ...], valores: tuple[str, ...], extra: str = ""
+) -> str:
+    """
+    Formatea un conjunto de etiquetas como {a="1",b="2"}.
+    """
+    partes: list[str] = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+def _numero(valor: float) -> str:
+    """
+    Formatea un número sin decimales innecesarios.
+    """
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+class Contador:
+    """
+    Contador monótono con etiquetas.
+
+    Attributes:
+        nombre (str): Nombre de la métrica.
+        ayuda (str): Descripción para la línea # HELP.
+        etiquetas (tuple[str, ...]): Nombres de las etiquetas.
+
+    Ejemplo:
+        >>> SOLICITUDES.incrementar("GET", "/tareas", "200")
+    """
+
+    tipo: str = "counter"
+
+    def __init__(
+        self, nombre: str, ayuda: str, etiquetas: tuple[str, ...] = ()
+    ) -> None:
+        self.nombre: str = nombre
+        self.ayuda: str = ayuda
+        self.etiquetas: tuple[str, ...] = etiquetas
+        self._valores: dict[tuple[str, ...], float] = {}
+        self._cerrojo: threading.Lock = threading.Lock()
+
+    def incrementar(self, *valores: str, cantidad: float = 1) -> None:
+        with self._cerrojo:
+            self._valores[valores] = self._valores.get(valores, 0) + cantidad
+
+    def exponer(self) -> list[str]:
+        with self._cerrojo:
+            valores: list[tuple[tuple[str, ...], float]] = sorted(self._valores.items())
+        return [
+            f"{self.nombre}{_etiquetas(self.etiquetas, clave)} {_numero(valor)}"
+            for clave, valor in valores
+        ]
+
+
+class Histograma:
+    """
+    Histograma con cubetas acumulativas, suma y cantidad por combinación de etiquetas.
+
+    Attributes:
+        nombre (str): Nombre de la métrica.
+        ayuda (str): Descripción para la línea # HELP.
+        etiquetas (tuple[str, ...]): Nombres de las etiquetas.
+        limites (tuple[float, ...]): Límites superiores de las cubetas, crecientes.
+
+    Ejemplo:
+        >>> DURACION_SOLICITUDES.observar(0.004, "GET", "/tareas", "200")
+    """
+
+    tipo: str = "histogram"
+
+    def __init__(
+        self,
+        nombre: str,
+        ayuda: str,
+        etiquetas: tuple[str, ...] = (),
+        limites: tuple[float, ...] = LIMITES_SEGUNDOS,
+    ) -> None:
+        self.nombre: str = nombre
+        self.ayuda: str = ayuda
+        self.etiquetas: tuple[str, ...] = etiquetas
+        self.limites: tuple[float, ...] = limites
+        # Por etiquetas: [cubetas no acumuladas (+Inf al final), suma]
+        self._series: dict[tuple[str, ...], list[Any]] = {}
+        self._cerrojo: threading.Lock = threading.Lock()
+
+    def observar(self, valor: float, *valores: str) -> None:
+        indice: int = bisect.bisect_left(self.limites, valor)
+        with self._cerrojo:
+            serie: list[Any] | None = self._series.get(valores)
+            if serie is None:
+                serie = self._series[valores] = [[0] * (len(self.limites) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def exponer(self) -> list[str]:
+        with self._cerrojo:
+            series: list[tuple[tuple[str, ...], list[int], float]] = [
+                (clave, list(cubetas), suma)
+                for clave, (cubetas, suma) in sorted(self._series.items())
+            ]
+        lineas: list[str] = []
+        for clave, cubetas, suma in series:
+            acumulado: int = 0
+            for limite, cantidad in zip(self.limites + (float("inf"),), cubetas):
+                acumulado += cantidad
+                le: str = "+Inf" if limite == float("inf") else _numero(limite)
+                cubeta: str = _etiquetas(self.etiquetas, clave, f'le="{le}"')
+                lineas.append(f"{self.nombre}_bucket{cubeta} {acumulado}")
+            etiquetas: str = _etiquetas(self.etiquetas, clave)
+            lineas.append(f"{self.nombre}_sum{etiquetas} {_numero(suma)}")
+            lineas.append(f"{self.nombre}_count{etiquetas} {acumulado}")
+        return lineas
+
+
+class Indicador:
+    """
+    Valor instantáneo calculado al exponer las métricas.
+
+    Attributes:
+        nombre (str): Nombre de la métrica.
+        ayuda (str): Descripción para la línea # HELP.
+        funcion (Callable[[], float]): Función que retorna el valor actual.
+    """
+
+    tipo: str = "gauge"
+
+    def __init__(self, nombre: str, ayuda: str, funcion: Callable[[], float]) -> None:
+        self.nombre: str = nombre
+        self.ayuda: str = ayuda
+        self.funcion: Callable[[], float] = funcion
+
+    def exponer(self) -> list[str]:
+        try:
+            return [f"{self.nombre} {_numero(self.funcion())}"]
+        except Exception as e:
+            logger.error("Error al calcular la métrica %s: %s", self.nombre, e)
+            return []
+
+
+Metrica = Contador | Histograma | Indicador
+
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas de la aplicación.
+
+    Ejemplo:
+        >>> metricas.indicador("tareas_activas", "Tareas activas", lambda: 3)
+        >>> print(metricas.exponer())
+    """
+
+    def __init__(self) -> None:
+        self._metricas: dict[str, Metrica] = {}
+
+    def registrar(self, metrica: Metrica) -> Metrica:
+        """
+        Agrega una métrica; si ya existe una con el mismo nombre, la reemplaza.
+        """
+        self._metricas[metrica.nombre] = metrica
+        return metrica
+
+    def contador(
+        self, nombre: str, ayuda: str, etiquetas: tuple[str, ...] = ()
+    ) -> Contador:
+        contador: Contador = Contador(nombre, ayuda, etiquetas)
+        self.registrar(contador)
+        return contador
+
+    def histograma(
+        self,
+        nombre: str,
+        ayuda: str,
+        etiquetas: tuple[str, ...] = (),
+        limites: tuple[float, ...] = LIMITES_SEGUNDOS,
+    ) -> Histograma:
+        histograma: Histograma = Histograma(nombre, ayuda, etiquetas, limites)
+        self.registrar(histograma)
+        return histograma
+
+    def indicador(
+        self, nombre: str, ayuda: str, funcion: Callable[[], float]
+    ) -> Indicador:
+        indicador: Indicador = Indicador(nombre, ayuda, funcion)
+        self.registrar(indicador)
+        return indicador
+
+    def exponer(self) -> str:
+        """
+        Genera el texto de exposición de todas las métricas.
+
+        Returns:
+            str: Métricas en formato de texto de Prometheus 0.0.4.
+        """
+        lineas: list[str] = []
+        for metrica in self._metricas.values():
+            lineas.append(f"# HELP {metrica.nombre} {metrica.ayuda}")
+            lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
+
+
+# Registro único de la aplicación
+metricas: RegistroMetricas = RegistroMetricas()
+
+SOLICITUDES: Contador = metricas.contador(
+    "tareas_http_solicitudes_total",
+    "Solicitudes HTTP atendidas por método, ruta y estado",
+    ("metodo", "ruta", "estado"),
+)
+DURACION_SOLICITUDES: Histograma = metricas.histograma(
+    "tareas_http_duracion_segundos",
+    "Duración de las solicitudes HTTP hasta enviar la respuesta completa",
+    ("metodo", "ruta", "estado"),
+)
+LECTURA_ALMACENAMIENTO: Histograma = metricas.histograma(
+    "tareas_almacenamiento_lectura_segundos",
+    "Lectura de datos persistidos por origen y fase (leer, decodificar, validar)",
+    ("origen", "fase"),
+)
+ESCRITURA_ALMACENAMIENTO: Histograma = metricas.histograma(
+    "tareas_almacenamiento_escritura_segundos",
+    "Escritura de datos persistidos por destino y fase (serializar, escribir, confirmar)",
+    ("destino", "fase"),
+)
+BYTES_ESCRITOS: Histograma = metricas.histograma(
+    "tareas_almacenamiento_bytes_escritos",
+    "Bytes escritos en disco por escritura y destino",
+    ("destino",),
+    LIMITES_BYTES,
+)
+
+
+# Función para medir la duración de un bloque en un histograma
+@contextmanager
+def cronometrar(histograma: Histograma, *valores: str) -> Iterator[None]:
+    """
+    Observa en el histograma la duración del bloque, aunque lance una excepción.
+
+    Args:
+        histograma (Histograma): Histograma de duraciones en segundos.
+        *valores (str): Valores de las etiquetas del histograma.
+
+    Ejemplo:
+        >>> with cronometrar(LECTURA_ALMACENAMIENTO, "tareas", "leer"):
+        ...     contenido = archivo.read()
+    """
+    inicio: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        histograma.observar(time.perf_counter() - inicio, *valores)
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI que cuenta y mide cada solicitud HTTP.
+
+    La duración va desde que llega la solicitud hasta que se envía el último
+    fragmento del cuerpo, de modo que incluye las respuestas transmitidas. La
+    ruta es la plantilla de la ruta que atendió la solicitud.
+
+    Ejemplo:
+        >>> app.add_middleware(MiddlewareMetricas)
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app: Callable[..., Awaitable[None]] = app
+
+    async def __call__(
+        self,
+        scope: dict[str, Any],
+        receive: Callable[[], Awaitable[dict[str, Any]]],
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio: float = time.perf_counter()
+        estado: int = 500
+        observada: bool = False
+
+        def observar() -> None:
+            nonlocal observada
+            if observada:
+                return
+            observada = True
+            ruta: str = getattr(scope.get("route"), "path", RUTA_DESCONOCIDA)
+            etiquetas: tuple[str, str, str] = (scope["method"], ruta, str(estado))
+            SOLICITUDES.incrementar(*etiquetas)
+            DURACION_SOLICITUDES.observar(time.perf_counter() - inicio, *etiquetas)
+
+        async def enviar(mensaje: dict[str, Any]) -> None:
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+            if mensaje["type"] == "http.response.body" and not mensaje.get("more_body"):
+                observar()
+
+        try:
+            await self.app(scope, receive, enviar)
+        except Exception:
+            observar()
+            raise
@@ -0,0 +1,117 @@
+"""
+Módulo de migración de los archivos JSON a SQLite
+
+Este módulo copia una sola vez el estado guardado en data/ (instantáneas JSON,
+diario pendiente y contador de IDs) a la base de datos SQLite, para cambiar de
+almacenamiento sin perder tareas ni reutilizar IDs.
+
+Funciones principales:
+- migrar_json_a_sqlite(): Copia el estado de los archivos JSON a SQLite
+
+Uso:
+    python -m utils.MDmigracion [--destino RUTA] [--forzar]
+
+    Después, arrancar la API con TAREAS_ALMACENAMIENTO=sqlite.
+
+Características:
+- Aplica el diario pendiente antes de copiar, igual que al arrancar la API
+- Abre los archivos JSON de origen en solo lectura: no los modifica, no
+  recorta el diario ni crea el archivo de bloqueo (ejecutar con la API detenida)
+- El contador de IDs de SQLite (AUTOINCREMENT) parte del mayor entre el
+  contador JSON y el mayor ID existente
+- Se niega a sobrescribir una base de datos existente salvo con --forzar
+- Todo se escribe en una sola transacción
+"""
+
+import os
+import logging
+import argparse
+
+from constants import (
+    DATA_JSON,
+    DELETED_JSON,
+    DIR_ELIMINADAS,
+    ID_COUNTER_JSON,
+    JOURNAL_JSONL,
+    SQLITE_DB,
+)
+
+from .MDalmacenamiento import AlmacenamientoJSON
+from .MDrepositorio import RepositorioTareas
+from .MDsqlite import AlmacenamientoSQLite
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+# Función para migrar el estado de los archivos JSON a SQLite
+def migrar_json_a_sqlite(destino: str = SQLITE_DB, forzar: bool = False) -> tuple[int, int]:
+    """
+    Copia las tareas activas, las eliminadas y el contador de IDs a SQLite.
+
+    Args:
+        destino (str): Archivo de la base de datos a crear.
+        forzar (bool): Reemplazar el contenido si la base de datos ya existe.
+
+    Returns:
+        tuple[int, int]: Cantidad de tareas activas y eliminadas migradas.
+
+    Raises:
+        FileExistsError: Si la base de datos ya existe y forzar es False.
+
+    Ejemplo:
+        >>> migrar_json_a_sqlite()
+        (6, 2)
+    """
+    if os.path.exists(destino) and not forzar:
+        raise FileExistsError(
+            f"La base de datos {destino} ya existe; use --forzar para reemplazarla"
+        )
+
+    origen: AlmacenamientoJSON = AlmacenamientoJSON(
+        DATA_JSON,
+        DIR_ELIMINADAS,
+        JOURNAL_JSONL,
+        ID_COUNTER_JSON,
+        ruta_eliminadas_legado=DELETED_JSON,
+        solo_lectura=True,
+    )
+    repositorio_origen: RepositorioTareas = RepositorioTareas(origen)
+    repositorio_origen.cargar()
+    ultimo_id: int = max(origen.leer_contador(), repositorio_origen.max_id())
+
+    sqlite: AlmacenamientoSQLite = AlmacenamientoSQLite(destino)
+    try:
+        sqlite.iniciar_lote()
+        sqlite.guardar_todo(repositorio_origen.tareas(), repositorio_origen.eliminadas())
+        sqlite.guardar_contador(ultimo_id)
+        sqlite.confirmar_lote()
+    finally:
+        sqlite.cerrar()
+        # Solo cerrar el origen: compactarlo escribiría en los archivos JSON
+        origen.cerrar()
+
+    activas: int = len(repositorio_origen.tareas())
+    eliminadas: int = len(repositorio_origen.eliminadas())
+    logger.info(
+        "Migración completada: %s tareas activas, %s eliminadas, último ID %s",
+        activas,
+        eliminadas,
+        ultimo_id,
+    )
+    return activas, eliminadas
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Migra las tareas de los archivos JSON de data/ a SQLite"
+    )
+    parser.add_argument("--destino", default=SQLITE_DB, help="Archivo SQLite a crear")
+    parser.add_argument(
+        "--forzar", action="store_true", help="Reemplazar una base de datos existente"
+    )
+    argumentos: argparse.Namespace = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    total_activas, total_eliminadas = migrar_json_a_sqlite(
+        argumentos.destino, argumentos.forzar
+    )
+    print(f"Migradas {total_activas} tareas activas y {total_eliminadas} eliminadas")
@@ -1,49 +1,153 @@
 """
 Módulo para generar IDs únicos para nuevas tareas
 
-Este módulo proporciona funciones para calcular el próximo ID disponible
-usando un contador persistente para evitar colisiones y asegurar unicidad.
+Este módulo proporciona un asignador de IDs que reserva bloques de IDs en un
+contador persistente y los entrega desde memoria, evitando leer y reescribir
+el contador en cada creación de tarea.
+
+Clases principales:
+- AsignadorIds: Asignador de IDs por bloques reservados
 
 Funciones principales:
 - obtener_proximo_id(): Calcula y retorna el siguiente ID disponible
 
 Características:
-- Contador persistente en archivo JSON
-- Thread-safe para operaciones concurrentes
-- Manejo automático de archivos inexistentes
+- Contador persistente del almacenamiento (contador_id.json o la secuencia
+  AUTOINCREMENT de SQLite), actualizado una vez por bloque
+- Entrega de IDs protegida con un cerrojo (seguro entre hilos)
+- Reserva de bloques con el bloqueo exclusivo del almacenamiento: varios
+  workers obtienen bloques disjuntos del mismo contador
+- Recuperación tras caídas a partir del mayor ID almacenado
 - Logging detallado de operaciones
 """
 
-import json
 import logging
+import threading
 
 # import sys
 # import os
 
 # sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
-from constants import ID_COUNTER_JSON
+from constants import ID_BLOCK_SIZE
+
+from .MDrepositorio import RepositorioTareas, repositorio
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+class AsignadorIds:
+    """
+    Asignador de IDs que reserva bloques en el contador persistente.
+
+    El contador del almacenamiento guarda el mayor ID reservado (no
+    necesariamente usado). Cuando se agota el bloque en memoria se reserva uno
+    nuevo actualizando el contador. Tras una caída, los IDs del bloque que no
+    llegaron a usarse simplemente se saltan: los IDs nunca se reutilizan.
+
+    Al iniciar, el punto de partida es el mayor entre el contador persistente y
+    el mayor ID presente en el repositorio (activas y eliminadas), de modo que
+    un contador perdido o dañado tampoco provoca IDs duplicados.
+
+    Con varios procesos, cada reserva vuelve a leer el contador bajo el
+    bloqueo exclusivo: si otro proceso reservó después del bloque propio, el
+    nuevo bloque empieza tras el suyo.
+
+    Attributes:
+        repositorio (RepositorioTareas): Repositorio cuyo almacenamiento guarda
+                                         el contador.
+        tamano_bloque (int): Cantidad de IDs reservados por escritura.
+
+    Ejemplo:
+        >>> asignador = AsignadorIds(repositorio)
+        >>> asignador.siguiente()
+        13
+        >>> asignador.reservar(3)
+        [14, 15, 16]
+    """
+
+    def __init__(
+        self, repo: RepositorioTareas, tamano_bloque: int = ID_BLOCK_SIZE
+    ) -> None:
+        self.repositorio: RepositorioTareas = repo
+        self.tamano_bloque: int = tamano_bloque
+        self._cerrojo: threading.Lock = threading.Lock()
+        self._siguiente: int = 0
+        self._limite: int = 0
+        self._iniciado: bool = False
+
+    def _iniciar(self) -> None:
+        """
+        Calcula el punto de partida a partir del contador y del repositorio.
+        """
+        base: int = max(self.repositorio.leer_contador(), self.repositorio.max_id())
+        self._siguiente = base + 1
+        self._limite = base
+        self._iniciado = True
+        logger.debug("Asignador de IDs iniciado en %s", self._siguiente)
+
+    def _reservar_bloque(self, minimo: int) -> None:
+        """
+        Amplía el límite reservado para cubrir al menos 'minimo' IDs más.
+        """
+        with self.repositorio.bloqueo_escritura():
+            persistido: int = self.repositorio.leer_contador()
+            if persistido > self._limite:
+                # Otro proceso reservó IDs después de este bloque
+                self._siguiente = persistido + 1
+            nuevo_limite: int = self._siguiente - 1 + max(minimo, self.tamano_bloque)
+            self.repositorio.guardar_contador(nuevo_limite)
+        self._limite = nuevo_limite
+        logger.debug("Reservados IDs hasta %s", nuevo_limite)
+
+    def reservar(self, cantidad: int) -> list[int]:
+        """
+        Entrega 'cantidad' IDs consecutivos nuevos.
+
+        Args:
+            cantidad (int): Número de IDs a entregar.
+
+        Returns:
+            list[int]: IDs asignados en orden ascendente.
+        """
+        with self._cerrojo:
+            if not self._iniciado:
+                self._iniciar()
+            if self._siguiente + cantidad - 1 > self._limite:
+                self._reservar_bloque(cantidad)
+            ids: list[int] = list(range(self._siguiente, self._siguiente + cantidad))
+            self._siguiente += cantidad
+            return ids
+
+    def siguiente(self) -> int:
+        """
+        Entrega el siguiente ID disponible.
+        """
+        return self.reservar(1)[0]
+
+
+# Instancia única compartida por los routers
+asignador_ids: AsignadorIds = AsignadorIds(repositorio)
+
+
 # Función para obtener el próximo ID
 def obtener_proximo_id() -> int:
     """
     Calcula el próximo ID disponible para una nueva tarea usando contador persistente.
 
-    Esta función lee el contador actual desde un archivo JSON, incrementa el valor
-    y lo guarda de vuelta. Esto asegura que los IDs sean únicos incluso después
-    de reinicios del servidor o eliminaciones permanentes.
+    Esta función entrega IDs desde el bloque reservado en memoria por el
+    asignador; solo cuando el bloque se agota se actualiza el contador persistente.
+    Esto asegura que los IDs sean únicos incluso después de reinicios del
+    servidor, caídas o eliminaciones permanentes.
 
     Returns:
         int: El próximo ID disponible para asignar a una nueva tarea.
 
     Notas:
         - Los IDs nunca se reutilizan, manteniendo integridad histórica
-        - El contador se inicializa en 0 si el archivo no existe
-        - Thread-safe para operaciones concurrentes básicas
-        - Maneja errores de archivo automáticamente
+        - El contador se inicializa en 0 si todavía no existe
+        - Thread-safe: la entrega de IDs está protegida por un cerrojo
+        - Tras una caída pueden saltarse IDs del último bloque reservado
 
     Ejemplo:
         >>> id_nuevo = obtener_proximo_id()
@@ -52,22 +156,7 @@ def obtener_proximo_id() -> int:
         >>> print(id_otro)   # 2 (segunda llamada)
     """
     logger.debug("Obteniendo próximo ID disponible")
-
-    try:
-        with open(ID_COUNTER_JSON, "r", encoding="utf-8") as file:
-            contador: dict[str, int] = json.load(file)
-            ultimo_id: int = contador.get("ultimo_id", 0)
-    except (FileNotFoundError, json.JSONDecodeError):
-        logger.warning("Archivo de contador no encontrado, inicializando en 0")
-        ultimo_id = 0
-
-    proximo_id: int = ultimo_id + 1
-
-    # Actualizar el contador persistente
-    nuevo_contador: dict[str, int] = {"ultimo_id": proximo_id}
-    with open(ID_COUNTER_JSON, "w", encoding="utf-8") as file:
-        json.dump(nuevo_contador, file, indent=2, ensure_ascii=False)
-
+    proximo_id: int = asignador_ids.siguiente()
     logger.debug("Próximo ID calculado: %s", proximo_id)
     return proximo_id
 
@@ -0,0 +1,121 @@
+"""
+Módulo de registros compactos de tareas
+
+Este módulo define la representación en memoria de las tareas que guarda el
+repositorio. En lugar de un diccionario por tarea (una tabla hash con sus
+claves, del orden de 180 bytes antes de contar los textos) cada tarea es un
+objeto con __slots__: solo una referencia por campo, unos 64 bytes. Con
+millones de tareas residentes la diferencia es de cientos de megabytes.
+
+Clases principales:
+- RegistroTarea: Tarea activa (id, titulo, descripcion, completada)
+- RegistroEliminada: Tarea del historial, con su fecha de eliminación
+
+Características:
+- Dataclasses con slots=True: sin __dict__ por instancia
+- Serializables directamente: MDjson convierte cada registro con a_dict()
+  mientras codifica, sin construir antes la lista completa de diccionarios
+- Conversión explícita desde y hacia diccionarios en los bordes: al cargar
+  archivos o aplicar el diario, y al entregar tareas a código que espera dict
+- Los registros guardados en el repositorio no se modifican en el lugar: cada
+  cambio crea un registro nuevo
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(slots=True)
+class RegistroTarea:
+    """
+    Tarea activa guardada en memoria.
+
+    Attributes:
+        id (int): Identificador único de la tarea.
+        titulo (str): Título de la tarea.
+        descripcion (str): Descripción de la tarea.
+        completada (bool): Estado de la tarea.
+
+    Ejemplo:
+        >>> registro = RegistroTarea.desde_dict({"id": 1, "titulo": "A", "descripcion": "B"})
+        >>> registro.a_dict()
+        {'id': 1, 'titulo': 'A', 'descripcion': 'B', 'completada': False}
+    """
+
+    id: int
+    titulo: str
+    descripcion: str
+    completada: bool = False
+
+    @classmethod
+    def desde_dict(cls, datos: dict[str, Any]) -> "RegistroTarea":
+        """
+        Crea un registro a partir de una tarea en forma de diccionario.
+
+        Args:
+            datos (dict[str, Any]): Tarea con al menos 'id', 'titulo' y
+                                    'descripcion'. Otras claves se ignoran.
+
+        Returns:
+            RegistroTarea: Registro equivalente.
+        """
+        return cls(
+            datos["id"],
+            datos["titulo"],
+            datos["descripcion"],
+            bool(datos.get("completada", False)),
+        )
+
+    def a_dict(self) -> dict[str, Any]:
+        """
+        Convierte el registro en un diccionario nuevo, que puede modificarse.
+        """
+        return {
+            "id": self.id,
+            "titulo": self.titulo,
+            "descripcion": self.descripcion,
+            "completada": self.completada,
+        }
+
+
+@dataclass(slots=True)
+class RegistroEliminada(RegistroTarea):
+    """
+    Tarea del historial de eliminadas guardada en memoria.
+
+    Attributes:
+        fecha_eliminacion (Optional[str]): Fecha y hora de eliminación (ISO 8601).
+    """
+
+    fecha_eliminacion: Optional[str] = None
+
+    @classmethod
+    def desde_dict(cls, datos: dict[str, Any]) -> "RegistroEliminada":
+        """
+        Crea un registro a partir de una tarea eliminada en forma de diccionario.
+
+        Args:
+            datos (dict[str, Any]): Tarea eliminada, incluida su 'fecha_eliminacion'.
+
+        Returns:
+            RegistroEliminada: Registro equivalente.
+        """
+        return cls(
+            datos["id"],
+            datos["titulo"],
+            datos["descripcion"],
+            bool(datos.get("completada", False)),
+            datos.get("fecha_eliminacion"),
+        )
+
+    def a_dict(self) -> dict[str, Any]:
+        """
+        Convierte el registro en un diccionario nuevo, que puede modificarse.
+        """
+        return {
+            "id": self.id,
+            "titulo": self.titulo,
+            "descripcion": self.descripcion,
+            "completada": self.completada,
+            "fecha_eliminacion": self.fecha_eliminacion,
+        }
@@ -0,0 +1,1234 @@
+"""
+Módulo del repositorio de tareas en memoria
+
+Este módulo mantiene en memoria las tareas activas y eliminadas durante toda
+la vida del proceso, de modo que las solicitudes de lectura no tengan que
+consultar el almacenamiento en cada petición. Las modificaciones se aplican
+en memoria y se persisten a través de un almacenamiento intercambiable
+(instantáneas JSON con diario de escritura anticipada, o SQLite).
+
+Clases principales:
+- ColeccionIndexada: Conjunto de registros de tareas indexado por ID con orden mantenido
+- RepositorioTareas: Caché residente de tareas activas y eliminadas
+
+Objetos principales:
+- repositorio: Instancia única compartida por toda la aplicación
+
+Características:
+- Carga única del almacenamiento al iniciar la aplicación
+- Tareas guardadas como registros compactos con __slots__ (ver MDregistro); se
+  reciben como diccionarios y se entregan como registros de solo lectura
+- Recarga automática solo cuando otro proceso modifica el almacenamiento
+- Índice por ID (O(1)) y lista ordenada de IDs mantenida con bisect (O(log n))
+- Índices secundarios por estado (completada) y por título para filtrar y ordenar
+- Índice invertido de texto, construido al cargar y mantenido en cada modificación
+- Versión tomada del almacenamiento compartido (época y posición del diario, o
+  contador de cambios de SQLite), igual en todos los workers, y fecha de
+  última modificación por conjunto, para ETag y Last-Modified
+- Registro acotado de los IDs modificados en cada generación, para que los
+  clientes pidan solo los cambios desde su versión (GET /tareas/cambios)
+- Escritura proporcional al cambio: cada operación es un registro del diario
+- Movimientos atómicos entre activas y eliminadas: eliminar y restaurar son un
+  único registro que afecta a ambos conjuntos, nunca dos escrituras separadas
+- Almacenamiento elegido por configuración (ver MDalmacenamiento)
+- Acceso protegido con un cerrojo reentrante y, entre procesos (varios
+  workers), con el bloqueo del almacenamiento: compartido para leer los
+  cambios ajenos y exclusivo desde esa lectura hasta persistir cada escritura
+"""
+
+import time
+import uuid
+import bisect
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterator
+
+from constants import CAMBIOS_MAXIMOS, JOURNAL_COMPACT_EVERY
+
+from .MDbusqueda import IndiceBusqueda
+from .MDregistro import RegistroEliminada, RegistroTarea
+from .MDalmacenamiento import OP_COMPACTADO, Almacenamiento, crear_almacenamiento
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+def _clave_titulo(tarea: RegistroTarea) -> tuple[str, int]:
+    """
+    Clave de orden por título (sin distinguir mayúsculas), desempatada por ID.
+    """
+    titulo: str = tarea.titulo
+    clave: str = titulo.casefold()
+    # Si el título ya está en minúsculas se comparte el mismo texto en memoria
+    return (titulo if clave == titulo else clave), tarea.id
+
+
+class ColeccionIndexada:
+    """
+    Conjunto de tareas indexado por ID que conserva el orden ascendente por ID.
+
+    Las tareas se reciben como diccionarios y se guardan como registros
+    compactos del tipo indicado (RegistroTarea o RegistroEliminada); las
+    lecturas retornan esos registros, que no deben modificarse.
+
+    Mantiene un diccionario id -> registro para accesos puntuales en O(1) y una
+    lista ordenada de IDs, actualizada con bisect, para inserciones y
+    eliminaciones en O(log n) de búsqueda. El listado ordenado se construye
+    bajo demanda y se conserva hasta la siguiente modificación.
+
+    Además mantiene dos índices secundarios actualizados en cada modificación:
+    una lista ordenada de IDs por estado (completada True/False), de modo que
+    filtrar por estado no recorre las tareas del otro estado, y una lista
+    ordenada de claves (título, id) para ordenar por título sin reordenar.
+    Si la colección es buscable, también mantiene el índice de búsqueda de
+    texto: se construye al cargar, de modo que ninguna búsqueda paga su
+    construcción, y después se actualiza en cada modificación.
+
+    Cada modificación incrementa la generación de la colección y registra su
+    instante, de modo que se puede saber si cambió sin comparar su contenido.
+    Las últimas cambios_maximos modificaciones se recuerdan como pares
+    (generación, ID) para saber qué tareas cambiaron desde una generación.
+
+    Attributes:
+        tipo (type[RegistroTarea]): Clase de los registros guardados.
+        buscable (bool): Si mantiene el índice de búsqueda de texto.
+        generacion (int): Contador de modificaciones; nunca retrocede.
+        modificado (float): Instante (epoch) de la última modificación.
+        cambios_maximos (int): Modificaciones recordadas por cambios_desde().
+
+    Ejemplo:
+        >>> coleccion = ColeccionIndexada()
+        >>> coleccion.insertar({"id": 3, "titulo": "C", "descripcion": "c"})
+        >>> coleccion.insertar({"id": 1, "titulo": "A", "descripcion": "a"})
+        >>> [t.id for t in coleccion.listar()]
+        [1, 3]
+    """
+
+    def __init__(
+        self,
+        tipo: type[RegistroTarea] = RegistroTarea,
+        cambios_maximos: int = CAMBIOS_MAXIMOS,
+        buscable: bool = False,
+    ) -> None:
+        self.tipo: type[RegistroTarea] = tipo
+        self.cambios_maximos: int = cambios_maximos
+        self.buscable: bool = buscable
+        self._por_id: dict[int, RegistroTarea] = {}
+        self._ids: list[int] = []
+        self._ids_por_estado: dict[bool, list[int]] = {False: [], True: []}
+        self._titulos: list[tuple[str, int]] = []
+        self._busqueda: IndiceBusqueda | None = IndiceBusqueda() if buscable else None
+        self._lista: list[RegistroTarea] | None = None
+        self.generacion: int = 0
+        self.modificado: float = time.time()
+        # IDs modificados por generación; completo a partir de _cambios_base
+        self._cambios: deque[tuple[int, int]] = deque()
+        self._cambios_base: int = 0
+
+    def __len__(self) -> int:
+        return len(self._por_id)
+
+    def cargar(self, datos: list[dict[str, Any]]) -> None:
+        """
+        Reconstruye el índice completo a partir de una lista de tareas.
+
+        Args:
+            datos (list[dict[str, Any]]): Tareas en cualquier orden. Si hay IDs
+                                          repetidos prevalece la última aparición.
+        """
+        crear: Callable[[dict[str, Any]], RegistroTarea] = self.tipo.desde_dict
+        self._por_id = {tarea["id"]: crear(tarea) for tarea in datos}
+        self._ids = sorted(self._por_id)
+        self._ids_por_estado = {False: [], True: []}
+        for tarea_id in self._ids:
+            self._ids_por_estado[self._por_id[tarea_id].completada].append(tarea_id)
+        self._titulos = sorted(_clave_titulo(tarea) for tarea in self._por_id.values())
+        if self._busqueda is not None:
+            self._busqueda.cargar(self._por_id.values())
+        self._modificar()
+
+    def _modificar(self, tarea_id: int | None = None) -> None:
+        """
+        Invalida el listado en caché, avanza la generación y anota el cambio.
+
+        Args:
+            tarea_id (int | None): Tarea modificada; None si cambió toda la
+                                   colección (entonces se olvidan los cambios
+                                   anteriores).
+        """
+        self._lista = None
+        self.generacion += 1
+        self.modificado = time.time()
+        if tarea_id is None:
+            self._cambios.clear()
+            self._cambios_base = self.generacion
+            return
+        self._cambios.append((self.generacion, tarea_id))
+        if len(self._cambios) > self.cambios_maximos:
+            self._cambios_base = self._cambios.popleft()[0]
+
+    @staticmethod
+    def _insertar_id(ids: list[int], tarea_id: int) -> None:
+        """
+        Inserta un ID en una lista ordenada (al final en el caso habitual).
+        """
+        if not ids or ids[-1] < tarea_id:
+            ids.append(tarea_id)
+        else:
+            bisect.insort(ids, tarea_id)
+
+    @staticmethod
+    def _quitar_id(ids: list[int], tarea_id: int) -> None:
+        """
+        Quita un ID presente de una lista ordenada.
+        """
+        del ids[bisect.bisect_left(ids, tarea_id)]
+
+    def _desindexar(self, tarea: RegistroTarea) -> None:
+        """
+        Quita una tarea de los índices secundarios.
+        """
+        self._quitar_id(self._ids_por_estado[tarea.completada], tarea.id)
+        clave: tuple[str, int] = _clave_titulo(tarea)
+        del self._titulos[bisect.bisect_left(self._titulos, clave)]
+        if self._busqueda is not None:
+            self._busqueda.quitar(tarea.id)
+
+    def _indexar(self, tarea: RegistroTarea) -> None:
+        """
+        Agrega una tarea a los índices secundarios.
+        """
+        self._insertar_id(self._ids_por_estado[tarea.completada], tarea.id)
+        bisect.insort(self._titulos, _clave_titulo(tarea))
+        if self._busqueda is not None:
+            self._busqueda.agregar(tarea)
+
+    def obtener(self, tarea_id: int) -> RegistroTarea | None:
+        """
+        Retorna la tarea con el ID indicado o None si no existe.
+        """
+        return self._por_id.get(tarea_id)
+
+    def insertar(self, tarea: dict[str, Any]) -> RegistroTarea:
+        """
+        Inserta o reemplaza una tarea manteniendo el orden por ID.
+
+        Args:
+            tarea (dict[str, Any]): Tarea a guardar; debe incluir el campo 'id'.
+
+        Returns:
+            RegistroTarea: El registro guardado.
+        """
+        registro: RegistroTarea = self.tipo.desde_dict(tarea)
+        tarea_id: int = registro.id
+        anterior: RegistroTarea | None = self._por_id.get(tarea_id)
+        if anterior is None:
+            # Caso habitual: los IDs nuevos son los mayores y se agregan al final
+            self._insertar_id(self._ids, tarea_id)
+        else:
+            self._desindexar(anterior)
+        self._indexar(registro)
+        self._por_id[tarea_id] = registro
+        self._modificar(tarea_id)
+        return registro
+
+    def quitar(self, tarea_id: int) -> RegistroTarea | None:
+        """
+        Quita la tarea con el ID indicado.
+
+        Returns:
+            RegistroTarea | None: La tarea quitada o None si no existía.
+        """
+        tarea: RegistroTarea | None = self._por_id.pop(tarea_id, None)
+        if tarea is not None:
+            self._quitar_id(self._ids, tarea_id)
+            self._desindexar(tarea)
+            self._modificar(tarea_id)
+        return tarea
+
+    def anotar(self, tarea_id: int) -> None:
+        """
+        Anota una tarea ausente como cambiada, para que cambios_desde() la
+        informe como quitada a quien pudo haberla visto.
+        """
+        self._modificar(tarea_id)
+
+    def cambios_desde(
+        self, generacion: int
+    ) -> tuple[list[RegistroTarea], list[int]] | None:
+        """
+        Obtiene las tareas que cambiaron después de una generación.
+
+        Args:
+            generacion (int): Generación que tiene el cliente.
+
+        Returns:
+            tuple[list[RegistroTarea], list[int]] | None: Tareas presentes que
+                se insertaron o modificaron (ordenadas por ID) e IDs de las que
+                se quitaron, o None si la generación ya no está en el registro
+                (o es posterior a la actual) y hace falta el listado completo.
+
+        Notas:
+            - Recorre solo los cambios posteriores a la generación pedida
+            - Cada tarea aparece una vez, con su estado actual, aunque haya
+              cambiado varias veces
+        """
+        if generacion < self._cambios_base or generacion > self.generacion:
+            return None
+        ids: set[int] = set()
+        for generacion_cambio, tarea_id in reversed(self._cambios):
+            if generacion_cambio <= generacion:
+                break
+            ids.add(tarea_id)
+        presentes: list[RegistroTarea] = []
+        quitadas: list[int] = []
+        for tarea_id in sorted(ids):
+            tarea: RegistroTarea | None = self._por_id.get(tarea_id)
+            if tarea is None:
+                quitadas.append(tarea_id)
+            else:
+                presentes.append(tarea)
+        return presentes, quitadas
+
+    def listar(self) -> list[RegistroTarea]:
+        """
+        Retorna las tareas ordenadas por ID ascendente.
+
+        Returns:
+            list[RegistroTarea]: Lista compartida entre llamadas mientras no haya
+                                 modificaciones. No debe modificarse.
+        """
+        if self._lista is None:
+            por_id: dict[int, RegistroTarea] = self._por_id
+            self._lista = [por_id[tarea_id] for tarea_id in self._ids]
+        return self._lista
+
+    def consultar(
+        self,
+        completada: bool | None = None,
+        id_desde: int | None = None,
+        id_hasta: int | None = None,
+        orden: str = "id",
+        descendente: bool = False,
+        despues_de_id: int = 0,
+        limite: int | None = None,
+    ) -> tuple[list[RegistroTarea], int | None]:
+        """
+        Retorna una página de tareas filtradas y ordenadas, paginada por cursor.
+
+        Con orden por ID se parte de la lista ordenada del estado pedido (o de
+        todas) y el rango de IDs y el cursor se ubican con búsqueda binaria, por
+        lo que el costo es O(log n + tamaño de página) y las tareas del otro
+        estado no se recorren. Con orden por título se recorre el índice de
+        títulos desde el cursor descartando las que no cumplen los filtros.
+
+        Args:
+            completada (bool | None): Filtrar por estado; None para ambos.
+            id_desde (int | None): ID mínimo (inclusive).
+            id_hasta (int | None): ID máximo (inclusive).
+            orden (str): Campo de orden: "id" o "titulo".
+            descendente (bool): Invertir el orden.
+            despues_de_id (int): Cursor: ID de la última tarea de la página
+                                 anterior; 0 para empezar desde el principio.
+            limite (int | None): Máximo de tareas a retornar; None para todas.
+
+        Returns:
+            tuple[list[RegistroTarea], int | None]: Tareas de la página y cursor
+                                                    para la siguiente (None si
+                                                    no quedan más).
+
+        Raises:
+            ValueError: Si el orden es desconocido o, al ordenar por título, el
+                        cursor no corresponde a una tarea de la colección.
+        """
+        por_id: dict[int, RegistroTarea] = self._por_id
+        if orden == "titulo":
+            return self._consultar_por_titulo(
+                completada, id_desde, id_hasta, descendente, despues_de_id, limite
+            )
+        if orden != "id":
+            raise ValueError(f"Orden desconocido: {orden}")
+
+        ids: list[int] = (
+            self._ids if completada is None else self._ids_por_estado[completada]
+        )
+        inicio: int = 0 if id_desde is None else bisect.bisect_left(ids, id_desde)
+        fin: int = len(ids) if id_hasta is None else bisect.bisect_right(ids, id_hasta)
+        if descendente:
+            if despues_de_id:
+                fin = min(fin, bisect.bisect_left(ids, despues_de_id))
+            corte: int = inicio if limite is None else max(inicio, fin - limite)
+            seleccion: list[int] = ids[corte:fin][::-1]
+            quedan: bool = corte > inicio
+        else:
+            if despues_de_id:
+                inicio = max(inicio, bisect.bisect_right(ids, despues_de_id))
+            corte = fin if limite is None else min(fin, inicio + limite)
+            seleccion = ids[inicio:corte]
+            quedan = corte < fin
+        siguiente: int | None = seleccion[-1] if seleccion and quedan else None
+        return [por_id[tarea_id] for tarea_id in seleccion], siguiente
+
+    def _consultar_por_titulo(
+        self,
+        completada: bool | None,
+        id_desde: int | None,
+        id_hasta: int | None,
+        descendente: bool,
+        despues_de_id: int,
+        limite: int | None,
+    ) -> tuple[list[RegistroTarea], int | None]:
+        """
+        Recorre el índice de títulos desde el cursor aplicando los filtros.
+        """
+        por_id: dict[int, RegistroTarea] = self._por_id
+        titulos: list[tuple[str, int]] = self._titulos
+        if despues_de_id:
+            cursor: RegistroTarea | None = por_id.get(despues_de_id)
+            if cursor is None:
+                raise ValueError(f"Cursor no válido: {despues_de_id}")
+            clave: tuple[str, int] = _clave_titulo(cursor)
+            posicion: int = (
+                bisect.bisect_left(titulos, clave)
+                if descendente
+                else bisect.bisect_right(titulos, clave)
+            )
+        else:
+            posicion = len(titulos) if descendente else 0
+        indices: range = (
+            range(posicion - 1, -1, -1) if descendente else range(posicion, len(titulos))
+        )
+
+        resultado: list[RegistroTarea] = []
+        for indice in indices:
+            tarea_id: int = titulos[indice][1]
+            if id_desde is not None and tarea_id < id_desde:
+                continue
+            if id_hasta is not None and tarea_id > id_hasta:
+                continue
+            tarea: RegistroTarea = por_id[tarea_id]
+            if completada is not None and tarea.completada != completada:
+                continue
+            if limite is not None and len(resultado) == limite:
+                # Hay al menos una tarea más: la página está completa
+                return resultado, resultado[-1].id
+            resultado.append(tarea)
+        return resultado, None
+
+    def buscar(
+        self, consulta: str, completada: bool | None = None, limite: int | None = None
+    ) -> list[RegistroTarea]:
+        """
+        Busca tareas por palabras del título y la descripción.
+
+        Args:
+            consulta (str): Texto a buscar (sin distinguir mayúsculas ni tildes;
+                            cada palabra puede ser un prefijo).
+            completada (bool | None): Filtrar por estado; None para ambos.
+            limite (int | None): Máximo de resultados; None para todos.
+
+        Returns:
+            list[RegistroTarea]: Tareas encontradas, de mayor a menor relevancia.
+
+        Raises:
+            RuntimeError: Si la colección no es buscable.
+        """
+        if self._busqueda is None:
+            raise RuntimeError("La colección no mantiene índice de búsqueda")
+        por_id: dict[int, RegistroTarea] = self._por_id
+        filtro: Callable[[int], bool] | None = (
+            None
+            if completada is None
+            else lambda tarea_id: por_id[tarea_id].completada == completada
+        )
+        ids: list[int] = self._busqueda.buscar(consulta, limite, filtro)
+        return [por_id[tarea_id] for tarea_id in ids]
+
+    def max_id(self) -> int:
+        """
+        Retorna el mayor ID almacenado o 0 si la colección está vacía.
+        """
+        return self._ids[-1] if self._ids else 0
+
+
+class RepositorioTareas:
+    """
+    Caché residente en memoria de las tareas activas y eliminadas.
+
+    Al arrancar se lee el estado completo del almacenamiento (y, con el
+    almacenamiento JSON, se vuelve a aplicar el diario). A partir de ahí todas
+    las lecturas se sirven desde memoria y cada modificación se aplica en
+    memoria y se registra en el almacenamiento como una operación; cada cierto
+    número de operaciones (y al detener la aplicación) el almacenamiento se
+    compacta.
+
+    Antes de cada acceso se pregunta al almacenamiento si otro proceso lo
+    modificó: se aplican solo las operaciones nuevas o, si no es posible, se
+    recarga todo.
+
+    Cada conjunto se guarda en una ColeccionIndexada, de modo que las
+    operaciones puntuales por ID no recorren la lista completa. Las escrituras
+    reciben diccionarios y las lecturas retornan registros compactos
+    (RegistroTarea o RegistroEliminada) compartidos con la caché.
+
+    Todas las llamadas al almacenamiento ocurren bajo el cerrojo del
+    repositorio, que además se mantiene durante un lote completo. Si varios
+    procesos comparten el almacenamiento, cada escritura toma además su
+    bloqueo exclusivo antes de leer los cambios ajenos (ver bloqueo_escritura()),
+    de modo que valida contra el estado más reciente y ningún otro proceso
+    escribe hasta que la operación está persistida.
+
+    La versión de los datos es la del almacenamiento (ver
+    Almacenamiento.version()), de modo que dos workers con el mismo estado
+    reportan la misma versión. Para responder qué cambió desde una versión,
+    el repositorio recuerda a qué generación de las tareas correspondía cada
+    versión que vio; una versión intermedia que no vio (otro worker escribió
+    varias veces entre dos lecturas) se resuelve con la anterior más
+    cercana, lo que a lo sumo agrega tareas que el cliente ya tenía.
+
+    Attributes:
+        almacenamiento (Almacenamiento): Medio donde se persisten las tareas.
+        compactar_cada (int): Operaciones registradas que disparan una compactación.
+        instancia (str): Identificador aleatorio de este proceso; junto con la
+                         generación de cada conjunto forma su versión cuando el
+                         almacenamiento no tiene una (modo memoria).
+
+    Ejemplo:
+        >>> repo = RepositorioTareas(crear_almacenamiento("json"))
+        >>> repo.cargar()
+        >>> repo.obtener_tarea(1)
+    """
+
+    def __init__(
+        self,
+        almacenamiento: Almacenamiento,
+        compactar_cada: int = JOURNAL_COMPACT_EVERY,
+    ) -> None:
+        self.almacenamiento: Almacenamiento = almacenamiento
+        self.compactar_cada: int = compactar_cada
+        self._cerrojo: threading.RLock = threading.RLock()
+        self._tareas: ColeccionIndexada = ColeccionIndexada(buscable=True)
+        self._eliminadas: ColeccionIndexada = ColeccionIndexada(RegistroEliminada)
+        self._pendientes: int = 0
+        self._cargado: bool = False
+        self.instancia: str = uuid.uuid4().hex[:12]
+        # Versiones del almacenamiento vistas y la generación de las tareas en
+        # cada una, en orden creciente
+        self._versiones: deque[tuple[tuple[int, ...], int]] = deque(
+            maxlen=CAMBIOS_MAXIMOS
+        )
+        # Lotes abiertos: mientras tanto la memoria va por delante del almacenamiento
+        self._lotes: int = 0
+
+    def cargar(self) -> None:
+        """
+        Carga el estado completo del almacenamiento en memoria.
+
+        Notas:
+            - Se llama desde el lifespan de la aplicación al arrancar
+            - Si no se llama explícitamente, el primer acceso carga los datos
+        """
+        with self._cerrojo, self.almacenamiento.bloquear():
+            tareas: list[dict[str, Any]]
+            eliminadas: list[dict[str, Any]]
+            registros: list[dict[str, Any]]
+            tareas, eliminadas, registros = self.almacenamiento.cargar()
+            self._tareas.cargar(tareas)
+            self._eliminadas.cargar(eliminadas)
+            for registro in registros:
+                self._aplicar(registro)
+            self._pendientes = len(registros) + self._resolver_duplicadas()
+            self._cargado = True
+            self._versiones.clear()
+            self._marcar_version()
+            logger.info(
+                "Repositorio cargado: %s tareas activas, %s eliminadas, "
+                "%s registros del diario aplicados",
+                len(self._tareas),
+                len(self._eliminadas),
+                len(registros),
+            )
+
+    def _resolver_duplicadas(self) -> int:
+        """
+        Quita del historial las tareas que también figuran entre las activas.
+
+        Con el diario, mover una tarea entre conjuntos es un único registro y
+        no puede quedar a medias. Los datos escritos por versiones anteriores,
+        que reescribían tareas.json y tareas_eliminadas.json por separado,
+        pueden tener una tarea en ambos si el proceso se interrumpió entre las
+        dos escrituras. Prevalece la tarea activa, igual que en SQLite.
+
+        Returns:
+            int: Cantidad de tareas quitadas del historial (quedan pendientes
+                 de persistir en la siguiente compactación).
+        """
+        duplicadas: list[int] = [
+            tarea.id
+            for tarea in self._eliminadas.listar()
+            if self._tareas.obtener(tarea.id) is not None
+        ]
+        for tarea_id in duplicadas:
+            self._eliminadas.quitar(tarea_id)
+        if duplicadas:
+            logger.warning(
+                "Tareas presentes en activas y eliminadas, se conservan como activas: %s",
+                duplicadas,
+            )
+        return len(duplicadas)
+
+    def _refrescar(self) -> None:
+        """
+        Sincroniza la caché con los cambios hechos por otros procesos.
+        """
+        if not self._cargado:
+            self.cargar()
+            return
+        with self.almacenamiento.bloquear():
+            registros: list[dict[str, Any]] | None = self.almacenamiento.cambios()
+            if registros is None:
+                self.cargar()
+                return
+        for registro in registros:
+            if registro["op"] == OP_COMPACTADO:
+                # Otro proceso compactó: lo aplicado hasta aquí ya está persistido
+                self._pendientes = 0
+                continue
+            self._aplicar(registro)
+            self._pendientes += 1
+
+    @contextmanager
+    def bloqueo_escritura(self) -> Iterator[None]:
+        """
+        Toma el cerrojo del repositorio y el bloqueo exclusivo del almacenamiento.
+
+        Toda escritura lo mantiene desde que lee los cambios de otros procesos
+        hasta que persiste la suya. Es reentrante: las escrituras de un lote
+        lo comparten.
+
+        Ejemplo:
+            >>> with repo.bloqueo_escritura():
+            ...     ultimo_id = repo.leer_contador()
+            ...     repo.guardar_contador(ultimo_id + 1000)
+        """
+        with self._cerrojo, self.almacenamiento.bloquear(exclusivo=True):
+            yield
+
+    def _aplicar(self, registro: dict[str, Any]) -> None:
+        """
+        Aplica en memoria una operación del diario.
+
+        Args:
+            registro (dict[str, Any]): Operación con clave 'op' y los datos
+                                       necesarios ('tarea' o 'id').
+        """
+        op: str = registro["op"]
+        if op in ("crear", "actualizar"):
+            self._tareas.insertar(registro["tarea"])
+        elif op == "eliminar":
+            if self._tareas.quitar(registro["tarea"]["id"]) is None:
+                # Con SQLite cada registro es el estado final de una fila: la
+                # tarea pudo crearse y eliminarse sin que este proceso la viera
+                self._tareas.anotar(registro["tarea"]["id"])
+            self._eliminadas.insertar(registro["tarea"])
+        elif op == "restaurar":
+            self._eliminadas.quitar(registro["tarea"]["id"])
+            self._tareas.insertar(registro["tarea"])
+        elif op == "purgar":
+            self._eliminadas.quitar(registro["id"])
+        else:
+            logger.error("Operación desconocida en el diario: %s", op)
+
+    def _registrar(self, registro: dict[str, Any]) -> None:
+        """
+        Registra una operación en el almacenamiento y luego la aplica en memoria.
+
+        Si se acumulan compactar_cada operaciones, compacta el almacenamiento.
+        """
+        self.almacenamiento.registrar(registro)
+        self._aplicar(registro)
+        self._pendientes += 1
+        self._marcar_version()
+        if self._pendientes >= self.compactar_cada:
+            self.compactar()
+
+    def _marcar_version(self) -> tuple[int, ...] | None:
+        """
+        Recuerda la generación de las tareas en la versión actual del almacenamiento.
+
+        Returns:
+            tuple[int, ...] | None: Versión del almacenamiento, o None si no
+                                    tiene (modo memoria).
+
+        Notas:
+            - Dentro de un lote no se recuerda nada: la memoria ya tiene
+              cambios que el almacenamiento todavía no confirmó
+        """
+        compartida: tuple[int, ...] | None = self.almacenamiento.version()
+        if compartida is None or self._lotes:
+            return compartida
+        if self._versiones and self._versiones[-1][0] >= compartida:
+            if self._versiones[-1][0] == compartida:
+                return compartida
+            # El almacenamiento retrocedió (datos reemplazados): olvidar lo anterior
+            self._versiones.clear()
+        self._versiones.append((compartida, self._tareas.generacion))
+        return compartida
+
+    def _generacion_de(self, version: str) -> int | None:
+        """
+        Generación de las tareas en una versión retornada por version_tareas().
+
+        Returns:
+            int | None: Generación en esa versión o en la anterior más cercana
+                        que se conoce; None si la versión no es de estos datos
+                        o es anterior a todas las recordadas.
+        """
+        if self.almacenamiento.version() is None:
+            instancia, _, generacion = version.rpartition("-")
+            if instancia == self.instancia and generacion.isdigit():
+                return int(generacion)
+            return None
+        try:
+            pedida: tuple[int, ...] = tuple(int(parte) for parte in version.split("-"))
+        except ValueError:
+            return None
+        if not self._versiones or len(pedida) != len(self._versiones[0][0]):
+            return None
+        posicion: int = bisect.bisect_right(
+            self._versiones, pedida, key=lambda marcada: marcada[0]
+        )
+        if posicion == 0:
+            return None
+        return self._versiones[posicion - 1][1]
+
+    def compactar(self) -> None:
+        """
+        Compacta el almacenamiento con el estado en memoria (con JSON, vuelca
+        las instantáneas y rota el diario).
+
+        Notas:
+            - Antes aplica los cambios de otros procesos: las instantáneas
+              reemplazan al diario y no deben omitir ninguno de sus registros
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            logger.info(
+                "Compactando almacenamiento (%s operaciones)", self._pendientes
+            )
+            self.almacenamiento.compactar(
+                self._tareas.listar(), self._eliminadas.listar()
+            )
+            self._pendientes = 0
+
+    def cerrar(self) -> None:
+        """
+        Compacta las operaciones pendientes y cierra el almacenamiento.
+
+        Notas:
+            - Se llama desde el lifespan de la aplicación al detenerse
+        """
+        with self.bloqueo_escritura():
+            if self._cargado and self._pendientes:
+                self.compactar()
+            self.almacenamiento.cerrar()
+
+    @contextmanager
+    def lote(self) -> Iterator[None]:
+        """
+        Agrupa varias modificaciones en una sola escritura del almacenamiento.
+
+        Los cambios se aplican en memoria de inmediato y al salir del bloque se
+        persisten juntos (un único fsync con JSON, una única transacción con
+        SQLite). El cerrojo y el bloqueo exclusivo se mantienen durante todo
+        el lote.
+
+        Raises:
+            Exception: Si falla la escritura del lote. En ese caso el estado en
+                       memoria se recarga desde el almacenamiento para descartar
+                       los cambios no persistidos.
+
+        Ejemplo:
+            >>> with repo.lote():
+            ...     repo.guardar_tarea(tarea_1)
+            ...     repo.guardar_tarea(tarea_2)
+        """
+        with self.bloqueo_escritura():
+            self.almacenamiento.iniciar_lote()
+            self._lotes += 1
+            try:
+                yield
+            finally:
+                self._lotes -= 1
+                try:
+                    self.almacenamiento.confirmar_lote()
+                except Exception as e:
+                    logger.error("Error al escribir el lote: %s", e)
+                    self.cargar()
+                    raise
+                self._marcar_version()
+
+    def sincronizar(self) -> None:
+        """
+        Fuerza a disco las operaciones aún no sincronizadas.
+
+        Solo tiene efecto con el almacenamiento JSON en modo "grupo"; en modo
+        "estricta" cada registro ya se sincroniza al escribirse.
+        """
+        self.almacenamiento.sincronizar()
+
+    # Contador de IDs
+
+    def leer_contador(self) -> int:
+        """
+        Retorna el mayor ID reservado en el contador persistente del almacenamiento.
+        """
+        with self._cerrojo:
+            return self.almacenamiento.leer_contador()
+
+    def guardar_contador(self, ultimo_id: int) -> None:
+        """
+        Persiste el mayor ID reservado en el contador del almacenamiento.
+
+        Args:
+            ultimo_id (int): Nuevo límite del contador.
+        """
+        with self.bloqueo_escritura():
+            self.almacenamiento.guardar_contador(ultimo_id)
+
+    # Lecturas
+
+    def tareas(self) -> list[RegistroTarea]:
+        """
+        Retorna las tareas activas ordenadas por ID.
+
+        Returns:
+            list[RegistroTarea]: Listado compartido con la caché. No debe
+                                 modificarse directamente.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._tareas.listar()
+
+    def eliminadas(self) -> list[RegistroEliminada]:
+        """
+        Retorna las tareas eliminadas ordenadas por ID.
+
+        Returns:
+            list[RegistroTarea]: Listado compartido con la caché. No debe
+                                 modificarse directamente.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._eliminadas.listar()
+
+    def obtener_tarea(self, tarea_id: int) -> RegistroTarea | None:
+        """
+        Busca una tarea activa por su ID en O(1).
+
+        Returns:
+            RegistroTarea | None: La tarea encontrada o None si no existe.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._tareas.obtener(tarea_id)
+
+    def obtener_eliminada(self, tarea_id: int) -> RegistroEliminada | None:
+        """
+        Busca una tarea eliminada por su ID en O(1).
+
+        Returns:
+            RegistroTarea | None: La tarea encontrada o None si no existe.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._eliminadas.obtener(tarea_id)
+
+    def buscar_tareas(
+        self, consulta: str, completada: bool | None = None, limite: int | None = None
+    ) -> list[RegistroTarea]:
+        """
+        Busca tareas activas por palabras del título y la descripción.
+
+        Args:
+            consulta (str): Texto a buscar.
+            completada (bool | None): Filtrar por estado; None para ambos.
+            limite (int | None): Máximo de resultados; None para todos.
+
+        Returns:
+            list[RegistroTarea]: Tareas encontradas, de mayor a menor relevancia.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._tareas.buscar(consulta, completada, limite)
+
+    def consultar_tareas(
+        self, **criterios: Any
+    ) -> tuple[tuple[str, float], list[RegistroTarea], int | None]:
+        """
+        Retorna una página de tareas activas filtradas y ordenadas.
+
+        Args:
+            **criterios (Any): Filtros, orden y cursor de ColeccionIndexada.consultar().
+
+        Returns:
+            tuple[tuple[str, float], list[RegistroTarea], int | None]: Versión de
+                las tareas consultadas (ver version_tareas()), tareas y cursor
+                siguiente.
+
+        Raises:
+            ValueError: Si el orden o el cursor no son válidos.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            tareas, siguiente = self._tareas.consultar(**criterios)
+            return self._version(self._tareas), tareas, siguiente
+
+    def pagina_eliminadas(
+        self, despues_de_id: int = 0, limite: int | None = None
+    ) -> tuple[tuple[str, float], list[RegistroTarea], int | None]:
+        """
+        Retorna una página de tareas eliminadas con ID mayor a despues_de_id.
+
+        Returns:
+            tuple[tuple[str, float], list[RegistroTarea], int | None]: Versión del
+                historial (ver version_eliminadas()), tareas y cursor siguiente.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            tareas, siguiente = self._eliminadas.consultar(
+                despues_de_id=despues_de_id, limite=limite
+            )
+            return self._version(self._eliminadas), tareas, siguiente
+
+    def listado_tareas(self) -> tuple[tuple[str, float], list[RegistroTarea]]:
+        """
+        Retorna las tareas activas junto con la versión a la que corresponden.
+
+        Ambas se leen bajo el mismo cerrojo: las cabeceras de validación y la
+        clave de la caché de respuestas describen exactamente el listado.
+
+        Returns:
+            tuple[tuple[str, float], list[RegistroTarea]]: Versión (ver
+                version_tareas()) y listado compartido con la caché, que no
+                debe modificarse directamente.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._version(self._tareas), self._tareas.listar()
+
+    def listado_eliminadas(self) -> tuple[tuple[str, float], list[RegistroEliminada]]:
+        """
+        Retorna las tareas eliminadas junto con la versión a la que corresponden.
+
+        Returns:
+            tuple[tuple[str, float], list[RegistroEliminada]]: Versión (ver
+                version_eliminadas()) y listado compartido con la caché, que no
+                debe modificarse directamente.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._version(self._eliminadas), self._eliminadas.listar()
+
+    def _version(self, coleccion: ColeccionIndexada) -> tuple[str, float]:
+        """
+        Identificador de versión e instante de modificación de una colección.
+
+        El identificador es la versión del almacenamiento ("época-posición"
+        con JSON, el contador de cambios con SQLite) o, en modo memoria, el
+        de este proceso con la generación de la colección.
+        """
+        compartida: tuple[int, ...] | None = self._marcar_version()
+        if compartida is None:
+            return f"{self.instancia}-{coleccion.generacion}", coleccion.modificado
+        return "-".join(str(parte) for parte in compartida), coleccion.modificado
+
+    def version_tareas(self) -> tuple[str, float]:
+        """
+        Retorna la versión actual del conjunto de tareas activas.
+
+        Returns:
+            tuple[str, float]: Identificador de versión (cambia con cada
+                               modificación) e instante de la última modificación.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._version(self._tareas)
+
+    def version_eliminadas(self) -> tuple[str, float]:
+        """
+        Retorna la versión actual del historial de tareas eliminadas.
+
+        Returns:
+            tuple[str, float]: Identificador de versión (cambia con cada
+                               modificación) e instante de la última modificación.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return self._version(self._eliminadas)
+
+    def cambios_tareas(
+        self, desde: str | None = None
+    ) -> tuple[str, bool, list[RegistroTarea], list[int]]:
+        """
+        Obtiene los cambios de las tareas activas desde una versión del cliente.
+
+        Args:
+            desde (str | None): Versión que tiene el cliente (ver version_tareas());
+                                None para pedir el listado completo.
+
+        Returns:
+            tuple[str, bool, list[RegistroTarea], list[int]]: Versión actual,
+                si la respuesta es completa, tareas creadas, modificadas o
+                restauradas (todas las activas si es completa) e IDs de las
+                que dejaron de estar activas.
+
+        Notas:
+            - La versión es la del almacenamiento: vale en cualquier worker
+              que ya estuviera en marcha cuando se entregó
+            - La respuesta es completa si la versión es anterior a la carga de
+              este proceso o a los CAMBIOS_MAXIMOS cambios recordados, si el
+              conjunto se recargó entero desde entonces o, en modo memoria, si
+              la versión es de otro proceso
+        """
+        with self._cerrojo:
+            self._refrescar()
+            version: str = self._version(self._tareas)[0]
+            cambios: tuple[list[RegistroTarea], list[int]] | None = None
+            generacion: int | None = None if desde is None else self._generacion_de(desde)
+            if generacion is not None:
+                cambios = self._tareas.cambios_desde(generacion)
+            if cambios is None:
+                return version, True, self._tareas.listar(), []
+            return version, False, cambios[0], cambios[1]
+
+    def contar(self) -> tuple[int, int]:
+        """
+        Retorna la cantidad de tareas activas y eliminadas.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return len(self._tareas), len(self._eliminadas)
+
+    def pendientes(self) -> int:
+        """
+        Retorna las operaciones registradas desde la última compactación.
+        """
+        with self._cerrojo:
+            return self._pendientes
+
+    def max_id(self) -> int:
+        """
+        Retorna el mayor ID presente entre tareas activas y eliminadas.
+        """
+        with self._cerrojo:
+            self._refrescar()
+            return max(self._tareas.max_id(), self._eliminadas.max_id())
+
+    # Escrituras
+
+    def guardar_tarea(self, tarea: dict[str, Any]) -> None:
+        """
+        Crea o reemplaza una tarea activa registrando la operación en el diario.
+
+        Args:
+            tarea (dict[str, Any]): Tarea completa, incluido su 'id'.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            op: str = "actualizar" if self._tareas.obtener(tarea["id"]) else "crear"
+            self._registrar({"op": op, "tarea": tarea})
+
+    def guardar_eliminada(self, tarea: dict[str, Any]) -> None:
+        """
+        Mueve una tarea al historial de eliminadas con un único registro.
+
+        La tarea se quita de las activas (si estaba) y se inserta o reemplaza
+        en el historial.
+
+        Args:
+            tarea (dict[str, Any]): Tarea eliminada, incluida su 'fecha_eliminacion'.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            self._registrar({"op": "eliminar", "tarea": tarea})
+
+    def actualizar_tarea(
+        self, tarea_id: int, tarea: dict[str, Any]
+    ) -> RegistroTarea | None:
+        """
+        Reemplaza todos los campos de una tarea activa existente.
+
+        Args:
+            tarea_id (int): ID de la tarea a reemplazar.
+            tarea (dict[str, Any]): Nuevos datos; el 'id' se fuerza a tarea_id.
+
+        Returns:
+            RegistroTarea | None: La tarea actualizada o None si no existe.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            if self._tareas.obtener(tarea_id) is None:
+                return None
+            tarea_actualizada: dict[str, Any] = {**tarea, "id": tarea_id}
+            self._registrar({"op": "actualizar", "tarea": tarea_actualizada})
+            return self._tareas.obtener(tarea_id)
+
+    def actualizar_parcial(
+        self, tarea_id: int, cambios: dict[str, Any]
+    ) -> RegistroTarea | None:
+        """
+        Modifica solo los campos indicados de una tarea activa existente.
+
+        La lectura de la tarea actual y la escritura del resultado ocurren bajo
+        el mismo cerrojo, por lo que dos actualizaciones concurrentes no se pisan.
+
+        Args:
+            tarea_id (int): ID de la tarea a modificar.
+            cambios (dict[str, Any]): Campos a sobrescribir.
+
+        Returns:
+            RegistroTarea | None: La tarea actualizada o None si no existe.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            tarea_existente: RegistroTarea | None = self._tareas.obtener(tarea_id)
+            if tarea_existente is None:
+                return None
+            tarea_actualizada: dict[str, Any] = {**tarea_existente.a_dict(), **cambios}
+            self._registrar({"op": "actualizar", "tarea": tarea_actualizada})
+            return self._tareas.obtener(tarea_id)
+
+    def eliminar_tarea(self, tarea_id: int) -> RegistroTarea | None:
+        """
+        Mueve una tarea activa al historial agregando la fecha de eliminación.
+
+        El movimiento es un único registro "eliminar": tras una caída la tarea
+        está en las activas o en el historial, nunca en ambos ni en ninguno.
+
+        Returns:
+            RegistroTarea | None: La tarea tal como estaba entre las activas,
+                                  o None si no existe.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            tarea: RegistroTarea | None = self._tareas.obtener(tarea_id)
+            if tarea is None:
+                return None
+            tarea_eliminada: dict[str, Any] = {
+                **tarea.a_dict(),
+                "fecha_eliminacion": datetime.now().isoformat(),
+            }
+            self._registrar({"op": "eliminar", "tarea": tarea_eliminada})
+            return tarea
+
+    def restaurar_tarea(self, tarea_id: int) -> RegistroTarea | None:
+        """
+        Mueve una tarea del historial de eliminadas a las activas con un único registro.
+
+        Returns:
+            RegistroTarea | None: La tarea restaurada (sin 'fecha_eliminacion')
+                                  o None si no está en el historial.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            tarea_eliminada: RegistroTarea | None = self._eliminadas.obtener(tarea_id)
+            if tarea_eliminada is None:
+                return None
+            tarea_restaurada: dict[str, Any] = tarea_eliminada.a_dict()
+            tarea_restaurada.pop("fecha_eliminacion", None)
+            self._registrar({"op": "restaurar", "tarea": tarea_restaurada})
+            return self._tareas.obtener(tarea_id)
+
+    def quitar_eliminada(self, tarea_id: int) -> RegistroEliminada | None:
+        """
+        Elimina permanentemente una tarea del historial de eliminadas.
+
+        Returns:
+            RegistroEliminada | None: La tarea quitada o None si no existía.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            tarea: RegistroTarea | None = self._eliminadas.obtener(tarea_id)
+            if tarea is not None:
+                self._registrar({"op": "purgar", "id": tarea_id})
+            return tarea
+
+    def crear_tareas(self, tareas: list[dict[str, Any]]) -> None:
+        """
+        Crea varias tareas activas; ejecutado dentro de un lote, todas se
+        escriben en el diario con un único fsync.
+
+        Args:
+            tareas (list[dict[str, Any]]): Tareas completas con su 'id' ya asignado.
+        """
+        with self.bloqueo_escritura():
+            for tarea in tareas:
+                self.guardar_tarea(tarea)
+
+    def actualizar_parciales(
+        self, cambios: list[tuple[int, dict[str, Any]]]
+    ) -> list[RegistroTarea | None]:
+        """
+        Aplica varias actualizaciones parciales en orden.
+
+        Args:
+            cambios (list[tuple[int, dict[str, Any]]]): Pares (ID, campos a sobrescribir).
+
+        Returns:
+            list[RegistroTarea | None]: Por cada par, la tarea actualizada o None
+                                        si no existe.
+        """
+        with self.bloqueo_escritura():
+            return [
+                self.actualizar_parcial(tarea_id, campos) for tarea_id, campos in cambios
+            ]
+
+    def eliminar_tareas(self, ids: list[int]) -> list[RegistroTarea | None]:
+        """
+        Mueve varias tareas activas al historial de eliminadas.
+
+        Args:
+            ids (list[int]): IDs de las tareas a eliminar.
+
+        Returns:
+            list[RegistroTarea | None]: Por cada ID, la tarea eliminada o None si
+                                        no existe (o ya se eliminó antes en el lote).
+        """
+        with self.bloqueo_escritura():
+            return [self.eliminar_tarea(tarea_id) for tarea_id in ids]
+
+    def reemplazar_tareas(self, datos: list[dict[str, Any]]) -> None:
+        """
+        Reemplaza la lista completa de tareas activas y guarda el estado completo.
+
+        Args:
+            datos (list[dict[str, Any]]): Nueva lista de tareas activas.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            self._tareas.cargar(datos)
+            self.almacenamiento.guardar_todo(
+                self._tareas.listar(), self._eliminadas.listar()
+            )
+            self._pendientes = 0
+
+    def reemplazar_eliminadas(self, datos: list[dict[str, Any]]) -> None:
+        """
+        Reemplaza la lista completa de tareas eliminadas y guarda el estado completo.
+
+        Args:
+            datos (list[dict[str, Any]]): Nueva lista de tareas eliminadas.
+        """
+        with self.bloqueo_escritura():
+            self._refrescar()
+            self._eliminadas.cargar(datos)
+            self.almacenamiento.guardar_todo(
+                self._tareas.listar(), self._eliminadas.listar()
+            )
+            self._pendientes = 0
+
+
+# Instancia única compartida por routers y utilidades
+repositorio: RepositorioTareas = RepositorioTareas(crear_almacenamiento())
@@ -0,0 +1,450 @@
+"""
+Módulo del almacenamiento SQLite
+
+Este módulo implementa el almacenamiento de tareas en una base de datos SQLite
+local (sqlite3 de la biblioteca estándar, sin servicios externos). Cada
+operación del repositorio se traduce en una sentencia sobre una única tabla,
+por lo que las escrituras son incrementales y no hace falta compactar.
+
+Clases principales:
+- AlmacenamientoSQLite: Almacenamiento en una base de datos SQLite
+
+Características:
+- Modo WAL: los lectores de otros procesos no bloquean al escritor
+- Una sola tabla: las tareas eliminadas tienen fecha_eliminacion, las activas NULL
+- Clave primaria id con AUTOINCREMENT: sqlite_sequence reemplaza a contador_id.json
+  y garantiza que los IDs nunca se reutilicen
+- Índices sobre completada y fecha_eliminacion
+- Lotes en una transacción: un solo commit (y un solo fsync) por lote
+- Durabilidad: "estricta" usa synchronous=FULL, "grupo" synchronous=NORMAL y
+  "memoria" una base de datos en memoria
+- Cambios de otros procesos leídos de forma incremental: cada fila guarda la
+  versión (contador monotónico de la tabla metadatos, incrementado por
+  triggers) de su última modificación y las tareas purgadas dejan una marca
+  en purgadas; PRAGMA data_version evita consultar si nadie más escribió
+- Bloqueo entre procesos en tareas.sqlite3.lock, para que cada escritura se
+  valide y se confirme sin que otro worker escriba entre medio
+- Duración de la lectura, de cada sentencia y de cada commit registrada en
+  las métricas
+"""
+
+import sqlite3
+import logging
+from typing import Any, Callable
+
+from constants import CAMBIOS_MAXIMOS, DURABILIDAD_ESTRICTA, DURABILIDAD_MEMORIA
+
+from .MDalmacenamiento import Almacenamiento, Estado
+from .MDbloqueo import BloqueoArchivo
+from .MDregistro import RegistroEliminada, RegistroTarea
+from .MDmetricas import ESCRITURA_ALMACENAMIENTO, LECTURA_ALMACENAMIENTO, cronometrar
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Esquema de la base de datos
+ESQUEMA: str = """
+CREATE TABLE IF NOT EXISTS tareas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    titulo TEXT NOT NULL,
+    descripcion TEXT NOT NULL,
+    completada INTEGER NOT NULL DEFAULT 0 CHECK (completada IN (0, 1)),
+    fecha_eliminacion TEXT,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tareas_completada ON tareas (completada);
+CREATE INDEX IF NOT EXISTS idx_tareas_fecha_eliminacion ON tareas (fecha_eliminacion);
+CREATE TABLE IF NOT EXISTS purgadas (
+    id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadatos (
+    clave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO metadatos (clave, valor)
+VALUES ('version', 0), ('reemplazo', 0), ('olvidado', 0);
+"""
+
+# Versionado de las filas; se crea después de agregar la columna version a
+# las bases de datos anteriores a ella
+ESQUEMA_VERSIONES: str = """
+CREATE INDEX IF NOT EXISTS idx_tareas_version ON tareas (version);
+CREATE TRIGGER IF NOT EXISTS tareas_insertada AFTER INSERT ON tareas BEGIN
+    UPDATE metadatos SET valor = valor + 1 WHERE clave = 'version';
+    UPDATE tareas SET version = (SELECT valor FROM metadatos WHERE clave = 'version')
+    WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS tareas_modificada
+AFTER UPDATE OF titulo, descripcion, completada, fecha_eliminacion ON tareas BEGIN
+    UPDATE metadatos SET valor = valor + 1 WHERE clave = 'version';
+    UPDATE tareas SET version = (SELECT valor FROM metadatos WHERE clave = 'version')
+    WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS tareas_purgada AFTER DELETE ON tareas BEGIN
+    UPDATE metadatos SET valor = valor + 1 WHERE clave = 'version';
+    INSERT OR REPLACE INTO purgadas (id, version)
+    VALUES (OLD.id, (SELECT valor FROM metadatos WHERE clave = 'version'));
+END;
+"""
+
+# Crea o reemplaza una tarea, activa (fecha NULL) o eliminada
+_GUARDAR: str = (
+    "INSERT INTO tareas (id, titulo, descripcion, completada, fecha_eliminacion) "
+    "VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET titulo = excluded.titulo, "
+    "descripcion = excluded.descripcion, completada = excluded.completada, "
+    "fecha_eliminacion = excluded.fecha_eliminacion"
+)
+
+
+def _registro(
+    tarea_id: int, titulo: str, descripcion: str, completada: int, fecha: str | None
+) -> dict[str, Any]:
+    """
+    Convierte una fila modificada en el registro del diario que la reproduce.
+
+    "restaurar" y "eliminar" colocan la tarea en su conjunto aunque antes
+    estuviera en el otro, de modo que sirven tanto para crear y actualizar
+    como para mover tareas.
+    """
+    tarea: dict[str, Any] = {
+        "id": tarea_id,
+        "titulo": titulo,
+        "descripcion": descripcion,
+        "completada": bool(completada),
+    }
+    if fecha is None:
+        return {"op": "restaurar", "tarea": tarea}
+    tarea["fecha_eliminacion"] = fecha
+    return {"op": "eliminar", "tarea": tarea}
+
+
+def _fila(tarea: dict[str, Any], fecha_eliminacion: str | None) -> tuple[Any, ...]:
+    """
+    Convierte una tarea del diario en los parámetros de _GUARDAR.
+    """
+    return (
+        tarea["id"],
+        tarea["titulo"],
+        tarea["descripcion"],
+        bool(tarea.get("completada", False)),
+        fecha_eliminacion,
+    )
+
+
+class AlmacenamientoSQLite(Almacenamiento):
+    """
+    Almacenamiento en una base de datos SQLite.
+
+    La conexión se abre en el primer uso (no al importar) en modo autocommit:
+    fuera de un lote cada operación es su propia transacción, y entre
+    iniciar_lote() y confirmar_lote() todas forman una sola.
+
+    Cada modificación de la tabla incrementa la versión de metadatos y la
+    guarda en la fila (o en purgadas, si la fila se borró). cambios() lee
+    solo lo modificado después de la última versión vista, como el diario
+    con JSON. Solo hay que recargar si otro proceso reemplazó la tabla
+    completa (guardar_todo) o si ya se descartaron marcas de purga que
+    todavía no se habían visto (ver compactar()).
+
+    Attributes:
+        ruta (str): Archivo de la base de datos (":memory:" en modo memoria).
+        durabilidad (str): Modo de durabilidad.
+
+    Ejemplo:
+        >>> almacenamiento = AlmacenamientoSQLite(SQLITE_DB)
+        >>> tareas, eliminadas, _ = almacenamiento.cargar()
+    """
+
+    def __init__(self, ruta: str, durabilidad: str = DURABILIDAD_ESTRICTA) -> None:
+        self.durabilidad: str = durabilidad
+        self.ruta: str = ":memory:" if durabilidad == DURABILIDAD_MEMORIA else ruta
+        self._conexion: sqlite3.Connection | None = None
+        self._version_datos: int | None = None
+        # Última versión de metadatos ya reflejada en memoria
+        self._visto: int = 0
+        if durabilidad != DURABILIDAD_MEMORIA:
+            self.bloqueo = BloqueoArchivo(ruta + ".lock")
+
+    def _conectar(self) -> sqlite3.Connection:
+        """
+        Abre la conexión y crea el esquema si todavía no existe.
+        """
+        if self._conexion is None:
+            conexion: sqlite3.Connection = sqlite3.connect(
+                self.ruta, isolation_level=None, check_same_thread=False
+            )
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute(
+                "PRAGMA synchronous="
+                + ("FULL" if self.durabilidad == DURABILIDAD_ESTRICTA else "NORMAL")
+            )
+            conexion.executescript(ESQUEMA)
+            columnas: set[str] = {
+                fila[1] for fila in conexion.execute("PRAGMA table_info(tareas)")
+            }
+            if "version" not in columnas:
+                conexion.execute(
+                    "ALTER TABLE tareas ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+            conexion.executescript(ESQUEMA_VERSIONES)
+            self._conexion = conexion
+            logger.info("Base de datos SQLite abierta: %s", self.ruta)
+        return self._conexion
+
+    def _leer_version(self) -> int:
+        """
+        Lee el contador que SQLite incrementa cuando otra conexión modifica la base.
+        """
+        return self._conectar().execute("PRAGMA data_version").fetchone()[0]
+
+    def _metadatos(self) -> dict[str, int]:
+        """
+        Lee la versión actual, la del último reemplazo completo y la última
+        marca de purga descartada.
+        """
+        return dict(self._conectar().execute("SELECT clave, valor FROM metadatos"))
+
+    def _leer(self, leer: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Ejecuta varias consultas sobre una misma instantánea de la base.
+        """
+        conexion: sqlite3.Connection = self._conectar()
+        if conexion.in_transaction:
+            return leer(conexion)
+        conexion.execute("BEGIN")
+        try:
+            return leer(conexion)
+        finally:
+            conexion.execute("COMMIT")
+
+    def cargar(self) -> Estado:
+        with cronometrar(LECTURA_ALMACENAMIENTO, "sqlite", "leer"):
+            self._version_datos = self._leer_version()
+            return self._leer(self._cargar)
+
+    def _cargar(self, conexion: sqlite3.Connection) -> Estado:
+        tareas: list[dict[str, Any]] = [
+            {"id": i, "titulo": t, "descripcion": d, "completada": bool(c)}
+            for i, t, d, c in conexion.execute(
+                "SELECT id, titulo, descripcion, completada FROM tareas "
+                "WHERE fecha_eliminacion IS NULL"
+            )
+        ]
+        eliminadas: list[dict[str, Any]] = [
+            {
+                "id": i,
+                "titulo": t,
+                "descripcion": d,
+                "completada": bool(c),
+                "fecha_eliminacion": f,
+            }
+            for i, t, d, c, f in conexion.execute(
+                "SELECT id, titulo, descripcion, completada, fecha_eliminacion "
+                "FROM tareas WHERE fecha_eliminacion IS NOT NULL"
+            )
+        ]
+        self._visto = self._metadatos()["version"]
+        return tareas, eliminadas, []
+
+    def cambios(self) -> list[dict[str, Any]] | None:
+        version_datos: int = self._leer_version()
+        if version_datos == self._version_datos:
+            return []
+        self._version_datos = version_datos
+        registros: list[dict[str, Any]] | None = self._leer(self._cambios)
+        if registros is None:
+            logger.info("Base de datos reemplazada por otro proceso, recargando")
+            return None
+        logger.debug("Leídas %s filas modificadas por otro proceso", len(registros))
+        return registros
+
+    def _cambios(self, conexion: sqlite3.Connection) -> list[dict[str, Any]] | None:
+        """
+        Lee las filas modificadas y purgadas después de la última versión vista.
+
+        Returns:
+            list[dict[str, Any]] | None: Registros en orden de versión, o None
+                                         si hay que recargar el estado completo.
+        """
+        metadatos: dict[str, int] = self._metadatos()
+        if max(metadatos["reemplazo"], metadatos["olvidado"]) > self._visto:
+            return None
+        modificadas: list[tuple[int, dict[str, Any]]] = [
+            (fila[-1], _registro(*fila[:-1]))
+            for fila in conexion.execute(
+                "SELECT id, titulo, descripcion, completada, fecha_eliminacion, version "
+                "FROM tareas WHERE version > ?",
+                (self._visto,),
+            )
+        ]
+        modificadas.extend(
+            (version, {"op": "purgar", "id": tarea_id})
+            for tarea_id, version in conexion.execute(
+                "SELECT id, version FROM purgadas WHERE version > ?", (self._visto,)
+            )
+        )
+        modificadas.sort(key=lambda modificada: modificada[0])
+        self._visto = metadatos["version"]
+        return [registro for _, registro in modificadas]
+
+    def _ver_propias(self) -> None:
+        """
+        Marca como vistas las escrituras propias ya confirmadas.
+
+        Notas:
+            - El repositorio escribe con el bloqueo exclusivo tomado y después
+              de leer los cambios ajenos, de modo que ninguna versión anterior
+              queda sin ver
+        """
+        self._visto = self._metadatos()["version"]
+
+    def version(self) -> tuple[int, ...] | None:
+        """
+        Última versión de metadatos reflejada en memoria.
+        """
+        if self.durabilidad == DURABILIDAD_MEMORIA:
+            return None
+        return (self._visto,)
+
+    def registrar(self, registro: dict[str, Any]) -> None:
+        with cronometrar(ESCRITURA_ALMACENAMIENTO, "sqlite", "escribir"):
+            self._registrar(registro)
+        if not self._conectar().in_transaction:
+            self._ver_propias()
+
+    def _registrar(self, registro: dict[str, Any]) -> None:
+        conexion: sqlite3.Connection = self._conectar()
+        op: str = registro["op"]
+        if op in ("crear", "actualizar", "restaurar"):
+            conexion.execute(_GUARDAR, _fila(registro["tarea"], None))
+        elif op == "eliminar":
+            tarea: dict[str, Any] = registro["tarea"]
+            conexion.execute(_GUARDAR, _fila(tarea, tarea.get("fecha_eliminacion")))
+        elif op == "purgar":
+            conexion.execute(
+                "DELETE FROM tareas WHERE id = ? AND fecha_eliminacion IS NOT NULL",
+                (registro["id"],),
+            )
+        else:
+            logger.error("Operación desconocida: %s", op)
+
+    def iniciar_lote(self) -> None:
+        self._conectar().execute("BEGIN IMMEDIATE")
+
+    def confirmar_lote(self) -> None:
+        conexion: sqlite3.Connection = self._conectar()
+        try:
+            with cronometrar(ESCRITURA_ALMACENAMIENTO, "sqlite", "confirmar"):
+                conexion.execute("COMMIT")
+        except sqlite3.Error:
+            conexion.execute("ROLLBACK")
+            raise
+        self._ver_propias()
+
+    def guardar_todo(
+        self, tareas: list[RegistroTarea], eliminadas: list[RegistroEliminada]
+    ) -> None:
+        """
+        Reemplaza el contenido de la tabla en una sola transacción.
+
+        Notas:
+            - Las eliminadas se insertan primero: si un ID aparece en ambos
+              conjuntos prevalece la tarea activa
+            - sqlite_sequence no se reinicia, por lo que los IDs de tareas
+              borradas tampoco se reutilizan
+            - Registra la versión del reemplazo: los demás procesos recargan
+              el estado completo en lugar de leer cada fila como un cambio
+        """
+        conexion: sqlite3.Connection = self._conectar()
+        propia: bool = not conexion.in_transaction
+        if propia:
+            conexion.execute("BEGIN IMMEDIATE")
+        try:
+            conexion.execute("DELETE FROM tareas")
+            conexion.executemany(
+                _GUARDAR,
+                (
+                    (t.id, t.titulo, t.descripcion, t.completada, t.fecha_eliminacion)
+                    for t in eliminadas
+                ),
+            )
+            conexion.executemany(
+                _GUARDAR,
+                ((t.id, t.titulo, t.descripcion, t.completada, None) for t in tareas),
+            )
+            conexion.execute("DELETE FROM purgadas")
+            conexion.execute(
+                "UPDATE metadatos SET valor = "
+                "(SELECT valor FROM metadatos WHERE clave = 'version') "
+                "WHERE clave = 'reemplazo'"
+            )
+        except sqlite3.Error:
+            if propia:
+                conexion.execute("ROLLBACK")
+            raise
+        if propia:
+            conexion.execute("COMMIT")
+            self._ver_propias()
+        logger.info(
+            "Base de datos reescrita: %s tareas activas, %s eliminadas",
+            len(tareas),
+            len(eliminadas),
+        )
+
+    def compactar(
+        self, tareas: list[RegistroTarea], eliminadas: list[RegistroEliminada]
+    ) -> None:
+        """
+        Las escrituras ya son incrementales: solo se descartan las marcas de
+        purga con más de CAMBIOS_MAXIMOS versiones de antigüedad y se traslada
+        el WAL a la base de datos (si no hay una transacción abierta) para
+        acotar su tamaño.
+
+        Notas:
+            - Un proceso que todavía no vio una marca descartada recarga el
+              estado completo en su siguiente lectura
+        """
+        conexion: sqlite3.Connection = self._conectar()
+        limite: int = self._metadatos()["version"] - CAMBIOS_MAXIMOS
+        descartada: int | None = conexion.execute(
+            "SELECT MAX(version) FROM purgadas WHERE version <= ?", (limite,)
+        ).fetchone()[0]
+        if descartada is not None:
+            propia: bool = not conexion.in_transaction
+            if propia:
+                conexion.execute("BEGIN IMMEDIATE")
+            conexion.execute("DELETE FROM purgadas WHERE version <= ?", (descartada,))
+            conexion.execute(
+                "UPDATE metadatos SET valor = ? WHERE clave = 'olvidado'", (descartada,)
+            )
+            if propia:
+                conexion.execute("COMMIT")
+        if not conexion.in_transaction:
+            conexion.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def leer_contador(self) -> int:
+        fila: tuple[int] | None = (
+            self._conectar()
+            .execute("SELECT seq FROM sqlite_sequence WHERE name = 'tareas'")
+            .fetchone()
+        )
+        return fila[0] if fila else 0
+
+    def guardar_contador(self, ultimo_id: int) -> None:
+        conexion: sqlite3.Connection = self._conectar()
+        cursor: sqlite3.Cursor = conexion.execute(
+            "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'tareas'",
+            (ultimo_id,),
+        )
+        if cursor.rowcount == 0:
+            conexion.execute(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES ('tareas', ?)",
+                (ultimo_id,),
+            )
+
+    def cerrar(self) -> None:
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+            logger.info("Base de datos SQLite cerrada")
@@ -0,0 +1,144 @@
+"""
+Módulo de transmisión de listados por fragmentos
+
+Este módulo permite enviar listados grandes de tareas sin construir el cuerpo
+completo de la respuesta en memoria: las tareas se serializan por bloques a
+medida que el servidor las envía, con codificación de transferencia por
+fragmentos (chunked).
+
+Funciones principales:
+- formato_transmision(): Decide si una solicitud pidió una respuesta transmitida
+- generar_ndjson(): Genera los fragmentos en formato JSON Lines
+- generar_arreglo_json(): Genera los fragmentos de un arreglo JSON
+- respuesta_transmitida(): Construye la StreamingResponse correspondiente
+
+Características:
+- Activación opcional: cabecera Accept: application/x-ndjson o ?transmitir=true
+- Memoria por solicitud proporcional a un bloque, no al listado completo
+- Sin validación por response_model: las tareas del repositorio ya son válidas
+- Generadores síncronos que Starlette recorre en el threadpool, sin bloquear
+  el bucle de eventos
+"""
+
+import logging
+from typing import Iterable, Iterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from constants import MEDIA_NDJSON, TRANSMISION_BLOQUE
+
+from .MDjson import serializar
+from .MDregistro import RegistroTarea
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Formatos de transmisión disponibles
+FORMATO_NDJSON: str = "ndjson"
+FORMATO_ARREGLO: str = "arreglo"
+
+
+# Función para decidir el formato de transmisión de una solicitud
+def formato_transmision(request: Request, transmitir: bool = False) -> str | None:
+    """
+    Determina si la respuesta debe transmitirse por fragmentos y en qué formato.
+
+    Args:
+        request (Request): Solicitud entrante; se inspecciona la cabecera Accept.
+        transmitir (bool): Valor del parámetro ?transmitir de la solicitud.
+
+    Returns:
+        str | None: "ndjson" si Accept incluye application/x-ndjson, "arreglo"
+                    si se pidió ?transmitir=true, o None para la respuesta normal.
+    """
+    if MEDIA_NDJSON in request.headers.get("accept", ""):
+        return FORMATO_NDJSON
+    if transmitir:
+        return FORMATO_ARREGLO
+    return None
+
+
+# Función para generar los fragmentos en formato JSON Lines
+def generar_ndjson(
+    tareas: Iterable[RegistroTarea], bloque: int = TRANSMISION_BLOQUE
+) -> Iterator[bytes]:
+    """
+    Genera las tareas como JSON Lines (una tarea por línea), por bloques.
+
+    Args:
+        tareas (Iterable[RegistroTarea]): Tareas a enviar.
+        bloque (int): Tareas serializadas por fragmento.
+
+    Yields:
+        bytes: Fragmentos codificados en UTF-8.
+    """
+    lineas: list[bytes] = []
+    for tarea in tareas:
+        lineas.append(serializar(tarea))
+        if len(lineas) >= bloque:
+            yield b"\n".join(lineas) + b"\n"
+            lineas = []
+    if lineas:
+        yield b"\n".join(lineas) + b"\n"
+
+
+# Función para generar los fragmentos de un arreglo JSON
+def generar_arreglo_json(
+    tareas: Iterable[RegistroTarea], bloque: int = TRANSMISION_BLOQUE
+) -> Iterator[bytes]:
+    """
+    Genera las tareas como un único arreglo JSON enviado por bloques.
+
+    El cuerpo completo es idéntico al de la respuesta normal, de modo que el
+    cliente no necesita cambiar la forma de leerlo.
+
+    Args:
+        tareas (Iterable[RegistroTarea]): Tareas a enviar.
+        bloque (int): Tareas serializadas por fragmento.
+
+    Yields:
+        bytes: Fragmentos codificados en UTF-8.
+    """
+    separador: bytes = b"["
+    elementos: list[bytes] = []
+    for tarea in tareas:
+        elementos.append(serializar(tarea))
+        if len(elementos) >= bloque:
+            yield separador + b",".join(elementos)
+            separador = b","
+            elementos = []
+    if elementos:
+        yield separador + b",".join(elementos) + b"]"
+    elif separador == b"[":
+        yield b"[]"
+    else:
+        yield b"]"
+
+
+# Función para construir una respuesta transmitida por fragmentos
+def respuesta_transmitida(
+    tareas: Iterable[RegistroTarea],
+    formato: str,
+    cabeceras: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """
+    Construye la respuesta que envía las tareas por fragmentos.
+
+    Args:
+        tareas (Iterable[RegistroTarea]): Tareas a enviar. Se recorren a medida
+                                           que se envía la respuesta.
+        formato (str): "ndjson" o "arreglo" (ver formato_transmision()).
+        cabeceras (dict[str, str] | None): Cabeceras adicionales (por ejemplo, el
+                                           cursor de la página siguiente).
+
+    Returns:
+        StreamingResponse: Respuesta lista para retornar desde el endpoint.
+    """
+    logger.debug("Transmitiendo listado en formato %s", formato)
+    if formato == FORMATO_NDJSON:
+        return StreamingResponse(
+            generar_ndjson(tareas), media_type=MEDIA_NDJSON, headers=cabeceras
+        )
+    return StreamingResponse(
+        generar_arreglo_json(tareas), media_type="application/json", headers=cabeceras
+    )
@@ -1,17 +1,60 @@
 from typing import List
 
+from .MDregistro import RegistroEliminada, RegistroTarea
+from .MDalmacenamiento import Almacenamiento, AlmacenamientoJSON, crear_almacenamiento
+from .MDsqlite import AlmacenamientoSQLite
+from .MDhistorial import HistorialSegmentado
+from .MDrepositorio import RepositorioTareas, repositorio
+from .MDbusqueda import IndiceBusqueda
+from .MDjson import RespuestaJSON, deserializar, serializar
+from .MDescritor import EscritorSerializado, escritor
 from .MDleer_json import leer_json
 from .MDescribir_datos_tareas import escribir_datos_tareas
 from .MDescribir_datos_eliminadas import escribir_datos_eliminadas
 from .MDleer_eliminadas_json import leer_eliminadas_json
 from .MDguardar_eliminada import guardar_eliminada
-from .MDobtener_proximo_id import obtener_proximo_id
+from .MDobtener_proximo_id import AsignadorIds, asignador_ids, obtener_proximo_id
+from .MDtransmision import formato_transmision, respuesta_transmitida
+from .MDmetricas import MiddlewareMetricas, metricas
+from .MDlogs import FiltroMuestreo, configurar_logging
+from .MDbloqueo import BloqueoArchivo
+from .MDcondicional import cabeceras_validacion, respuesta_no_modificada
+from .MDcompresion import MiddlewareCompresion, cache_compresion, respuesta_comprimida
 
 __all__: List[str] = [
+    "Almacenamiento",
+    "AlmacenamientoJSON",
+    "AlmacenamientoSQLite",
+    "AsignadorIds",
+    "BloqueoArchivo",
+    "EscritorSerializado",
+    "FiltroMuestreo",
+    "HistorialSegmentado",
+    "IndiceBusqueda",
+    "MiddlewareCompresion",
+    "MiddlewareMetricas",
+    "RegistroEliminada",
+    "RegistroTarea",
+    "RepositorioTareas",
+    "RespuestaJSON",
+    "asignador_ids",
+    "cabeceras_validacion",
+    "cache_compresion",
+    "configurar_logging",
+    "crear_almacenamiento",
+    "deserializar",
+    "escritor",
     "escribir_datos_tareas",
     "escribir_datos_eliminadas",
+    "formato_transmision",
     "guardar_eliminada",
     "leer_eliminadas_json",
     "leer_json",
+    "metricas",
     "obtener_proximo_id",
+    "repositorio",
+    "respuesta_no_modificada",
+    "respuesta_comprimida",
+    "respuesta_transmitida",
+    "serializar",
 ]